@@ -1,8 +1,24 @@
 import sys
 import os
 
+import pytest
+
 # Add src to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "src")))
 
 # Set dummy API key for testing
 os.environ["OPENAI_API_KEY"] = "sk-dummy-key-for-testing"
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Keep persistent caches under the test's tmp_path, never in the repo or home directory."""
+    from forge_requirements_builder.cache import configure_extraction_cache
+
+    monkeypatch.setenv("FORGE_CACHE_DIR", str(tmp_path / "forge_cache"))
+    monkeypatch.delenv("FORGE_EXTRACTION_CACHE_PATH", raising=False)
+    monkeypatch.delenv("FORGE_LLM_CACHE_PATH", raising=False)
+    cache = configure_extraction_cache(force=True)
+    yield
+    if cache is not None and cache.store.persistent is not None:
+        cache.store.persistent.close()
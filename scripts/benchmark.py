@@ -0,0 +1,615 @@
+"""Offline benchmarks for Forge Requirements Builder.
+
+One script, one subcommand per benchmark:
+
+- workflow: authoring, quality, prioritization and synthesis plus state
+  persistence against a non-network chat-model backend, so the numbers
+  measure orchestration, tool and serialization overhead only
+  (FORGE_FAKE_LATENCY_MS / FORGE_FAKE_TOKENS_PER_SEC add synthetic model
+  latency; FORGE_LLM_BACKEND=replay replays a recorded session)
+- parser: tools._parse_requirements_from_text against the previous
+  multi-pass parser on a multi-megabyte document, checking that both
+  return the same requirements
+- docx: streaming DOCX extraction (docx_reader.iter_docx_blocks) against
+  the python-docx object model on a generated document of paragraphs,
+  tables and tracked changes; each extractor runs in a fresh process so
+  peak memory (max RSS) is measured separately
+- conflicts: conflict detection through the inverted index
+  (tools._find_conflicting_pairs) against the all-pairs scan, checking
+  that both find the same pairs in the same order
+- quality: incremental re-validation (quality.QualityEngine) after one
+  requirement is edited against a full validate_requirements_quality run,
+  checking that both find the same issues in the same order
+- keywords: the shared Aho-Corasick automaton (tools._keywords_in) against
+  the per-rule `keyword in text.lower()` scans it replaced, checking that
+  every rule gets the same answers
+- rules: the requirement rules of tools.QUALITY_RULES in-process against
+  the worker pool, checking that both give the same issues in the same
+  order (the pool time includes its start-up and sending issues back)
+- traceability: requirement -> story lookups through TraceabilityIndex
+  against scanning every story per requirement, checking that both agree,
+  plus the time of a sync after one story moves
+
+Usage:
+    PYTHONPATH=src python scripts/benchmark.py workflow --requirements 50
+    PYTHONPATH=src python scripts/benchmark.py parser --megabytes 4
+    PYTHONPATH=src python scripts/benchmark.py docx --paragraphs 50000
+    PYTHONPATH=src python scripts/benchmark.py conflicts --requirements 5000
+    PYTHONPATH=src python scripts/benchmark.py quality --requirements 5000
+    PYTHONPATH=src python scripts/benchmark.py keywords --requirements 20000
+    PYTHONPATH=src python scripts/benchmark.py rules --requirements 50000 --workers 0
+    PYTHONPATH=src python scripts/benchmark.py traceability --requirements 5000
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import random
+import re
+import resource
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+
+def best_of(rounds: int, func, *args):
+    """Run func rounds times: (best seconds, last result)."""
+    timings, result = [], None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        result = func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings), result
+
+
+# Workflow
+
+def bench_workflow(args) -> None:
+    # Must be set before the nodes module builds its chat model
+    os.environ.setdefault("FORGE_LLM_BACKEND", "fake")
+    os.environ.setdefault("FORGE_LLM_CACHE", "off")
+
+    from forge_requirements_builder.nodes import authoring_node, prioritization_node, quality_node, synthesis_node
+    from forge_requirements_builder.state import RequirementRaw, create_project_state, deserialize_state, serialize_state
+
+    def build_state():
+        state = create_project_state("Benchmark Project", "Offline benchmark of the requirements workflow")
+        state["requirements_raw"] = [
+            RequirementRaw(
+                id=f"REQ-{i:03d}",
+                title=f"Capability {i}",
+                description=f"The system shall let users manage item {i} quickly and securely.",
+                type="Functional" if i % 4 else "Non-Functional",
+                source="Benchmark"
+            )
+            for i in range(1, args.requirements + 1)
+        ]
+        state["discovery_complete"] = True
+        return state
+
+    def quality(state):
+        state = quality_node(state)
+        state["quality_issues_resolved"] = True
+        return state
+
+    steps = [
+        ("authoring_ms", authoring_node),
+        ("quality_ms", quality),
+        ("prioritization_ms", prioritization_node),
+        ("synthesis_ms", synthesis_node),
+        ("serialize_ms", lambda state: json.dumps(serialize_state(state), default=str)),
+        ("deserialize_ms", lambda payload: deserialize_state(json.loads(payload)))
+    ]
+    totals = dict.fromkeys((label for label, _ in steps), 0.0)
+    for _ in range(args.rounds):
+        value = build_state()
+        for label, step in steps:
+            seconds, value = best_of(1, step, value)
+            totals[label] += seconds * 1000
+            if label == "authoring_ms":
+                stories, failures = len(value["user_stories"]), len(value["authoring_failures"])
+
+    # A failed call is cheap, so timings that skipped authoring would flatter the pipeline
+    if failures:
+        raise SystemExit(f"Authoring failed for {failures} of {args.requirements} requirements")
+
+    print(f"backend={os.environ['FORGE_LLM_BACKEND']} requirements={args.requirements} rounds={args.rounds} stories={stories}")
+    for label, total in totals.items():
+        print(f"{label:>20}: {total / args.rounds:10.2f}")
+
+
+# Requirement parser
+
+PARSER_FILLER = [
+    "This section describes the background of the procurement.",
+    "Vendors are expected to respond within thirty days",
+    "The product roadmap is summarised in Appendix B",
+    "Table 4 lists the stakeholders and their application areas",
+    "All figures are indicative and subject to change.",
+]
+PARSER_REQUIREMENTS = [
+    "The system shall allow users to reset their password via email.",
+    "The platform must encrypt all data at rest using AES-256.",
+    "The application should respond to search queries within 2 seconds.",
+    "REQ-{n}: Administrators can export the audit log as CSV",
+    "{n}. Users must be able to filter reports by date range and region",
+    "{n}. Overview of the document structure",
+]
+
+
+def legacy_parse(text: str, source: str):
+    """The multi-pass parser the scanner replaced."""
+    from forge_requirements_builder.tools import ExtractedRequirement, _classify_requirement_type, _generate_title_from_description
+
+    def extracted(title: str, description: str):
+        return ExtractedRequirement(title=title, description=description, type=_classify_requirement_type(description), source=source)
+
+    requirements = []
+    system_pattern = r'(?:the\s+system|application|platform|product)\s+(?:shall|must|should|will)\s+([^.]+\.)'
+    for match in re.finditer(system_pattern, text, re.IGNORECASE):
+        description = match.group(0).strip()
+        requirements.append(extracted(_generate_title_from_description(description), description))
+
+    req_pattern = r'(REQ[-\s]?\d+)\s*[:\-]\s*([^\n]+)'
+    for match in re.finditer(req_pattern, text, re.IGNORECASE):
+        description = match.group(2).strip()
+        requirements.append(extracted(f"{match.group(1)}: {_generate_title_from_description(description)}", description))
+
+    for line in text.split('\n'):
+        match = re.match(r'^\s*\d+\.\s+([^\n]+)', line)
+        if match:
+            description = match.group(1).strip()
+            if len(description) > 20 and any(word in description.lower() for word in ['must', 'should', 'will', 'shall', 'can', 'able']):
+                requirements.append(extracted(_generate_title_from_description(description), description))
+
+    seen = set()
+    unique_requirements = []
+    for req in requirements:
+        if req.description not in seen:
+            seen.add(req.description)
+            unique_requirements.append(req)
+    return unique_requirements
+
+
+def build_text_document(megabytes: float, seed: int = 7) -> str:
+    """RFP-like text: mostly prose, with a requirement every few lines."""
+    rng = random.Random(seed)
+    target = int(megabytes * 1024 * 1024)
+    lines, size, n = [], 0, 0
+    while size < target:
+        n += 1
+        if rng.random() < 0.3:
+            # Vary wording so most requirements are distinct
+            line = rng.choice(PARSER_REQUIREMENTS).format(n=n).replace("users", f"users in group {n}", 1)
+        else:
+            line = rng.choice(PARSER_FILLER)
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def bench_parser(args) -> None:
+    from forge_requirements_builder.tools import _parse_requirements_from_text
+
+    text = build_text_document(args.megabytes)
+    legacy_seconds, legacy = best_of(args.rounds, legacy_parse, text, "bench.txt")
+    scanner_seconds, scanned = best_of(args.rounds, _parse_requirements_from_text, text, "bench.txt")
+    if [r.model_dump() for r in legacy] != [r.model_dump() for r in scanned]:
+        raise SystemExit("Scanner output differs from the legacy parser")
+
+    print(f"document_mb: {len(text) / 1024 / 1024:.2f}")
+    print(f"requirements: {len(scanned)}")
+    print(f"legacy_ms: {legacy_seconds * 1000:.1f}")
+    print(f"scanner_ms: {scanner_seconds * 1000:.1f}")
+    print(f"speedup: {legacy_seconds / scanner_seconds:.2f}x")
+
+
+# DOCX extraction
+
+DOCX_SENTENCES = [
+    "The system shall allow users to reset their password via email.",
+    "Vendors are expected to respond within thirty days.",
+    "The platform must encrypt all data at rest using AES-256.",
+    "All figures are indicative and subject to change.",
+]
+DOCX_INSERTED = " inserted wording"
+
+
+def _docx_run(text: str) -> str:
+    return f"<w:r><w:t xml:space=\"preserve\">{escape(text)}</w:t></w:r>"
+
+
+def _docx_paragraph(rng: random.Random, n: int) -> str:
+    text = f"{n}. {rng.choice(DOCX_SENTENCES)}"
+    if rng.random() < 0.3:
+        # Tracked changes: a deletion and an insertion in the same paragraph
+        return (
+            f"<w:p>{_docx_run(text)}"
+            f"<w:del w:id=\"{n}\" w:author=\"a\"><w:r><w:delText>removed wording {n}</w:delText></w:r></w:del>"
+            f"<w:ins w:id=\"{n}\" w:author=\"a\">{_docx_run(DOCX_INSERTED)}</w:ins></w:p>"
+        )
+    return f"<w:p>{_docx_run(text)}</w:p>"
+
+
+def _docx_table(rng: random.Random, n: int) -> str:
+    rows = "".join(
+        "<w:tr>" + "".join(
+            f"<w:tc><w:p>{_docx_run(f'R{n}.{r}.{c} {rng.choice(DOCX_SENTENCES)}')}</w:p></w:tc>" for c in range(3)
+        ) + "</w:tr>"
+        for r in range(5)
+    )
+    return f"<w:tbl>{rows}</w:tbl>"
+
+
+def build_docx_document(path: str, paragraphs: int, seed: int = 7) -> None:
+    """Write a DOCX with the given number of paragraphs and a table every 50."""
+    from docx import Document
+
+    template = io.BytesIO()
+    Document().save(template)
+
+    rng = random.Random(seed)
+    with zipfile.ZipFile(template) as source:
+        original = source.read("word/document.xml").decode("utf-8")
+        head, rest = original.split("<w:body>", 1)
+        section = rest[rest.index("<w:sectPr"):rest.index("</w:body>")]
+        body = []
+        for n in range(paragraphs):
+            body.append(_docx_paragraph(rng, n))
+            if n % 50 == 49:
+                body.append(_docx_table(rng, n))
+        document = f"{head}<w:body>{''.join(body)}{section}</w:body></w:document>"
+
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as target:
+            for item in source.infolist():
+                data = document.encode("utf-8") if item.filename == "word/document.xml" else source.read(item)
+                target.writestr(item, data)
+
+
+def _measure_docx(method: str, path: str):
+    from forge_requirements_builder import tools
+    from forge_requirements_builder.docx_reader import iter_docx_blocks
+
+    extract = iter_docx_blocks if method == "streaming" else tools._iter_docx_blocks_python_docx
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    blocks = list(extract(path))
+    seconds = time.perf_counter() - started
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return seconds, (peak_kb - baseline_kb) / 1024, sorted(blocks)
+
+
+def measure_docx(method: str, path: str):
+    """Run one extractor in a fresh process: (seconds, extra peak RSS in MB, blocks)."""
+    with multiprocessing.get_context("spawn").Pool(1) as pool:
+        return pool.apply(_measure_docx, (method, path))
+
+
+def bench_docx(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.docx")
+        build_docx_document(path, args.paragraphs)
+
+        object_seconds, object_mb, object_blocks = measure_docx("python-docx", path)
+        stream_seconds, stream_mb, stream_blocks = measure_docx("streaming", path)
+
+        # python-docx drops tracked insertions, which the streaming reader keeps
+        accepted = sorted(block.replace(DOCX_INSERTED, "") for block in stream_blocks)
+        if object_blocks != accepted:
+            raise SystemExit("Streaming output differs from python-docx")
+
+        print(f"docx_mb: {os.path.getsize(path) / 1024 / 1024:.2f}")
+        print(f"blocks: {len(stream_blocks)}")
+        print(f"python_docx_ms: {object_seconds * 1000:.1f}")
+        print(f"streaming_ms: {stream_seconds * 1000:.1f}")
+        print(f"speedup: {object_seconds / stream_seconds:.2f}x")
+        print(f"python_docx_peak_mb: {object_mb:.1f}")
+        print(f"streaming_peak_mb: {stream_mb:.1f}")
+
+
+# Conflict detection
+
+CONFLICT_SUBJECTS = ["users", "administrators", "auditors", "guests", "the system", "the mobile app", "the api"]
+CONFLICT_VERBS = ["export", "view", "edit", "delete", "approve", "archive", "share", "encrypt", "sync", "print"]
+CONFLICT_OBJECTS = ["reports", "invoices", "audit logs", "customer records", "claims", "policies", "attachments"]
+CONFLICT_QUALIFIERS = [
+    "within 2 seconds", "for the current month", "from the dashboard", "in csv format",
+    "after manager approval", "on weekends", "over a vpn connection", "for archived projects",
+]
+
+
+def legacy_conflicting_pairs(requirements):
+    """The all-pairs scan the inverted index replaced."""
+    from forge_requirements_builder.tools import _are_potentially_conflicting
+
+    return [
+        (i, j)
+        for i, req1 in enumerate(requirements)
+        for j in range(i + 1, len(requirements))
+        if _are_potentially_conflicting(req1, requirements[j])
+    ]
+
+
+def build_conflict_requirements(count: int, seed: int = 11):
+    """Requirements drawn from a small vocabulary, a fifth of them negated."""
+    from forge_requirements_builder.state import RequirementRaw
+
+    rng = random.Random(seed)
+    requirements = []
+    for n in range(count):
+        modal = rng.choice(["must not", "shall never"]) if rng.random() < 0.2 else rng.choice(["must", "shall", "can"])
+        qualifiers = " ".join(rng.sample(CONFLICT_QUALIFIERS, rng.randint(0, 3)))
+        description = f"{rng.choice(CONFLICT_SUBJECTS)} {modal} {rng.choice(CONFLICT_VERBS)} {rng.choice(CONFLICT_OBJECTS)} {qualifiers}"
+        requirements.append(RequirementRaw(
+            id=f"REQ-{n + 1:05d}", title=f"Requirement {n + 1}", description=description,
+            type="Functional", source="bench"
+        ))
+    return requirements
+
+
+def bench_conflicts(args) -> None:
+    from forge_requirements_builder.tools import _find_conflicting_pairs
+
+    requirements = build_conflict_requirements(args.requirements)
+    legacy_seconds, legacy = best_of(1, legacy_conflicting_pairs, requirements)
+    indexed_seconds, indexed = best_of(1, _find_conflicting_pairs, requirements)
+    if legacy != indexed:
+        raise SystemExit("Indexed conflict detection differs from the all-pairs scan")
+
+    print(f"requirements: {len(requirements)}")
+    print(f"conflicting_pairs: {len(indexed)}")
+    print(f"legacy_ms: {legacy_seconds * 1000:.1f}")
+    print(f"indexed_ms: {indexed_seconds * 1000:.1f}")
+    print(f"speedup: {legacy_seconds / indexed_seconds:.2f}x")
+
+
+# Incremental quality validation
+
+QUALITY_MODALS = ["must", "shall", "should", "can", "must not"]
+QUALITY_TERMS = ["fast", "easy", "secure", "appropriate", "etc"]
+
+
+def build_quality_requirements(count: int, seed: int = 13):
+    """Requirements of 6-14 words from a 600-word vocabulary, some vague or unmeasured."""
+    from forge_requirements_builder.state import RequirementRaw
+
+    rng = random.Random(seed)
+    vocabulary = [f"word{n}" for n in range(600)]
+    requirements = []
+    for n in range(count):
+        words = rng.sample(vocabulary, rng.randint(6, 14))
+        if rng.random() < 0.2:
+            words.append(rng.choice(QUALITY_TERMS))
+        description = f"the system {rng.choice(QUALITY_MODALS)} {' '.join(words)}"
+        requirements.append(RequirementRaw(
+            id=f"REQ-{n + 1:05d}", title=f"Requirement {n % (count - 10) + 1}", description=description,
+            type=rng.choice(["Functional", "Non-Functional"]), source="bench"
+        ))
+    return requirements
+
+
+def _issue_keys(result):
+    return [(issue.category, issue.location, issue.description) for issue in result.issues_found]
+
+
+def bench_quality(args) -> None:
+    from forge_requirements_builder.quality import QualityEngine
+    from forge_requirements_builder.tools import validate_requirements_quality
+
+    requirements = build_quality_requirements(args.requirements)
+    engine = QualityEngine()
+    previous = engine.validate(requirements).issues_found
+
+    edited = len(requirements) // 2
+    requirements[edited] = requirements[edited].model_copy(
+        update={"description": "the system must not word1 word2 word3 word4 word5 word6 word7"}
+    )
+
+    full_seconds, full = best_of(1, validate_requirements_quality, requirements)
+    incremental_seconds, incremental = best_of(1, lambda: engine.validate(requirements, previous_issues=previous))
+    if _issue_keys(full) != _issue_keys(incremental):
+        raise SystemExit("Incremental validation differs from a full run")
+
+    print(f"requirements: {len(requirements)}")
+    print(f"issues: {incremental.total_issues}")
+    print(f"rechecked: {engine.evaluated}")
+    print(f"full_ms: {full_seconds * 1000:.1f}")
+    print(f"incremental_ms: {incremental_seconds * 1000:.1f}")
+    print(f"speedup: {full_seconds / incremental_seconds:.2f}x")
+
+
+# Keyword matching
+
+KEYWORD_WORDS = (
+    "the system shall allow users to export monthly reports within 2 seconds and keep an audit trail "
+    "of every change made by administrators on the platform so that compliance teams can review "
+    "access requests approve invoices integrate with the billing service and comply with regulation"
+).split()
+KEYWORD_TERMS = ["fast", "secure", "easy to use", "user-friendly", "flexible", "response time", "percent", "must use"]
+
+
+def legacy_keyword_rules(description):
+    """The per-rule keyword scans the automaton replaced."""
+    from forge_requirements_builder import tools
+
+    return (
+        [term for term in tools._VAGUE_TERMS if term in description.lower()],
+        any(word in description.lower() for word in tools._ACTOR_WORDS),
+        any(kw in description.lower() for kw in tools._MEASURABLE_KEYWORDS),
+        any(term in description.lower() for term in tools._CAPTURE_VAGUE_TERMS),
+        any(verb in description.lower() for verb in tools._TESTABLE_VERBS),
+        any(keyword in description.lower() for keyword in tools._NFR_KEYWORDS),
+        any(keyword in description.lower() for keyword in tools._CONSTRAINT_KEYWORDS),
+    )
+
+
+def automaton_keyword_rules(description):
+    """The same answers read from one scan of the description."""
+    from forge_requirements_builder import tools
+
+    keywords = tools._keywords_in(description)
+    return (
+        [term for term in tools._VAGUE_TERMS if term in keywords],
+        not keywords.isdisjoint(tools._ACTOR_WORDS),
+        not keywords.isdisjoint(tools._MEASURABLE_KEYWORDS),
+        not keywords.isdisjoint(tools._CAPTURE_VAGUE_TERMS),
+        not keywords.isdisjoint(tools._TESTABLE_VERBS),
+        not keywords.isdisjoint(tools._NFR_KEYWORDS),
+        not keywords.isdisjoint(tools._CONSTRAINT_KEYWORDS),
+    )
+
+
+def build_keyword_descriptions(count: int, seed: int = 17):
+    """Distinct descriptions of 12-40 words, a third with a vague or NFR term."""
+    rng = random.Random(seed)
+    descriptions = []
+    for n in range(count):
+        words = rng.choices(KEYWORD_WORDS, k=rng.randint(12, 40))
+        if rng.random() < 0.33:
+            words.insert(rng.randrange(len(words)), rng.choice(KEYWORD_TERMS))
+        descriptions.append(f"{n}: {' '.join(words).capitalize()}.")
+    return descriptions
+
+
+def bench_keywords(args) -> None:
+    from forge_requirements_builder import tools
+
+    descriptions = build_keyword_descriptions(args.requirements)
+    # Distinct descriptions, so the automaton's memo never answers from cache
+    tools._keywords_in.cache_clear()
+    legacy_seconds, legacy = best_of(1, lambda: [legacy_keyword_rules(d) for d in descriptions])
+    automaton_seconds, automaton = best_of(1, lambda: [automaton_keyword_rules(d) for d in descriptions])
+    if legacy != automaton:
+        raise SystemExit("Automaton answers differ from the per-rule scans")
+
+    print(f"requirements: {len(descriptions)}")
+    print(f"keywords: {len(tools._KEYWORDS.keywords)}")
+    print(f"mean_chars: {sum(map(len, descriptions)) / len(descriptions):.0f}")
+    print(f"legacy_ms: {legacy_seconds * 1000:.1f}")
+    print(f"automaton_ms: {automaton_seconds * 1000:.1f}")
+    print(f"speedup: {legacy_seconds / automaton_seconds:.2f}x")
+
+
+# Sharded quality rules
+
+def bench_rules(args) -> None:
+    from forge_requirements_builder.rules import RuleContext
+    from forge_requirements_builder.tools import QUALITY_RULES
+
+    requirements = build_quality_requirements(args.requirements)
+    context = RuleContext.build(requirements)
+    # At least two workers, so the pool is measured even where the default stays in-process
+    workers = max(2, args.workers or os.cpu_count() or 1)
+
+    serial_seconds, serial = best_of(1, QUALITY_RULES.check_requirements, requirements, context, None, 1)
+    sharded_seconds, sharded = best_of(1, QUALITY_RULES.check_requirements, requirements, context, None, workers)
+    if serial != sharded:
+        raise SystemExit("Sharded rule results differ from the in-process run")
+
+    print(f"requirements: {len(requirements)}")
+    print(f"issues: {sum(len(issues) for found in serial for issues in found.values())}")
+    print(f"cpus: {os.cpu_count()} workers: {workers}")
+    print(f"in_process_ms: {serial_seconds * 1000:.1f}")
+    print(f"sharded_ms: {sharded_seconds * 1000:.1f}")
+    print(f"speedup: {serial_seconds / sharded_seconds:.2f}x")
+
+
+# Traceability
+
+def legacy_has_story(requirement_ids, user_stories):
+    """The per-requirement story scan the traceability index replaced."""
+    return [any(story.requirement_id == requirement_id for story in user_stories) for requirement_id in requirement_ids]
+
+
+def build_trace_stories(requirement_ids):
+    """One story for each of the first 90% of requirements, a second for every fifth."""
+    from forge_requirements_builder.state import UserStory
+
+    stories = []
+    for n, requirement_id in enumerate(requirement_ids[:len(requirement_ids) * 9 // 10]):
+        for _ in range(2 if n % 5 == 0 else 1):
+            stories.append(UserStory(
+                id=f"STORY-{len(stories) + 1:05d}", requirement_id=requirement_id, title="Story",
+                story_statement="As a user, I want it so that it works", effort_estimate="S"
+            ))
+    return stories
+
+
+def bench_traceability(args) -> None:
+    from forge_requirements_builder.traceability import TraceabilityIndex
+
+    requirement_ids = [f"REQ-{n + 1:05d}" for n in range(args.requirements)]
+    stories = build_trace_stories(requirement_ids)
+
+    def indexed_has_story():
+        trace = TraceabilityIndex()
+        trace.sync(stories, [])
+        return trace, [trace.has_story(requirement_id) for requirement_id in requirement_ids]
+
+    legacy_seconds, legacy = best_of(1, legacy_has_story, requirement_ids, stories)
+    indexed_seconds, (trace, indexed) = best_of(1, indexed_has_story)
+    if legacy != indexed:
+        raise SystemExit("Index lookups differ from the story scan")
+
+    # Move one story to a requirement that had none
+    stories[0] = stories[0].model_copy(update={"requirement_id": requirement_ids[-1]})
+    sync_seconds, _ = best_of(1, trace.sync, stories, [])
+    if not trace.has_story(requirement_ids[-1]):
+        raise SystemExit("Sync missed the moved story")
+
+    print(f"requirements: {len(requirement_ids)}")
+    print(f"stories: {len(stories)}")
+    print(f"legacy_ms: {legacy_seconds * 1000:.1f}")
+    print(f"indexed_ms: {indexed_seconds * 1000:.1f}")
+    print(f"speedup: {legacy_seconds / indexed_seconds:.2f}x")
+    print(f"one_change_sync_ms: {sync_seconds * 1000:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    benchmarks = parser.add_subparsers(dest="benchmark", required=True)
+
+    workflow = benchmarks.add_parser("workflow", help="Node pipeline against a fake chat model")
+    workflow.add_argument("--requirements", type=int, default=25, help="Requirements in the synthetic project")
+    workflow.add_argument("--rounds", type=int, default=3, help="Runs to average over")
+    workflow.set_defaults(run=bench_workflow)
+
+    text = benchmarks.add_parser("parser", help="Requirement text scanner vs the legacy parser")
+    text.add_argument("--megabytes", type=float, default=4.0, help="Size of the generated document")
+    text.add_argument("--rounds", type=int, default=3, help="Runs per parser (best time is reported)")
+    text.set_defaults(run=bench_parser)
+
+    docx = benchmarks.add_parser("docx", help="Streaming DOCX extraction vs python-docx")
+    docx.add_argument("--paragraphs", type=int, default=50000, help="Paragraphs in the generated document")
+    docx.set_defaults(run=bench_docx)
+
+    conflicts = benchmarks.add_parser("conflicts", help="Indexed conflict detection vs the all-pairs scan")
+    conflicts.add_argument("--requirements", type=int, default=5000, help="Number of generated requirements")
+    conflicts.set_defaults(run=bench_conflicts)
+
+    quality = benchmarks.add_parser("quality", help="Incremental quality re-validation vs a full run")
+    quality.add_argument("--requirements", type=int, default=5000, help="Number of generated requirements")
+    quality.set_defaults(run=bench_quality)
+
+    keywords = benchmarks.add_parser("keywords", help="Shared keyword automaton vs per-rule scans")
+    keywords.add_argument("--requirements", type=int, default=20000, help="Number of generated descriptions")
+    keywords.set_defaults(run=bench_keywords)
+
+    rules = benchmarks.add_parser("rules", help="Requirement rules in-process vs the worker pool")
+    rules.add_argument("--requirements", type=int, default=50000, help="Number of generated requirements")
+    rules.add_argument("--workers", type=int, default=0, help="Worker processes for the pool run (0 = one per CPU)")
+    rules.set_defaults(run=bench_rules)
+
+    traceability = benchmarks.add_parser("traceability", help="Traceability index lookups vs story scans")
+    traceability.add_argument("--requirements", type=int, default=5000, help="Number of requirements")
+    traceability.set_defaults(run=bench_traceability)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,604 @@
+"""Response Caching for Forge Requirements Builder
+
+Provides a content-addressed cache for LLM responses shared by every node in
+both graphs, and one for document extraction results keyed by file content.
+Entries live in two tiers:
+
+1. An in-process LRU tier (bounded by entry count)
+2. An optional persistent SQLite tier (bounded by total size in bytes)
+
+Both tiers support a time-to-live. The LLM cache is not installed
+globally: only models passed through with_response_cache() use it. The
+nodes of both graphs do so for every deterministic (temperature 0) call
+whose answer depends only on its prompt: story authoring, discovery
+memory summaries, synthesis sections (streamed ones through
+lookup_streamed_response()) and the elicitation agent's structured
+requirement, document-summary and extraction calls. Conversational
+replies are never served from the cache. The cache key covers the model
+configuration (model name, temperature, bound tools / structured-output
+schema) and the serialized messages.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.load import dumps
+from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+logger = logging.getLogger("forge_requirements_builder")
+
+
+# ============================================================================
+# Storage Tiers
+# ============================================================================
+
+def default_cache_dir() -> Path:
+    """Per-user directory for persistent caches.
+
+    FORGE_CACHE_DIR if set, otherwise forge_requirements_builder under the
+    platform's user cache directory (XDG_CACHE_HOME or ~/.cache;
+    LOCALAPPDATA on Windows), never the current working directory.
+    """
+    configured = os.getenv("FORGE_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    base = os.getenv("LOCALAPPDATA") if os.name == "nt" else os.getenv("XDG_CACHE_HOME")
+    return Path(base or Path.home() / ".cache") / "forge_requirements_builder"
+
+
+class LRUCache:
+    """Thread-safe in-process LRU store with optional TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: Optional[float] = None):
+        """Initialize the store.
+
+        Args:
+            max_entries: Maximum number of entries kept before evicting the least recently used
+            ttl_seconds: Optional lifetime of an entry in seconds
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on miss/expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store value under key, evicting the least recently used entries if full."""
+        expires_at = time.time() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class SQLiteCache:
+    """Persistent key/value store backed by SQLite with TTL and size-based eviction.
+
+    When the total stored size exceeds max_bytes, the least recently accessed
+    entries are deleted until the store fits again.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        ttl_seconds: Optional[float] = None,
+        table: str = "cache_entries"
+    ):
+        """Open (or create) the store.
+
+        Args:
+            path: SQLite database file path
+            max_bytes: Maximum total size of stored values
+            ttl_seconds: Optional lifetime of an entry in seconds
+            table: Table name, so several stores can share one database file
+        """
+        if not table.replace("_", "").isalnum():
+            raise ValueError(f"Invalid table name: {table}")
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.table = table
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_accessed ON {table}(accessed_at)")
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on miss/expiry."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl_seconds and created_at + self.ttl_seconds <= now:
+                self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store value under key and evict old entries if over the size limit."""
+        now = time.time()
+        size = len(value.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now)
+            )
+            self._evict_locked()
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        """Remove key if present."""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def total_bytes(self) -> int:
+        """Return the total size of stored values."""
+        with self._lock:
+            return self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        return {
+            "entries": len(self),
+            "bytes": self.total_bytes(),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+    def close(self) -> None:
+        """Close the underlying connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _evict_locked(self) -> None:
+        if self.ttl_seconds:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE created_at <= ?",
+                (time.time() - self.ttl_seconds,)
+            )
+
+        total = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        # Drop least recently accessed entries until we are back under budget
+        to_delete = []
+        for key, size in self._conn.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC"
+        ):
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", to_delete)
+
+
+class TieredCache:
+    """Two-tier store: an in-process LRU in front of an optional persistent tier."""
+
+    def __init__(self, memory: Optional[LRUCache] = None, persistent: Optional[SQLiteCache] = None):
+        self.memory = memory or LRUCache()
+        self.persistent = persistent
+
+    def get(self, key: str) -> Optional[str]:
+        """Look up key in memory first, then in the persistent tier (promoting hits)."""
+        value = self.memory.get(key)
+        if value is not None or self.persistent is None:
+            return value
+        value = self.persistent.get(key)
+        if value is not None:
+            self.memory.set(key, value)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        """Store value in every tier."""
+        self.memory.set(key, value)
+        if self.persistent is not None:
+            self.persistent.set(key, value)
+
+    def clear(self) -> None:
+        """Clear every tier."""
+        self.memory.clear()
+        if self.persistent is not None:
+            self.persistent.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tier statistics."""
+        stats = {"memory": self.memory.stats()}
+        if self.persistent is not None:
+            stats["persistent"] = self.persistent.stats()
+        return stats
+
+
+# ============================================================================
+# LangChain Integration
+# ============================================================================
+
+def make_cache_key(*parts: str) -> str:
+    """Build a content-addressed key from string parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _serialize_generations(generations: Sequence[Generation]) -> str:
+    items = []
+    for gen in generations:
+        item = {"text": gen.text, "generation_info": gen.generation_info}
+        if isinstance(gen, ChatGeneration):
+            item["message"] = message_to_dict(gen.message)
+        items.append(item)
+    return json.dumps(items, default=str)
+
+
+def _deserialize_generations(value: str) -> list:
+    generations = []
+    for item in json.loads(value):
+        if "message" in item:
+            message = messages_from_dict([item["message"]])[0]
+            generations.append(ChatGeneration(message=message, generation_info=item.get("generation_info")))
+        else:
+            generations.append(Generation(text=item["text"], generation_info=item.get("generation_info")))
+    return generations
+
+
+class LLMResponseCache(BaseCache):
+    """LangChain cache adapter over a TieredCache.
+
+    LangChain passes the serialized messages as ``prompt`` and the model
+    configuration (model, temperature, bound tools or response schema) as
+    ``llm_string``; both are hashed into the key.
+    """
+
+    def __init__(self, store: Optional[TieredCache] = None):
+        self.store = store or TieredCache()
+
+    def lookup(self, prompt: str, llm_string: str):
+        value = self.store.get(make_cache_key(llm_string, prompt))
+        if value is None:
+            return None
+        try:
+            return _deserialize_generations(value)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable LLM cache entry: {e}")
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val) -> None:
+        try:
+            value = _serialize_generations(return_val)
+        except Exception as e:
+            logger.warning(f"Skipping LLM cache update: {e}")
+            return
+        self.store.set(make_cache_key(llm_string, prompt), value)
+
+    def clear(self, **kwargs: Any) -> None:
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tier statistics."""
+        return self.store.stats()
+
+
+def create_llm_cache(
+    mode: str = "memory",
+    path: Optional[str] = None,
+    max_entries: int = 1024,
+    max_bytes: int = 256 * 1024 * 1024,
+    ttl_seconds: Optional[float] = None
+) -> Optional[LLMResponseCache]:
+    """Create an LLM response cache.
+
+    Args:
+        mode: "off", "memory" (LRU only) or "sqlite" (LRU + persistent tier)
+        path: SQLite file path for the persistent tier (defaults to
+            llm_cache.sqlite in default_cache_dir())
+        max_entries: Maximum entries in the in-process tier
+        max_bytes: Maximum total size of the persistent tier
+        ttl_seconds: Optional lifetime of cached responses
+
+    Returns:
+        Configured LLMResponseCache, or None when mode is "off"
+
+    Raises:
+        ValueError: If mode is not recognized
+    """
+    mode = mode.lower()
+    if mode in ("off", "none", "false", "0", ""):
+        return None
+    if mode not in ("memory", "sqlite"):
+        raise ValueError(f"Unknown LLM cache mode: {mode}")
+
+    memory = LRUCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+    persistent = None
+    if mode == "sqlite":
+        persistent = SQLiteCache(
+            path or default_cache_dir() / "llm_cache.sqlite",
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+            table="llm_responses"
+        )
+    return LLMResponseCache(TieredCache(memory, persistent))
+
+
+_configure_lock = threading.Lock()
+_llm_cache: Optional[BaseCache] = None
+_llm_cache_configured = False
+
+
+def configure_llm_cache(cache: Optional[BaseCache] = None, force: bool = False) -> Optional[BaseCache]:
+    """Set up the process-wide LLM response cache used by with_response_cache().
+
+    Nothing is installed as LangChain's global cache, so models only use
+    this cache when they opt in.
+
+    Without an explicit cache, settings are read from the environment:
+    FORGE_LLM_CACHE (off | memory | sqlite, default memory),
+    FORGE_LLM_CACHE_PATH, FORGE_LLM_CACHE_TTL (seconds, 0 = no expiry),
+    FORGE_LLM_CACHE_MAX_ENTRIES and FORGE_LLM_CACHE_MAX_MB.
+
+    Args:
+        cache: Optional cache instance to use instead of the env-configured one
+        force: Replace an already-configured cache
+
+    Returns:
+        The configured cache (None if caching is disabled)
+    """
+    global _llm_cache, _llm_cache_configured
+    with _configure_lock:
+        if _llm_cache_configured and cache is None and not force:
+            return _llm_cache
+
+        if cache is None:
+            ttl = float(os.getenv("FORGE_LLM_CACHE_TTL", "0")) or None
+            cache = create_llm_cache(
+                mode=os.getenv("FORGE_LLM_CACHE", "memory"),
+                path=os.getenv("FORGE_LLM_CACHE_PATH"),
+                max_entries=int(os.getenv("FORGE_LLM_CACHE_MAX_ENTRIES", "1024")),
+                max_bytes=int(float(os.getenv("FORGE_LLM_CACHE_MAX_MB", "256")) * 1024 * 1024),
+                ttl_seconds=ttl
+            )
+
+        _llm_cache = cache
+        _llm_cache_configured = True
+        return cache
+
+
+def with_response_cache(model: Any) -> Any:
+    """Return a copy of a chat model that answers repeated prompts from the LLM cache.
+
+    Only use it for deterministic calls (temperature 0, structured output),
+    where a cached answer is as good as a new one. Models that explicitly
+    set cache=False, and anything that is not a chat model, are returned
+    unchanged, as is every model when caching is off.
+    """
+    cache = configure_llm_cache()
+    if cache is None or not isinstance(model, BaseChatModel) or model.cache is False:
+        return model
+    return model.model_copy(update={"cache": cache})
+
+
+def lookup_streamed_response(model: Any, messages: Sequence[BaseMessage]) -> Optional[str]:
+    """Cached text of a call made through model.stream(), or None.
+
+    LangChain only consults the cache in invoke(), so a streaming caller
+    checks here first and calls store_streamed_response() once the stream
+    ends. Entries are shared with invoke() on the same model and messages.
+    """
+    if not isinstance(model, BaseChatModel) or not isinstance(model.cache, BaseCache):
+        return None
+    generations = model.cache.lookup(dumps(messages), model._get_llm_string())
+    if not generations:
+        return None
+    return generations[0].text
+
+
+def store_streamed_response(model: Any, messages: Sequence[BaseMessage], text: str) -> None:
+    """Cache the full text of a completed model.stream() call (see lookup_streamed_response)."""
+    if isinstance(model, BaseChatModel) and isinstance(model.cache, BaseCache):
+        model.cache.update(dumps(messages), model._get_llm_string(), [ChatGeneration(message=AIMessage(content=text))])
+
+
+# ============================================================================
+# Document Extraction Cache
+# ============================================================================
+
+def file_digest(path: str, block_size: int = 1024 * 1024) -> str:
+    """Return the SHA-256 of a file's content, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Cache of document extraction results keyed by file content.
+
+    Entries are JSON-serializable dicts (parsed requirements and
+    metadata, not the document text, so entries stay small). Callers
+    include an extractor version in the key so results from older parsing
+    logic are never served.
+    """
+
+    def __init__(self, store: Optional[TieredCache] = None):
+        self.store = store or TieredCache()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, or None on miss."""
+        value = self.store.get(key)
+        if value is None:
+            return None
+        try:
+            return json.loads(value)
+        except ValueError:
+            logger.warning("Discarding unreadable extraction cache entry")
+            return None
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        """Store an entry under key."""
+        self.store.set(key, json.dumps(entry))
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self.store.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-tier statistics."""
+        return self.store.stats()
+
+
+def create_extraction_cache(
+    mode: str = "sqlite",
+    path: Optional[str] = None,
+    max_entries: int = 16,
+    max_bytes: int = 512 * 1024 * 1024
+) -> Optional[ExtractionCache]:
+    """Create a document extraction cache.
+
+    Args:
+        mode: "off", "memory" (LRU only) or "sqlite" (LRU + persistent tier)
+        path: SQLite file path for the persistent tier (defaults to
+            extraction_cache.sqlite in default_cache_dir())
+        max_entries: Maximum documents in the in-process tier
+        max_bytes: Maximum total size of the persistent tier
+
+    Returns:
+        Configured ExtractionCache, or None when mode is "off"
+
+    Raises:
+        ValueError: If mode is not recognized
+    """
+    mode = mode.lower()
+    if mode in ("off", "none", "false", "0", ""):
+        return None
+    if mode not in ("memory", "sqlite"):
+        raise ValueError(f"Unknown extraction cache mode: {mode}")
+
+    persistent = None
+    if mode == "sqlite":
+        persistent = SQLiteCache(
+            path or default_cache_dir() / "extraction_cache.sqlite",
+            max_bytes=max_bytes,
+            table="document_extractions"
+        )
+    return ExtractionCache(TieredCache(LRUCache(max_entries=max_entries), persistent))
+
+
+_extraction_cache: Optional[ExtractionCache] = None
+_extraction_cache_configured = False
+
+
+def configure_extraction_cache(
+    cache: Optional[ExtractionCache] = None,
+    force: bool = False
+) -> Optional[ExtractionCache]:
+    """Install the process-wide document extraction cache.
+
+    Without an explicit cache, settings are read from the environment:
+    FORGE_EXTRACTION_CACHE (off | memory | sqlite, default sqlite),
+    FORGE_EXTRACTION_CACHE_PATH (default: see default_cache_dir) and
+    FORGE_EXTRACTION_CACHE_MAX_MB.
+
+    Args:
+        cache: Optional cache instance to install instead of the env-configured one
+        force: Replace an already-installed cache
+
+    Returns:
+        The installed cache (None if caching is disabled)
+    """
+    global _extraction_cache, _extraction_cache_configured
+    with _configure_lock:
+        if _extraction_cache_configured and cache is None and not force:
+            return _extraction_cache
+
+        if cache is None:
+            cache = create_extraction_cache(
+                mode=os.getenv("FORGE_EXTRACTION_CACHE", "sqlite"),
+                path=os.getenv("FORGE_EXTRACTION_CACHE_PATH"),
+                max_bytes=int(float(os.getenv("FORGE_EXTRACTION_CACHE_MAX_MB", "512")) * 1024 * 1024)
+            )
+
+        _extraction_cache = cache
+        _extraction_cache_configured = True
+        return cache
@@ -0,0 +1,259 @@
+"""Near-Duplicate Requirement Detection for Forge Requirements Builder
+
+Keeps a MinHash/LSH index of the requirements in a project so that a new
+requirement can be checked against all existing ones without comparing it
+to each of them. Each requirement's text is reduced to its set of content
+words (filler words dropped, plurals folded), the set is summarized by a
+MinHash signature, and the signature is split into bands: requirements
+sharing any band are candidates, and a candidate is a near-duplicate when
+the estimated Jaccard similarity of the two signatures reaches the
+threshold. Rewordings such as "Users must be able to reset passwords" /
+"Users must be able to reset their password." are caught, while unrelated
+requirements are never compared.
+
+Modal verbs and negations are content words, and a negated requirement is
+never matched with a plain one, so "shall not let administrators..." is not
+a near-duplicate of "shall let administrators...". Near-duplicates are only
+a hint (one changed word, e.g. CSV for PDF, can be all that separates two
+real requirements): exact_match() finds exact repeats, which can be
+dropped, while query() finds requirements that merely look alike, to be
+kept and flagged for review.
+
+The index is a plain JSON-compatible dict stored in the project state
+(requirements_index), so it is saved and restored with serialize_state.
+Each entry records the content fingerprint of its requirement, and sync()
+re-indexes only the requirements that were added, changed or removed.
+"""
+
+import hashlib
+import os
+import random
+import re
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .state import RequirementRaw
+
+# Estimated similarity at which a requirement counts as a near-duplicate (0-1)
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv("FORGE_NEAR_DUPLICATE_THRESHOLD", "0.8"))
+
+# Words that do not change what a requirement asks for
+STOP_WORDS = frozenset("""
+    a all an and any are as at be been by each every for from in into is it its of on or so
+    that the their them they this to using via with within able allow allows
+    system application platform product
+""".split())
+
+# Words marking a requirement as negated
+NEGATIONS = frozenset({"not", "no", "never", "cannot", "nor", "without"})
+
+# Signature length = bands x rows; with 16 x 4, pairs at 0.8 similarity
+# are candidates with probability > 0.999 and pairs at 0.3 rarely are
+LSH_BANDS = 16
+LSH_ROWS = 4
+NUM_PERMUTATIONS = LSH_BANDS * LSH_ROWS
+
+# Bump when word extraction or hashing changes; indexes of another version are rebuilt
+INDEX_VERSION = 2
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(0x5EED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(NUM_PERMUTATIONS)
+]
+
+_NON_WORD = re.compile(r"[\W_]+")
+_CONTRACTED_NOT = re.compile(r"n[\'\u2019]t\b")
+
+
+def requirement_text(title: str, description: str) -> str:
+    """Text a requirement is compared by."""
+    return f"{title} {description}"
+
+
+def _words(text: str) -> List[str]:
+    """Words of text, lower-cased, with "n't" spelled out as "not"."""
+    return _NON_WORD.sub(" ", _CONTRACTED_NOT.sub(" not", text.lower())).split()
+
+
+def _content_words(words: Iterable[str]) -> set:
+    """Content words among words, with a plural "s" removed."""
+    content = set()
+    for word in words:
+        if word in STOP_WORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        content.add(word)
+    return content or {""}
+
+
+def minhash_signature(text: str) -> List[int]:
+    """MinHash signature (NUM_PERMUTATIONS values) of text's content words."""
+    hashes = [zlib.crc32(word.encode("utf-8")) for word in _content_words(_words(text))]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def is_negated(text: str) -> bool:
+    """Whether text contains a negation."""
+    return not NEGATIONS.isdisjoint(_words(text))
+
+
+def exact_key(text: str) -> str:
+    """Digest of text ignoring case, punctuation and spacing; equal for exact repeats."""
+    normalized = " ".join(_words(text))
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=8).hexdigest()
+
+
+@lru_cache(maxsize=1024)
+def _describe(text: str) -> Tuple[Tuple[int, ...], str, bool]:
+    """(signature, exact key, negated) of text; cached since merging asks twice."""
+    return tuple(minhash_signature(text)), exact_key(text), is_negated(text)
+
+
+def signature_similarity(first: List[int], second: List[int]) -> float:
+    """Estimated Jaccard similarity of the texts two signatures came from."""
+    return sum(x == y for x, y in zip(first, second)) / len(first)
+
+
+def _band_keys(signature: List[int]) -> List[str]:
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = list(signature[band * LSH_ROWS:(band + 1) * LSH_ROWS])
+        digest = hashlib.blake2b(repr(rows).encode("ascii"), digest_size=8).hexdigest()
+        keys.append(f"{band}:{digest}")
+    return keys
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index over a JSON-compatible dict, updated in place.
+
+    Example:
+        index = NearDuplicateIndex.for_state(state)
+        text = requirement_text(title, description)
+        if index.exact_match(text) is None:
+            match = index.query(text)  # (ID, similarity) to flag, or None
+            index.add("REQ-042", text)
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, threshold: Optional[float] = None):
+        """Wrap an index dict (a new one if data is None or from another version).
+
+        Args:
+            data: Index dict to read and update in place
+            threshold: Similarity at which query() reports a match
+                (defaults to FORGE_NEAR_DUPLICATE_THRESHOLD)
+        """
+        self.data = {} if data is None else data
+        if self.data.get("version") != INDEX_VERSION:
+            self.data.clear()
+            self.data.update({"version": INDEX_VERSION, "entries": {}, "buckets": {}, "exact": {}})
+        self.threshold = NEAR_DUPLICATE_THRESHOLD if threshold is None else threshold
+
+    @classmethod
+    def for_state(cls, state: Dict[str, Any], threshold: Optional[float] = None) -> "NearDuplicateIndex":
+        """Index stored in state["requirements_index"], synced with requirements_raw."""
+        index = cls(state.setdefault("requirements_index", {}), threshold)
+        index.sync(state.get("requirements_raw", []))
+        return index
+
+    def __len__(self) -> int:
+        return len(self.data["entries"])
+
+    def sync(self, requirements: Iterable[RequirementRaw]) -> bool:
+        """Re-index the requirements added, changed or removed since the last sync.
+
+        Entries are keyed by requirement ID and compared by content
+        fingerprint, so requirements edited or replaced in place (same
+        count, different text) are picked up too.
+
+        Returns:
+            Whether any entry changed
+        """
+        entries = self.data["entries"]
+        fingerprints = {req.id: (req, req.content_fingerprint()) for req in requirements}
+        changed = False
+        for key in [key for key in entries if key not in fingerprints]:
+            self.remove(key)
+            changed = True
+        for key, (req, fingerprint) in fingerprints.items():
+            entry = entries.get(key)
+            if entry is None or entry["fingerprint"] != fingerprint:
+                self.add(key, requirement_text(req.title, req.description), fingerprint)
+                changed = True
+        return changed
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        self.data["entries"].clear()
+        self.data["buckets"].clear()
+        self.data["exact"].clear()
+
+    def add(self, key: str, text: str, fingerprint: str = "") -> None:
+        """Index a requirement's text under key (e.g. its ID), replacing any previous entry.
+
+        Args:
+            key: Entry key
+            text: Requirement text (see requirement_text)
+            fingerprint: The requirement's content fingerprint, used by sync()
+        """
+        if key in self.data["entries"]:
+            self.remove(key)
+        signature, exact, negated = _describe(text)
+        self.data["entries"][key] = {
+            "signature": list(signature), "exact": exact, "negated": negated, "fingerprint": fingerprint
+        }
+        self.data["exact"].setdefault(exact, key)
+        for band_key in _band_keys(signature):
+            self.data["buckets"].setdefault(band_key, []).append(key)
+
+    def remove(self, key: str) -> None:
+        """Drop the entry under key, if any."""
+        entry = self.data["entries"].pop(key, None)
+        if entry is None:
+            return
+        buckets = self.data["buckets"]
+        for band_key in _band_keys(entry["signature"]):
+            keys = buckets.get(band_key, [])
+            if key in keys:
+                keys.remove(key)
+            if not keys:
+                buckets.pop(band_key, None)
+        if self.data["exact"].get(entry["exact"]) == key:
+            del self.data["exact"][entry["exact"]]
+            # Another entry may repeat the same text
+            for other, other_entry in self.data["entries"].items():
+                if other_entry["exact"] == entry["exact"]:
+                    self.data["exact"][entry["exact"]] = other
+                    break
+
+    def exact_match(self, text: str) -> Optional[str]:
+        """Key of an entry with the same text, ignoring case, punctuation and spacing."""
+        return self.data["exact"].get(_describe(text)[1])
+
+    def query(self, text: str) -> Optional[Tuple[str, float]]:
+        """Most similar indexed entry at or above the threshold.
+
+        Entries whose negation differs from text's are never a match.
+
+        Returns:
+            (key, estimated similarity), or None if nothing is similar enough
+        """
+        signature, _, negated = _describe(text)
+        entries = self.data["entries"]
+        best: Optional[Tuple[str, float]] = None
+        seen = set()
+        for band_key in _band_keys(signature):
+            for key in self.data["buckets"].get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                entry = entries[key]
+                if entry["negated"] != negated:
+                    continue
+                similarity = signature_similarity(signature, entry["signature"])
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (key, similarity)
+        return best
@@ -4,7 +4,7 @@ Defines the state graph, nodes, edges, and routing logic for the requirements en
 """
 
 import logging
-from typing import Literal, Dict, Any
+from typing import Literal, Dict, Any, Callable, Awaitable, Optional
 
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
@@ -16,7 +16,9 @@ from .nodes import (
     authoring_node,
     quality_node,
     prioritization_node,
-    synthesis_node
+    synthesis_node,
+    SYNTHESIS_RESET_EVENT,
+    SYNTHESIS_TOKEN_EVENT
 )
 
 # Initialize Logger
@@ -80,6 +82,10 @@ def decide_next_step(state: ForgeRequirementsState) -> Literal["discovery_agent"
     # If phase is complete, end
     if phase == "complete":
         return END
+    
+    # A finished document waits for the user's next instruction
+    if phase == "synthesis" and state.get("synthesis_complete"):
+        return END
         
     # Check if we should stop for user input (avoid infinite loop)
     # If the last message was from the current agent, and we haven't transitioned, stop.
@@ -193,3 +199,68 @@ def create_graph():
     app = workflow.compile(checkpointer=checkpointer)
     
     return app
+
+
+
+# ============================================================================
+# Streaming Execution
+# ============================================================================
+
+def _streaming_config(config: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Returns a copy of config with synthesis streaming switched on."""
+    config = dict(config or {})
+    config["configurable"] = {**config.get("configurable", {}), "stream_synthesis": True}
+    return config
+
+
+def stream_graph(
+    graph,
+    state: ForgeRequirementsState,
+    config: Optional[Dict[str, Any]],
+    on_token: Callable[[str], None],
+    on_reset: Optional[Callable[[int], None]] = None
+) -> ForgeRequirementsState:
+    """
+    Runs the graph like ``graph.invoke`` but streams synthesis output.
+    
+    ``on_token`` is called with each synthesis token as it arrives; the
+    final state is returned once the run ends. ``on_reset`` is called with
+    a number of characters when a section fails part-way and is retried:
+    the caller should drop that many characters from the end of the text
+    received so far.
+    """
+    final_state = state
+    for mode, chunk in graph.stream(
+        state, config=_streaming_config(config), stream_mode=["custom", "values"]
+    ):
+        if mode == "values":
+            final_state = chunk
+        elif chunk.get("type") == SYNTHESIS_TOKEN_EVENT:
+            on_token(chunk["content"])
+        elif chunk.get("type") == SYNTHESIS_RESET_EVENT and on_reset is not None:
+            on_reset(chunk["discard"])
+    return final_state
+
+
+async def astream_graph(
+    graph,
+    state: ForgeRequirementsState,
+    config: Optional[Dict[str, Any]],
+    on_token: Callable[[str], Awaitable[None]],
+    on_reset: Optional[Callable[[int], Awaitable[None]]] = None
+) -> ForgeRequirementsState:
+    """
+    Async variant of stream_graph, awaiting ``on_token`` for each token
+    and ``on_reset`` for each retracted section attempt.
+    """
+    final_state = state
+    async for mode, chunk in graph.astream(
+        state, config=_streaming_config(config), stream_mode=["custom", "values"]
+    ):
+        if mode == "values":
+            final_state = chunk
+        elif chunk.get("type") == SYNTHESIS_TOKEN_EVENT:
+            await on_token(chunk["content"])
+        elif chunk.get("type") == SYNTHESIS_RESET_EVENT and on_reset is not None:
+            await on_reset(chunk["discard"])
+    return final_state
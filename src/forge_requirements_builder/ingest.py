@@ -0,0 +1,75 @@
+"""Bulk Document Ingestion CLI for Forge Requirements Builder
+
+Extracts raw requirements from a folder (or glob) of discovery artifacts in
+parallel and merges them, de-duplicated, into a project's requirements.
+
+Usage:
+    python -m forge_requirements_builder.ingest discovery/ --recursive
+    python -m forge_requirements_builder.ingest "discovery/*.pdf" --state project.json
+
+With --state, the requirements are merged into a saved project state
+(serialize_state JSON), which is created if it does not exist. Without it,
+the merged requirements are printed as JSON.
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from .state import create_project_state, deserialize_state, serialize_state
+from .tools import extract_from_documents, find_documents, merge_extracted_requirements
+
+
+def main(argv=None) -> int:
+    """Run bulk ingestion from the command line."""
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description="Extract requirements from a folder of documents.")
+    parser.add_argument("source", help="Directory, glob pattern or single file")
+    parser.add_argument("--recursive", action="store_true", help="Include subdirectories")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: FORGE_INGEST_WORKERS)")
+    parser.add_argument("--state", help="Project state JSON file to merge into (created if missing)")
+    parser.add_argument("--project", default="Ingested Project", help="Project name for a new state")
+    args = parser.parse_args(argv)
+
+    try:
+        total = len(find_documents(args.source, recursive=args.recursive))
+    except FileNotFoundError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    finished = 0
+
+    def report(file_path, result, error):
+        nonlocal finished
+        finished += 1
+        outcome = f"{len(result.requirements)} requirements" if result else f"FAILED ({error})"
+        print(f"[{finished}/{total}] {file_path}: {outcome}", file=sys.stderr)
+
+    bulk = extract_from_documents(args.source, recursive=args.recursive, workers=args.workers, on_result=report)
+
+    state_path = Path(args.state) if args.state else None
+    if state_path and state_path.exists():
+        state = deserialize_state(json.loads(state_path.read_text(encoding="utf-8")))
+    else:
+        state = create_project_state(args.project, f"Ingested from {args.source}")
+
+    added, skipped = merge_extracted_requirements(state, bulk.documents)
+    print(
+        f"Added {added} requirements from {len(bulk.documents)} documents "
+        f"({skipped} duplicates skipped, {len(bulk.errors)} failed).",
+        file=sys.stderr
+    )
+
+    if state_path:
+        state_path.write_text(json.dumps(serialize_state(state), indent=2), encoding="utf-8")
+    else:
+        print(json.dumps([r.model_dump() for r in state["requirements_raw"]], indent=2))
+    return 1 if bulk.errors and not bulk.documents else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
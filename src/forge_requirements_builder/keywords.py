@@ -0,0 +1,74 @@
+"""Multi-Pattern Keyword Matching for Forge Requirements Builder
+
+The rule-based checks in tools.py each look for a table of keywords
+(vague terms, actor words, measurable units, NFR indicators...) anywhere in
+a requirement's text. KeywordMatcher compiles all of those tables into one
+Aho-Corasick automaton, so the text is lower-cased once and scanned once,
+character by character, whatever the number of keywords; every rule then
+reads its answer from the resulting set of found keywords.
+
+Matching is by substring on the lower-cased text, exactly like
+`keyword in text.lower()`: keywords may overlap or sit inside longer words
+("fast" in "breakfast"), and every keyword that occurs is reported.
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton finding which of a set of keywords occur in a text.
+
+    Example:
+        matcher = KeywordMatcher(["fast", "response time", "time"])
+        matcher.find("Response time must be fast")  # {"fast", "response time", "time"}
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """Build the automaton.
+
+        Args:
+            keywords: Keywords to look for (matched case-insensitively)
+        """
+        self.keywords = frozenset(keyword.lower() for keyword in keywords if keyword)
+
+        # Trie of the keywords
+        goto: List[Dict[str, int]] = [{}]
+        found: List[FrozenSet[str]] = [frozenset()]
+        for keyword in sorted(self.keywords):
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    found.append(frozenset())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            found[state] = frozenset({keyword})
+
+        # Failure links in breadth-first order, folded into a full transition
+        # table so that scanning never follows links
+        fail = [0] * len(goto)
+        self._transitions: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            found[state] |= found[fail[state]]
+            transitions = dict(self._transitions[fail[state]])
+            transitions.update(goto[state])
+            self._transitions[state] = transitions
+            for char, child in goto[state].items():
+                fail[child] = self._transitions[fail[state]].get(char, 0)
+                queue.append(child)
+        self._found = found
+
+    def find(self, text: str) -> FrozenSet[str]:
+        """Keywords occurring anywhere in text (case-insensitive)."""
+        transitions = self._transitions
+        found = self._found
+        state = 0
+        matches = set()
+        for char in text.lower():
+            state = transitions[state].get(char, 0)
+            if found[state]:
+                matches |= found[state]
+        return frozenset(matches)
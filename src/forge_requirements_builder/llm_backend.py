@@ -0,0 +1,442 @@
+"""Pluggable Chat-Model Backends for Forge Requirements Builder
+
+Lets both graphs run without a live OpenAI key. create_chat_model() picks
+the backend from FORGE_LLM_BACKEND:
+
+1. openai  - ChatOpenAI (default)
+2. record  - ChatOpenAI, with every call appended to a cassette file
+3. replay  - answers from a recorded cassette, no network
+4. fake    - synthetic responses of a configurable size, no network
+
+Replay and fake responses can simulate latency (time to first token plus a
+tokens-per-second rate) so orchestration, tool and persistence overhead
+can be profiled and load-tested deterministically on an offline machine.
+"""
+
+import json
+import logging
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+from langchain_core.caches import BaseCache
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import ConfigDict, Field, PrivateAttr
+
+from .cache import default_cache_dir, make_cache_key
+from .tokens import count_tokens
+
+logger = logging.getLogger("forge_requirements_builder")
+
+BACKENDS = ("openai", "record", "replay", "fake")
+
+# Requirement IDs in prompts, for fake structured responses
+_BLOCK_ID_PATTERN = re.compile(r"^\[([^\]\s]+)\]\s*$", re.MULTILINE)
+_ID_PATTERN = re.compile(r"\b[A-Z][A-Z0-9]*-\d+\b")
+
+
+def default_cassette_path() -> str:
+    """Cassette file used when FORGE_LLM_CASSETTE is unset (llm_cassette.jsonl in default_cache_dir())."""
+    return str(default_cache_dir() / "llm_cassette.jsonl")
+
+
+class ReplayMissError(LookupError):
+    """Raised when a replayed call has no recorded response."""
+
+
+# ============================================================================
+# Shared Helpers
+# ============================================================================
+
+def _request_key(model: str, messages: Sequence[BaseMessage], params: Dict[str, Any]) -> str:
+    """Content-addressed key for a call: model, message contents and bound params."""
+    content = [
+        [message.type, message.content, getattr(message, "tool_calls", None) or []]
+        for message in messages
+    ]
+    return make_cache_key(
+        model,
+        json.dumps(content, sort_keys=True, default=str),
+        json.dumps(params, sort_keys=True, default=str)
+    )
+
+
+def _usage(messages: Sequence[BaseMessage], text: str) -> Dict[str, int]:
+    input_tokens = sum(count_tokens(str(message.content)) for message in messages)
+    output_tokens = count_tokens(text)
+    return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+
+def _prompt_text(messages: Sequence[BaseMessage]) -> str:
+    """All message contents of a call, as one string."""
+    return "\n".join(str(message.content) for message in messages)
+
+
+def _prompt_ids(text: str) -> List[str]:
+    """IDs a prompt asks about: "[REQ-001]" block headers, else any "ABC-123" token."""
+    ids = _BLOCK_ID_PATTERN.findall(text) or _ID_PATTERN.findall(text)
+    return list(dict.fromkeys(ids))
+
+
+def _stub_from_schema(
+    schema: Dict[str, Any],
+    defs: Optional[Dict[str, Any]] = None,
+    ids: Sequence[str] = (),
+    name: str = "value",
+    required: bool = True
+) -> Any:
+    """Builds a non-empty value that validates against a JSON schema.
+
+    Arrays of objects get one item per ID in ids (one item if there are
+    none), so a batch schema answers every requirement in the prompt. Each
+    item's *_id fields take its ID and other strings readable filler
+    ("Sample title for REQ-001"). Defaults are kept, and optional arrays of
+    scalars (e.g. a conflicts_with list) are left empty.
+    """
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return _stub_from_schema(defs.get(schema["$ref"].split("/")[-1], {}), defs, ids, name, required)
+    for option in schema.get("anyOf", []):
+        if option.get("type") != "null":
+            resolved = dict(option, **{key: value for key, value in schema.items() if key != "anyOf"})
+            return _stub_from_schema(resolved, defs, ids, name, required)
+    kind = schema.get("type")
+    if kind == "array":
+        items = schema.get("items", {})
+        item_schema = defs.get(items["$ref"].split("/")[-1], {}) if "$ref" in items else items
+        if item_schema.get("type") == "object":
+            return [_stub_from_schema(items, defs, [item_id], name) for item_id in ids] or [_stub_from_schema(items, defs, (), name)]
+        if "default" in schema:
+            return schema["default"]
+        return [_stub_from_schema(items, defs, ids, name)] if required else []
+    if "default" in schema:
+        return schema["default"]
+    if kind == "object":
+        properties = schema.get("properties", {})
+        wanted = set(schema.get("required", []))
+        return {key: _stub_from_schema(value, defs, ids, key, key in wanted) for key, value in properties.items()}
+    if kind in ("integer", "number"):
+        return 1
+    if kind == "boolean":
+        return False
+    if "enum" in schema:
+        return schema["enum"][0]
+    if name.endswith("_id") and ids:
+        return ids[0]
+    return f"Sample {name.replace('_', ' ')}" + (f" for {ids[0]}" if ids else "")
+
+
+def _stub_from_prompt(text: str, ids: Sequence[str]) -> Optional[Any]:
+    """The first JSON object written out in a prompt (its "output format" example)."""
+    decoder = json.JSONDecoder()
+    for start in (index for index, char in enumerate(text) if char == "{"):
+        try:
+            value, _ = decoder.raw_decode(text, start)
+        except ValueError:
+            continue
+        if isinstance(value, dict) and value:
+            if ids:
+                value.setdefault("requirement_id", ids[0])
+            return value
+    return None
+
+
+class _SimulatedLatencyMixin:
+    """Streams a finished message with configurable latency."""
+
+    def _sleep_first_token(self) -> None:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def _sleep_for_tokens(self, text: str) -> None:
+        if self.tokens_per_second:
+            time.sleep(count_tokens(text) / self.tokens_per_second)
+
+    def _result(self, message: AIMessage) -> ChatResult:
+        self._sleep_first_token()
+        self._sleep_for_tokens(str(message.content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream_message(
+        self,
+        message: AIMessage,
+        run_manager: Optional[CallbackManagerForLLMRun] = None
+    ) -> Iterator[ChatGenerationChunk]:
+        self._sleep_first_token()
+        text = str(message.content)
+        words = text.split(" ")
+        for index, word in enumerate(words):
+            piece = word if index == len(words) - 1 else word + " "
+            self._sleep_for_tokens(piece)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+        if message.tool_calls or message.usage_metadata:
+            yield ChatGenerationChunk(message=AIMessageChunk(
+                content="",
+                tool_call_chunks=[
+                    {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                    for index, call in enumerate(message.tool_calls)
+                ],
+                usage_metadata=message.usage_metadata
+            ))
+
+
+# ============================================================================
+# Backends
+# ============================================================================
+
+class _ToolBindingMixin:
+    """bind_tools support so with_structured_output works on every backend."""
+
+    def bind_tools(self, tools: Sequence[Any], *, tool_choice: Optional[Any] = None, **kwargs: Any):
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        if tool_choice:
+            if tool_choice == "any":
+                tool_choice = "required"  # OpenAI's name for "must call a tool"
+            elif isinstance(tool_choice, str) and tool_choice not in ("auto", "none", "required"):
+                tool_choice = {"type": "function", "function": {"name": tool_choice}}
+            kwargs["tool_choice"] = tool_choice
+        return self.bind(tools=formatted, **kwargs)
+
+
+class RecordingChatModel(_ToolBindingMixin, BaseChatModel):
+    """Calls a real chat model and appends every exchange to a cassette file."""
+
+    inner: BaseChatModel
+    cassette_path: str = Field(default_factory=default_cassette_path)
+    model_name: str = "gpt-4o"
+
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def _llm_type(self) -> str:
+        return "forge-recording"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        started = time.perf_counter()
+        result = self.inner._generate(messages, stop=stop, **kwargs)
+        latency_ms = (time.perf_counter() - started) * 1000
+        message = result.generations[0].message
+        record = {
+            "key": _request_key(self.model_name, messages, kwargs),
+            "model": self.model_name,
+            "messages": [message_to_dict(m) for m in messages],
+            "response": message_to_dict(message),
+            "latency_ms": round(latency_ms, 1),
+        }
+        with self._lock:
+            Path(self.cassette_path).parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cassette_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, default=str) + "\n")
+        return result
+
+
+class ReplayChatModel(_SimulatedLatencyMixin, _ToolBindingMixin, BaseChatModel):
+    """Answers calls from a recorded cassette without touching the network.
+
+    Identical requests recorded more than once are replayed in recording
+    order (the last response repeats once they run out).
+    """
+
+    cassette_path: str = Field(default_factory=default_cassette_path)
+    model_name: str = "gpt-4o"
+    latency_ms: Optional[float] = Field(default=None, description="Fixed delay; None replays recorded latency")
+    tokens_per_second: float = 0.0
+    on_miss: str = Field(default="error", description="error | fake")
+    # A response cache would collapse repeated requests onto their first reply
+    cache: Union[BaseCache, bool, None] = False
+
+    _responses: Dict[str, List[dict]] = PrivateAttr(default_factory=dict)
+    _cursors: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def model_post_init(self, __context: Any) -> None:
+        path = Path(self.cassette_path)
+        if not path.exists():
+            logger.warning(f"LLM cassette {path} not found; every call will miss")
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._responses.setdefault(record["key"], []).append(record)
+
+    @property
+    def _llm_type(self) -> str:
+        return "forge-replay"
+
+    def _lookup(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> AIMessage:
+        key = _request_key(self.model_name, messages, kwargs)
+        with self._lock:
+            records = self._responses.get(key)
+            if not records:
+                if self.on_miss == "fake":
+                    return FakeChatModel(model_name=self.model_name)._respond(messages, kwargs)
+                raise ReplayMissError(f"No recorded response for request {key[:12]} in {self.cassette_path}")
+            position = self._cursors.get(key, 0)
+            self._cursors[key] = position + 1
+            record = records[min(position, len(records) - 1)]
+        message = messages_from_dict([record["response"]])[0]
+        if self.latency_ms is None:
+            # Recorded latency already covers generation time
+            time.sleep(record.get("latency_ms", 0) / 1000)
+        return message
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        return self._result(self._lookup(messages, kwargs))
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        yield from self._stream_message(self._lookup(messages, kwargs), run_manager)
+
+
+class FakeChatModel(_SimulatedLatencyMixin, _ToolBindingMixin, BaseChatModel):
+    """Synthetic responses of a fixed size, for load tests without a cassette.
+
+    Calls with bound tools (structured output) get a tool call whose
+    arguments validate against the schema, with one item per requirement ID
+    in the prompt (see _stub_from_schema). Plain calls whose prompt asks for
+    JSON get the prompt's example object back as JSON; other plain calls get
+    response_tokens words of filler text.
+    """
+
+    model_name: str = "gpt-4o"
+    latency_ms: float = 0.0
+    tokens_per_second: float = 0.0
+    response_tokens: int = 50
+    # Cached responses would skip the simulated latency
+    cache: Union[BaseCache, bool, None] = False
+
+    @property
+    def _llm_type(self) -> str:
+        return "forge-fake"
+
+    def _respond(self, messages: List[BaseMessage], kwargs: Dict[str, Any]) -> AIMessage:
+        tools = kwargs.get("tools") or []
+        prompt = _prompt_text(messages)
+        ids = _prompt_ids(prompt)
+        text = ""
+        tool_calls = []
+        if tools:
+            function = tools[0]["function"]
+            tool_calls.append({
+                "name": function["name"],
+                "args": _stub_from_schema(function.get("parameters", {}), ids=ids),
+                "id": f"call_{len(messages)}",
+            })
+        elif "json" in prompt.lower():
+            text = json.dumps(_stub_from_prompt(prompt, ids) or {"response": "Sample response"})
+        else:
+            text = " ".join(["lorem"] * self.response_tokens)
+        return AIMessage(content=text, tool_calls=tool_calls, usage_metadata=_usage(messages, text))
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        return self._result(self._respond(messages, kwargs))
+
+    def _stream(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> Iterator[ChatGenerationChunk]:
+        yield from self._stream_message(self._respond(messages, kwargs), run_manager)
+
+
+# ============================================================================
+# Factory
+# ============================================================================
+
+def llm_backend() -> str:
+    """Return the configured backend name (FORGE_LLM_BACKEND)."""
+    backend = os.getenv("FORGE_LLM_BACKEND", "openai").lower()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown FORGE_LLM_BACKEND '{backend}'. Options: {', '.join(BACKENDS)}")
+    return backend
+
+
+def create_chat_model(
+    model: str = "gpt-4o",
+    temperature: float = 0,
+    backend: Optional[str] = None,
+    **openai_kwargs: Any
+) -> BaseChatModel:
+    """Create the chat model for a node according to the configured backend.
+
+    Environment:
+        FORGE_LLM_BACKEND: openai | record | replay | fake
+        FORGE_LLM_CASSETTE: Cassette file for record/replay
+        FORGE_LLM_REPLAY_MISS: error | fake - what replay does with unrecorded calls
+        FORGE_FAKE_LATENCY_MS: Time to first token for replay/fake (replay
+            defaults to the recorded latency when unset)
+        FORGE_FAKE_TOKENS_PER_SEC: Generation speed for replay/fake (0 = instant)
+        FORGE_FAKE_RESPONSE_TOKENS: Size of fake responses
+
+    Args:
+        model: Model name
+        temperature: Sampling temperature
+        backend: Overrides FORGE_LLM_BACKEND
+        **openai_kwargs: Extra ChatOpenAI arguments (openai and record backends)
+    """
+    backend = (backend or llm_backend()).lower()
+    cassette = os.getenv("FORGE_LLM_CASSETTE") or default_cassette_path()
+    latency = os.getenv("FORGE_FAKE_LATENCY_MS")
+    tokens_per_second = float(os.getenv("FORGE_FAKE_TOKENS_PER_SEC", "0"))
+
+    if backend in ("openai", "record"):
+        from langchain_openai import ChatOpenAI
+        chat_model = ChatOpenAI(model=model, temperature=temperature, **openai_kwargs)
+        if backend == "openai":
+            return chat_model
+        # Every call must reach the recorder, so the response cache is bypassed
+        return RecordingChatModel(inner=chat_model, cassette_path=cassette, model_name=model, cache=False)
+    if backend == "replay":
+        return ReplayChatModel(
+            cassette_path=cassette,
+            model_name=model,
+            latency_ms=float(latency) if latency is not None else None,
+            tokens_per_second=tokens_per_second,
+            on_miss=os.getenv("FORGE_LLM_REPLAY_MISS", "error").lower(),
+        )
+    if backend == "fake":
+        return FakeChatModel(
+            model_name=model,
+            latency_ms=float(latency or 0),
+            tokens_per_second=tokens_per_second,
+            response_tokens=int(os.getenv("FORGE_FAKE_RESPONSE_TOKENS", "50")),
+        )
+    raise ValueError(f"Unknown LLM backend '{backend}'. Options: {', '.join(BACKENDS)}")
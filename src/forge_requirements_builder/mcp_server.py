@@ -2,12 +2,15 @@ import asyncio
 import json
 import logging
 from datetime import datetime
+from pathlib import Path
 from typing import List, Dict, Any, Optional
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import FastMCP, Context
 from dotenv import load_dotenv
 
 from forge_requirements_builder.state import create_project_state, ForgeRequirementsState
-from forge_requirements_builder.graph import create_graph
+from forge_requirements_builder.graph import create_graph, astream_graph
+from forge_requirements_builder.tools import extract_from_documents, find_documents, merge_extracted_requirements
+from forge_requirements_builder.traceability import TraceabilityIndex
 from forge_requirements_builder.utils import ProjectLogger
 
 # Load environment variables
@@ -141,6 +144,35 @@ def run_quality_check(project_name: str, user_stories: List[Dict[str, Any]]) ->
     issues = final_state.get("quality_issues", [])
     return json.dumps([i.model_dump() for i in issues], indent=2)
 
+@mcp.tool()
+def trace_requirements(
+    requirement_ids: List[str],
+    user_stories: List[Dict[str, Any]],
+    quality_issues: Optional[List[Dict[str, Any]]] = None
+) -> str:
+    """
+    Build a traceability matrix linking requirements to their user stories and quality issues.
+    
+    Args:
+        requirement_ids: IDs of the requirements to trace, in the order wanted
+        user_stories: User stories (each with id and requirement_id)
+        quality_issues: Optional quality issues, as returned by run_quality_check
+        
+    Returns:
+        JSON with the matrix (one {requirement_id, stories, issues} per
+        requirement) and orphan_stories (stories for other requirements).
+    """
+    from forge_requirements_builder.state import UserStory, QualityIssue
+    stories = [UserStory(**s) for s in user_stories]
+    trace = TraceabilityIndex()
+    trace.sync(stories, [QualityIssue(**i) for i in quality_issues or []])
+    
+    wanted = set(requirement_ids)
+    return json.dumps({
+        "matrix": trace.matrix(requirement_ids),
+        "orphan_stories": [s.id for s in stories if trace.requirement_for(s.id) not in wanted]
+    }, indent=2)
+
 @mcp.tool()
 def run_prioritization(project_name: str, requirements: List[Dict[str, Any]], framework: str = "MoSCoW") -> str:
     """
@@ -176,5 +208,118 @@ def run_prioritization(project_name: str, requirements: List[Dict[str, Any]], fr
     backlog = final_state.get("prioritized_backlog", [])
     return json.dumps([b.model_dump() for b in backlog], indent=2)
 
+@mcp.tool()
+async def run_synthesis(
+    project_name: str,
+    context: str,
+    requirements: List[Dict[str, Any]],
+    user_stories: Optional[List[Dict[str, Any]]] = None,
+    prioritized_backlog: Optional[List[Dict[str, Any]]] = None,
+    ctx: Context = None
+) -> str:
+    """
+    Run the Synthesis Node to generate the final requirements document.
+    
+    The document is streamed: each chunk is sent to the client as a progress
+    notification as soon as the model produces it. If a section fails
+    part-way and is retried, a "[synthesis_reset] discard the last N
+    characters" notification retracts its partial text. The returned
+    document is always complete.
+    
+    Args:
+        project_name: Name of the project
+        context: Project context
+        requirements: List of raw requirements
+        user_stories: Optional list of user stories
+        prioritized_backlog: Optional prioritized backlog
+        
+    Returns:
+        The requirements document in Markdown.
+    """
+    state = create_project_state(project_name, context)
+    
+    from forge_requirements_builder.state import RequirementRaw, UserStory, PrioritizedRequirement
+    req_objs = []
+    for r in requirements:
+        if "id" not in r: r["id"] = f"REQ-{len(req_objs)+1}"
+        if "type" not in r: r["type"] = "Functional"
+        if "source" not in r: r["source"] = "MCP"
+        req_objs.append(RequirementRaw(**r))
+    
+    state["requirements_raw"] = req_objs
+    state["user_stories"] = [UserStory(**s) for s in user_stories or []]
+    state["prioritized_backlog"] = [PrioritizedRequirement(**p) for p in prioritized_backlog or []]
+    state["prioritization_complete"] = True
+    state["workflow_phase"] = "prioritization"
+    
+    streamed_chars = 0
+    
+    async def forward_token(token: str):
+        nonlocal streamed_chars
+        streamed_chars += len(token)
+        if ctx is not None:
+            await ctx.report_progress(progress=streamed_chars, message=token)
+    
+    async def forward_reset(chars: int):
+        # Progress must not go backwards, so the retraction is sent as a message
+        if ctx is not None:
+            await ctx.report_progress(
+                progress=streamed_chars,
+                message=f"[synthesis_reset] discard the last {chars} characters; the section is being retried"
+            )
+    
+    graph = create_graph()
+    config = {"configurable": {"thread_id": "mcp-session"}}
+    final_state = await astream_graph(graph, state, config, forward_token, forward_reset)
+    
+    return final_state.get("final_deliverable") or ""
+
+@mcp.tool()
+async def ingest_documents(
+    project_name: str,
+    source: str,
+    recursive: bool = False,
+    ctx: Context = None
+) -> str:
+    """
+    Extract raw requirements from every document in a directory or glob.
+    
+    Files are parsed in parallel; a progress notification is sent as each
+    one finishes.
+    
+    Args:
+        project_name: Name of the project
+        source: Directory, glob pattern (e.g. "discovery/*.pdf") or single file
+        recursive: Include subdirectories when source is a directory
+        
+    Returns:
+        JSON with the merged, de-duplicated requirements and any per-file errors.
+    """
+    total = len(find_documents(source, recursive=recursive))
+    loop = asyncio.get_running_loop()
+    finished = 0
+    
+    def report(file_path, result, error):
+        nonlocal finished
+        finished += 1
+        if ctx is not None:
+            outcome = f"{len(result.requirements)} requirements" if result else f"failed ({error})"
+            asyncio.run_coroutine_threadsafe(
+                ctx.report_progress(progress=finished, total=total, message=f"{Path(file_path).name}: {outcome}"),
+                loop
+            )
+    
+    bulk = await asyncio.to_thread(extract_from_documents, source, recursive, None, report)
+    
+    state = create_project_state(project_name, "MCP Request")
+    added, skipped = merge_extracted_requirements(state, bulk.documents)
+    
+    return json.dumps({
+        "requirements": [r.model_dump() for r in state["requirements_raw"]],
+        "documents": len(bulk.documents),
+        "duplicates_skipped": skipped,
+        "errors": bulk.errors
+    }, indent=2)
+
 if __name__ == "__main__":
     mcp.run()
@@ -12,14 +12,16 @@ Contains the logic for all 6 nodes in the LangGraph workflow:
 import json
 import logging
 import os
-import tempfile
-from typing import Dict, Any, List, Optional
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage, AIMessage, BaseMessage
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.runnables import RunnableConfig
+from langgraph.config import get_stream_writer
 
 from .state import (
     ForgeRequirementsState, 
@@ -33,24 +35,36 @@ from .utils import (
     detect_content_type, 
     ConversationHistoryManager, 
     ProjectLogger,
-    extract_requirements_count
+    extract_requirements_count,
+    estimate_tokens
 )
 from .tools import (
     extract_from_document, 
+    extract_from_text,
+    merge_extracted_requirements,
     validate_requirement_capture,
     validate_user_story, 
     format_user_story_template,
-    validate_requirements_quality,
     apply_prioritization_framework,
-    validate_acceptance_criteria
+    validate_acceptance_criteria,
+    StoryDraft,
+    StoryDraftBatch
 )
+from .quality import refresh_quality_issues
+from .traceability import TraceabilityIndex
+from .cache import lookup_streamed_response, store_streamed_response, with_response_cache
+from .llm_backend import create_chat_model
+from .tokens import count_tokens, truncate_to_tokens
 from .prompts import (
     ORCHESTRATOR_SYSTEM_PROMPT,
     DISCOVERY_SYSTEM_PROMPT,
+    CONVERSATION_SUMMARY_PROMPT,
     AUTHORING_SYSTEM_PROMPT,
     QUALITY_SYSTEM_PROMPT,
     PRIORITIZATION_SYSTEM_PROMPT,
-    SYNTHESIS_SYSTEM_PROMPT
+    SYNTHESIS_SYSTEM_PROMPT,
+    SYNTHESIS_SECTIONS,
+    SYNTHESIS_SECTION_PROMPT
 )
 
 # Initialize Logger
@@ -58,7 +72,36 @@ logger = logging.getLogger("forge_requirements_builder")
 
 # Initialize LLM
 # Note: In a real app, model name and temp would come from config
-llm = ChatOpenAI(model="gpt-4o", temperature=0)
+# FORGE_LLM_BACKEND swaps in a record/replay/fake backend for offline runs
+llm = create_chat_model(model="gpt-4o", temperature=0)
+
+# Discovery memory: the latest messages stay verbatim, older ones are folded
+# into a rolling summary a block at a time
+MEMORY_RECENT_MESSAGES = int(os.getenv("FORGE_MEMORY_RECENT_MESSAGES", "10"))
+MEMORY_BLOCK_SIZE = int(os.getenv("FORGE_MEMORY_BLOCK_SIZE", "10"))
+MEMORY_SUMMARY_MAX_TOKENS = int(os.getenv("FORGE_MEMORY_SUMMARY_TOKENS", "1000"))
+# Tokens of aged-out turns folded per summary call (catch-up on long sessions)
+MEMORY_FOLD_CHUNK_TOKENS = int(os.getenv("FORGE_MEMORY_FOLD_CHUNK_TOKENS", "6000"))
+# Summarized messages beyond this many are dropped from conversation_history (0 = keep all)
+HISTORY_RETAIN_MESSAGES = int(os.getenv("FORGE_HISTORY_RETAIN_MESSAGES", "200"))
+
+# Maximum number of story requests the Authoring Agent keeps in flight at once
+AUTHORING_MAX_CONCURRENCY = int(os.getenv("FORGE_AUTHORING_CONCURRENCY", "8"))
+
+# Estimated tokens per batched authoring call (0 = one requirement per call)
+AUTHORING_BATCH_TOKEN_BUDGET = int(os.getenv("FORGE_AUTHORING_BATCH_TOKENS", "6000"))
+AUTHORING_MAX_BATCH_SIZE = int(os.getenv("FORGE_AUTHORING_MAX_BATCH_SIZE", "20"))
+
+# Rough size of one generated story, reserved per requirement in a batch
+STORY_OUTPUT_TOKEN_ESTIMATE = 300
+
+# Maximum number of document sections the Synthesis Node writes at once
+SYNTHESIS_MAX_CONCURRENCY = int(os.getenv("FORGE_SYNTHESIS_CONCURRENCY", "10"))
+
+# Custom stream event types emitted by synthesis_node in streaming mode
+SYNTHESIS_TOKEN_EVENT = "synthesis_token"
+SYNTHESIS_RESET_EVENT = "synthesis_reset"
+SYNTHESIS_DONE_EVENT = "synthesis_done"
 
 
 # ============================================================================
@@ -97,40 +140,10 @@ def orchestrator_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
                 
                 if result.requirements:
                     # Add to state
-                    current_count = len(state["requirements_raw"])
-                    new_reqs = []
-                    
-                    # Create a set of existing signatures (title + description) to prevent duplicates
-                    existing_signatures = {
-                        (r.title.strip().lower(), r.description.strip().lower()) 
-                        for r in state["requirements_raw"]
-                    }
-                    
-                    added_count = 0
-                    skipped_count = 0
-
-                    for i, extracted in enumerate(result.requirements):
-                        # Check for duplicates
-                        signature = (extracted.title.strip().lower(), extracted.description.strip().lower())
-                        if signature in existing_signatures:
-                            skipped_count += 1
-                            continue
-
-                        req_id = f"REQ-{current_count + added_count + 1:03d}"
-                        new_reqs.append(RequirementRaw(
-                            id=req_id,
-                            title=extracted.title,
-                            description=extracted.description,
-                            type=extracted.type,
-                            source=f"File: {file_path}"
-                        ))
-                        existing_signatures.add(signature)
-                        added_count += 1
-
-                    state["requirements_raw"].extend(new_reqs)
+                    added_count, skipped_count = merge_extracted_requirements(state, [result])
                     
                     # Add confirmation message
-                    msg = f"Successfully processed file. Extracted {len(new_reqs)} new requirements."
+                    msg = f"Successfully processed file. Extracted {added_count} new requirements."
                     if skipped_count > 0:
                         msg += f" (Skipped {skipped_count} duplicates)."
 
@@ -171,6 +184,21 @@ def orchestrator_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
                 state["current_agent"] = "prioritization_agent"
                 return state
         
+        # Retry the stories that failed to draft (the authoring message offers this)
+        if state.get("authoring_failures") and state["workflow_phase"] in ("authoring", "quality"):
+            if any(phrase in user_text for phrase in ["refine stories", "retry stories"]):
+                failed_ids = ", ".join(sorted(state["authoring_failures"]))
+                state["workflow_phase"] = "authoring"
+                state["authoring_complete"] = False  # Re-run authoring; only missing or stale stories are drafted
+                logger.info(f"[{project_id}] User retrying failed stories: {failed_ids}")
+                ConversationHistoryManager.add_message(
+                    state["conversation_history"],
+                    "assistant",
+                    f"Retrying the user stories that failed for: {failed_ids}.",
+                    agent="Orchestrator"
+                )
+                # Don't return yet - let the phase transition logic below handle routing
+        
         # Detect user requesting to create/generate stories
         if any(phrase in user_text for phrase in ["create stories", "generate stories", "create the stories", "make stories", "let's see the stories", "write stories"]):
             if state["workflow_phase"] == "discovery" and state["requirements_raw"]:
@@ -262,6 +290,9 @@ def orchestrator_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
         if state["discovery_complete"]:
             state["workflow_phase"] = "authoring"
             state["current_agent"] = "authoring_agent"
+            # Requirements added or edited since the last authoring run need new stories
+            if state["authoring_complete"] and _stories_out_of_date(state):
+                state["authoring_complete"] = False
         else:
             state["current_agent"] = "discovery_agent"
             
@@ -298,9 +329,70 @@ def orchestrator_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
 # 2. Discovery Agent Node
 # ============================================================================
 
+def _format_turns(messages: List[dict]) -> str:
+    return "\n".join(f"[{m.get('role', 'unknown').upper()}]: {m.get('content', '')}" for m in messages)
+
+
+def _fold_into_summary(summary: str, messages: List[dict]) -> str:
+    """Returns summary updated to cover messages, in token-bounded chunks."""
+    chunks: List[List[dict]] = [[]]
+    chunk_tokens = 0
+    for message in messages:
+        tokens = count_tokens(message.get("content", ""))
+        if chunks[-1] and chunk_tokens + tokens > MEMORY_FOLD_CHUNK_TOKENS:
+            chunks.append([])
+            chunk_tokens = 0
+        chunks[-1].append(message)
+        chunk_tokens += tokens
+    
+    system_prompt = CONVERSATION_SUMMARY_PROMPT.format(max_words=int(MEMORY_SUMMARY_MAX_TOKENS * 0.75))
+    for chunk in chunks:
+        turns = truncate_to_tokens(_format_turns(chunk), MEMORY_FOLD_CHUNK_TOKENS)
+        response = with_response_cache(llm).invoke([
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=f"EXISTING SUMMARY:\n{summary or 'None yet.'}\n\nNEW TURNS:\n{turns}")
+        ])
+        summary = truncate_to_tokens(str(response.content).strip(), MEMORY_SUMMARY_MAX_TOKENS)
+    return summary
+
+
+def _update_conversation_memory(state: ForgeRequirementsState) -> None:
+    """
+    Folds messages that aged out of the verbatim window into the rolling
+    conversation summary, then drops summarized messages beyond
+    FORGE_HISTORY_RETAIN_MESSAGES from the stored history.
+    
+    The summary is regenerated only when a whole block
+    (FORGE_MEMORY_BLOCK_SIZE) has aged out. If summarizing fails the
+    messages stay unsummarized and are retried on the next turn.
+    """
+    history = state["conversation_history"]
+    summarized = state.get("summarized_message_count", 0)
+    due = ConversationHistoryManager.messages_to_fold(
+        history, summarized, MEMORY_RECENT_MESSAGES, MEMORY_BLOCK_SIZE
+    )
+    if due is not None:
+        start, end = due
+        try:
+            state["conversation_summary"] = _fold_into_summary(
+                state.get("conversation_summary", ""), history[start:end]
+            )
+            summarized = end
+            logger.info(f"[{state['project_id']}] Folded {end - start} messages into the conversation summary.")
+        except Exception as e:
+            logger.warning(f"[{state['project_id']}] Could not update conversation summary: {e}")
+    
+    state["conversation_history"], state["summarized_message_count"] = ConversationHistoryManager.compact(
+        history, summarized, HISTORY_RETAIN_MESSAGES
+    )
+
+
 def discovery_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
     """
     Conducts interactive discovery to elicit requirements.
+    
+    The prompt carries a rolling summary of older turns plus the turns not
+    yet summarized verbatim, so its size stays bounded on long sessions.
     """
     project_id = state["project_id"]
     logger.info(f"[{project_id}] Discovery Agent active.")
@@ -316,9 +408,17 @@ def discovery_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
         requirements_summary=req_summary if req_summary else "None yet."
     )
     
-    # Get conversation history
-    history = ConversationHistoryManager.get_context(state["conversation_history"], last_n=10)
+    # Get conversation history: summary of older turns, then the rest verbatim
+    _update_conversation_memory(state)
+    unsummarized = state["conversation_history"][state["summarized_message_count"]:]
+    history = ConversationHistoryManager.get_context(
+        unsummarized, last_n=MEMORY_RECENT_MESSAGES + MEMORY_BLOCK_SIZE
+    )
     lc_messages = [SystemMessage(content=system_msg)]
+    if state.get("conversation_summary"):
+        lc_messages.append(SystemMessage(
+            content=f"Summary of the earlier conversation:\n{state['conversation_summary']}"
+        ))
     
     for msg in history:
         if msg["role"] == "user":
@@ -339,7 +439,6 @@ def discovery_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
     # Parse the response to extract any new requirements the agent captured
     # Look for phrases like "I've captured this as a new requirement:" or requirement lists
     response_content = response.content
-    new_requirements_captured = []
     
     # Try to extract requirements that the LLM is reporting it captured
     # This is a simple heuristic - in production we'd use structured output
@@ -350,47 +449,13 @@ def discovery_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
     ]):
         # The LLM is reporting requirements - try to extract them from its response
         try:
-            # Use the same extraction tool on the LLM's response
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.txt', encoding='utf-8') as tmp:
-                tmp.write(response_content)
-                tmp_path = tmp.name
-            
-            try:
-                extraction_result = extract_from_document(tmp_path, file_type="txt")
-                
-                if extraction_result.requirements:
-                    current_count = len(state["requirements_raw"])
-                    
-                    # Create a set of existing signatures to prevent duplicates
-                    existing_signatures = {
-                        (r.title.strip().lower(), r.description.strip().lower()) 
-                        for r in state["requirements_raw"]
-                    }
-                    
-                    added_count = 0
-                    for extracted in extraction_result.requirements:
-                        signature = (extracted.title.strip().lower(), extracted.description.strip().lower())
-                        if signature in existing_signatures:
-                            continue
-                            
-                        req_id = f"REQ-{current_count + added_count + 1:03d}"
-                        new_req = RequirementRaw(
-                            id=req_id,
-                            title=extracted.title,
-                            description=extracted.description,
-                            type=extracted.type,
-                            source="Discovery Conversation"
-                        )
-                        new_requirements_captured.append(new_req)
-                        existing_signatures.add(signature)
-                        added_count += 1
-                    
-                    if new_requirements_captured:
-                        state["requirements_raw"].extend(new_requirements_captured)
-                        logger.info(f"Extracted {len(new_requirements_captured)} requirements from agent response.")
-            finally:
-                if os.path.exists(tmp_path):
-                    os.unlink(tmp_path)
+            # Use the same parser on the LLM's response, in memory
+            extraction_result = extract_from_text(response_content, source="Discovery Conversation")
+            added_count, _ = merge_extracted_requirements(
+                state, [extraction_result], source="Discovery Conversation"
+            )
+            if added_count:
+                logger.info(f"Extracted {added_count} requirements from agent response.")
         except Exception as e:
             logger.warning(f"Failed to extract requirements from agent response: {e}")
         
@@ -409,20 +474,9 @@ def discovery_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
 # 3. Authoring Agent Node
 # ============================================================================
 
-def authoring_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
-    """
-    Transforms raw requirements into user stories.
-    """
-    project_id = state["project_id"]
-    logger.info(f"[{project_id}] Authoring Agent active.")
-    
-    # If we have raw requirements but no stories, generate them
-    if state["requirements_raw"] and not state["user_stories"]:
-        new_stories = []
-        
-        for req in state["requirements_raw"]:
-            # Use LLM to generate story for each requirement
-            prompt = f"""
+def _build_story_prompt(req: RequirementRaw) -> str:
+    """Build the per-requirement authoring prompt."""
+    return f"""
             Transform this requirement into a User Story with Acceptance Criteria:
             Title: {req.title}
             Description: {req.description}
@@ -436,47 +490,375 @@ def authoring_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
                 "effort": "M"
             }}
             """
+
+
+def _parse_json_content(content: str) -> Dict[str, Any]:
+    """Parse a JSON object from an LLM response, stripping markdown fences."""
+    content = content.strip()
+    if "```json" in content:
+        content = content.split("```json")[1].split("```")[0]
+    elif "```" in content:
+        content = content.split("```")[1].split("```")[0]
+    return json.loads(content)
+
+
+def _generate_story_data(req: RequirementRaw) -> Dict[str, Any]:
+    """Ask the LLM for a single story draft and return the parsed JSON."""
+    # Deterministic call: identical requirements are served from FORGE_LLM_CACHE
+    response = with_response_cache(llm).invoke([
+        SystemMessage(content=AUTHORING_SYSTEM_PROMPT.format(requirements_count=1)),
+        HumanMessage(content=_build_story_prompt(req))
+    ])
+    return _parse_json_content(str(response.content))
+
+
+def _format_requirement_block(req: RequirementRaw) -> str:
+    """Format one requirement for a multi-requirement authoring prompt."""
+    return f"""[{req.id}]
+Title: {req.title}
+Description: {req.description}
+Type: {req.type}
+"""
+
+
+def _build_batch_story_prompt(requirements: List[RequirementRaw]) -> str:
+    """Build the prompt asking for one story per requirement in a single call."""
+    blocks = "\n".join(_format_requirement_block(req) for req in requirements)
+    return f"""Transform each of the following requirements into a User Story with Acceptance Criteria.
+Return exactly one story per requirement and copy its requirement_id verbatim.
+
+{blocks}"""
+
+
+def _generate_story_batch_data(requirements: List[RequirementRaw]) -> Dict[str, Dict[str, Any]]:
+    """Ask the LLM for stories for several requirements in one structured-output call.
+    
+    Returns:
+        Story data keyed by requirement ID. Requirements the model dropped or
+        returned without a usable story are absent from the result.
+    """
+    # Deterministic structured output: identical batches are served from FORGE_LLM_CACHE
+    structured_llm = with_response_cache(llm).with_structured_output(StoryDraftBatch)
+    result = structured_llm.invoke([
+        SystemMessage(content=AUTHORING_SYSTEM_PROMPT.format(requirements_count=len(requirements))),
+        HumanMessage(content=_build_batch_story_prompt(requirements))
+    ])
+    
+    wanted = {req.id for req in requirements}
+    drafts: Dict[str, Dict[str, Any]] = {}
+    for draft in getattr(result, "stories", None) or []:
+        if not isinstance(draft, StoryDraft):
+            continue
+        if draft.requirement_id not in wanted or draft.requirement_id in drafts:
+            continue
+        if not draft.title.strip() or not draft.story_statement.strip():
+            continue
+        drafts[draft.requirement_id] = draft.model_dump()
+    return drafts
+
+
+def _plan_authoring_batches(
+    requirements: List[RequirementRaw],
+    token_budget: int = AUTHORING_BATCH_TOKEN_BUDGET,
+    max_batch_size: int = AUTHORING_MAX_BATCH_SIZE
+) -> List[List[int]]:
+    """Group requirement positions into batches that fit the token budget.
+    
+    Each batch pays for the system prompt once; every requirement adds its
+    own prompt block plus an allowance for the generated story.
+    
+    Args:
+        requirements: Requirements to author stories for
+        token_budget: Estimated tokens allowed per call (0 disables batching)
+        max_batch_size: Upper bound on requirements per call
+        
+    Returns:
+        Lists of positions into requirements, in original order
+    """
+    if token_budget <= 0 or max_batch_size <= 1:
+        return [[position] for position in range(len(requirements))]
+    
+    overhead = estimate_tokens(AUTHORING_SYSTEM_PROMPT) + estimate_tokens(_build_batch_story_prompt([]))
+    batches: List[List[int]] = []
+    current: List[int] = []
+    current_ids: set = set()
+    used = overhead
+    
+    for position, req in enumerate(requirements):
+        cost = estimate_tokens(_format_requirement_block(req)) + STORY_OUTPUT_TOKEN_ESTIMATE
+        if current and (
+            used + cost > token_budget
+            or len(current) >= max_batch_size
+            or req.id in current_ids
+        ):
+            batches.append(current)
+            current, current_ids, used = [], set(), overhead
+        current.append(position)
+        current_ids.add(req.id)
+        used += cost
+    
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _generate_stories_concurrently(
+    requirements: List[RequirementRaw],
+    max_concurrency: int = AUTHORING_MAX_CONCURRENCY,
+    token_budget: int = AUTHORING_BATCH_TOKEN_BUDGET
+) -> Tuple[Dict[int, Dict[str, Any]], Dict[str, str]]:
+    """Fan out story generation across a bounded thread pool.
+    
+    Requirements are packed into multi-requirement calls sized by the token
+    budget. Any requirement a batch call drops or mangles is retried on its
+    own; single-requirement calls are not retried.
+    
+    Args:
+        requirements: Requirements to author stories for
+        max_concurrency: Maximum number of LLM calls in flight
+        token_budget: Estimated tokens allowed per batched call
+        
+    Returns:
+        Tuple of (story data keyed by requirement position, errors keyed by requirement ID).
+        A failure for one requirement never cancels the rest of the batch.
+    """
+    drafts: Dict[int, Dict[str, Any]] = {}
+    failures: Dict[str, str] = {}
+    if not requirements:
+        return drafts, failures
+    
+    batches = _plan_authoring_batches(requirements, token_budget)
+    workers = max(1, min(max_concurrency, len(batches)))
+    
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="authoring") as executor:
+        single_futures = {}
+        batch_futures = {}
+        for batch in batches:
+            if len(batch) == 1:
+                position = batch[0]
+                single_futures[executor.submit(_generate_story_data, requirements[position])] = position
+            else:
+                batch_reqs = [requirements[position] for position in batch]
+                batch_futures[executor.submit(_generate_story_batch_data, batch_reqs)] = batch
+        
+        for future in as_completed(batch_futures):
+            batch = batch_futures[future]
+            try:
+                batch_drafts = future.result()
+            except Exception as e:
+                logger.warning(f"Batched story generation failed for {len(batch)} requirements: {e}")
+                batch_drafts = {}
             
+            for position in batch:
+                req = requirements[position]
+                if req.id in batch_drafts:
+                    drafts[position] = batch_drafts[req.id]
+                else:
+                    # Retry only the dropped item, not the whole batch
+                    single_futures[executor.submit(_generate_story_data, req)] = position
+        
+        for future in as_completed(single_futures):
+            position = single_futures[future]
+            req = requirements[position]
             try:
-                response = llm.invoke([
-                    SystemMessage(content=AUTHORING_SYSTEM_PROMPT.format(requirements_count=1)),
-                    HumanMessage(content=prompt)
-                ])
-                
-                # Parse JSON (simplified)
-                content = str(response.content).strip()
-                if "```json" in content:
-                    content = content.split("```json")[1].split("```")[0]
-                elif "```" in content:
-                    content = content.split("```")[1].split("```")[0]
-                    
-                data = json.loads(content)
-                
-                story = UserStory(
-                    id=f"STORY-{len(new_stories)+1:03d}",
-                    requirement_id=req.id,
-                    title=data.get("title", req.title),
-                    story_statement=data.get("story_statement", ""),
-                    acceptance_criteria=data.get("acceptance_criteria", []),
-                    edge_cases=[], # Could ask LLM for these too
-                    definition_of_done=["Unit tests passed", "Code reviewed"],
-                    effort_estimate=data.get("effort", "M")
-                )
-                new_stories.append(story)
-                
+                drafts[position] = future.result()
             except Exception as e:
                 logger.error(f"Failed to generate story for {req.id}: {e}")
+                failures[req.id] = str(e)
+    
+    return drafts, failures
+
+
+def _plan_story_sync(
+    requirements: List[RequirementRaw],
+    stories: List[UserStory]
+) -> Tuple[Dict[str, List[UserStory]], List[int], Dict[str, str], int]:
+    """Work out which stories are still current for the given requirements.
+    
+    A story is current when its requirement still exists and the requirement's
+    content fingerprint matches the one recorded on the story. Stories authored
+    before fingerprints existed adopt the requirement's current fingerprint.
+    
+    Args:
+        requirements: Current requirements
+        stories: Existing user stories
         
-        state["user_stories"] = new_stories
-        state["authoring_complete"] = True
-        
-        ConversationHistoryManager.add_message(
-            state["conversation_history"],
-            "assistant",
-            f"I've drafted {len(new_stories)} user stories based on your requirements. Please review them.",
-            agent="Authoring Agent"
+    Returns:
+        Tuple of (current stories keyed by requirement ID, positions of
+        requirements that need a new story, story IDs to reuse for changed
+        requirements keyed by requirement ID, number of stories dropped)
+    """
+    fingerprints = {req.id: req.content_fingerprint() for req in requirements}
+    
+    stories_by_req: Dict[str, List[UserStory]] = {}
+    dropped = 0
+    for story in stories:
+        if story.requirement_id not in fingerprints:
+            dropped += 1
+            continue
+        stories_by_req.setdefault(story.requirement_id, []).append(story)
+    
+    kept: Dict[str, List[UserStory]] = {}
+    to_author: List[int] = []
+    reuse_ids: Dict[str, str] = {}
+    for position, req in enumerate(requirements):
+        if req.id in kept or req.id in reuse_ids:
+            continue
+        existing = stories_by_req.get(req.id, [])
+        fingerprint = fingerprints[req.id]
+        if existing and all(s.source_fingerprint in (None, fingerprint) for s in existing):
+            kept[req.id] = existing
+            continue
+        if existing:
+            # Requirement changed: regenerate one story under the first old ID
+            reuse_ids[req.id] = existing[0].id
+            dropped += len(existing) - 1
+        to_author.append(position)
+    
+    return kept, to_author, reuse_ids, dropped
+
+
+def _stories_out_of_date(state: ForgeRequirementsState) -> bool:
+    """Check whether any requirement lacks a current story or any story is orphaned."""
+    if not state["requirements_raw"]:
+        return False
+    _, to_author, _, dropped = _plan_story_sync(state["requirements_raw"], state["user_stories"])
+    return bool(to_author or dropped)
+
+
+def _next_story_number(story_ids: List[str]) -> int:
+    """Return the next free STORY-NNN number."""
+    highest = 0
+    for story_id in story_ids:
+        try:
+            highest = max(highest, int(story_id.rsplit("-", 1)[1]))
+        except (IndexError, ValueError):
+            continue
+    return highest + 1
+
+
+def authoring_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
+    """
+    Transforms raw requirements into user stories.
+    
+    Authoring is incremental: only requirements that are new, or whose
+    content fingerprint changed, get a new story. Stories whose requirement
+    was removed are dropped and every other story is kept as is.
+    
+    Requirements are packed into batched calls (FORGE_AUTHORING_BATCH_TOKENS)
+    that are sent concurrently (bounded by FORGE_AUTHORING_CONCURRENCY).
+    STORY-NNN numbers follow requirement order, not completion order.
+    """
+    project_id = state["project_id"]
+    logger.info(f"[{project_id}] Authoring Agent active.")
+    
+    if not state["requirements_raw"]:
+        return state
+    
+    requirements = state["requirements_raw"]
+    first_run = not state["user_stories"]
+    kept, to_author, reuse_ids, dropped = _plan_story_sync(requirements, state["user_stories"])
+    
+    # Stories authored before fingerprints existed adopt the current one
+    fingerprints = {req.id: req.content_fingerprint() for req in requirements}
+    for req_id, group in kept.items():
+        for story in group:
+            story.source_fingerprint = fingerprints[req_id]
+    
+    if not to_author and not dropped and not first_run:
+        # Everything is current - nothing to regenerate
+        state["authoring_failures"] = {}
+        if not state["authoring_complete"]:
+            state["authoring_complete"] = True
+            ConversationHistoryManager.add_message(
+                state["conversation_history"],
+                "assistant",
+                f"All {len(state['user_stories'])} user stories are up to date with the requirements.",
+                agent="Authoring Agent"
+            )
+        return state
+    
+    pending = [requirements[position] for position in to_author]
+    logger.info(
+        f"[{project_id}] Authoring {len(pending)} of {len(requirements)} requirements "
+        f"({len(reuse_ids)} changed, {dropped} stories dropped)."
+    )
+    drafts, failures = _generate_stories_concurrently(pending)
+    
+    # Number from every prior story so IDs of removed stories are never reused
+    next_number = _next_story_number([s.id for s in state["user_stories"]])
+    authored: Dict[str, UserStory] = {}
+    for index, req in enumerate(pending):
+        data = drafts.get(index)
+        if data is None:
+            continue
+        story_id = reuse_ids.get(req.id)
+        if story_id is None:
+            story_id = f"STORY-{next_number:03d}"
+        try:
+            story = UserStory(
+                id=story_id,
+                requirement_id=req.id,
+                title=data.get("title", req.title),
+                story_statement=data.get("story_statement", ""),
+                acceptance_criteria=data.get("acceptance_criteria", []),
+                edge_cases=data.get("edge_cases", []),
+                definition_of_done=["Unit tests passed", "Code reviewed"],
+                effort_estimate=data.get("effort", "M"),
+                source_fingerprint=fingerprints[req.id]
+            )
+        except Exception as e:
+            logger.error(f"Failed to generate story for {req.id}: {e}")
+            failures[req.id] = str(e)
+            continue
+        if req.id not in reuse_ids:
+            next_number += 1
+        authored[req.id] = story
+    
+    # Keep stories in requirement order. A changed requirement whose regeneration
+    # failed keeps its old story (with the old fingerprint, so it is retried next run).
+    previous: Dict[str, List[UserStory]] = {}
+    for story in state["user_stories"]:
+        previous.setdefault(story.requirement_id, []).append(story)
+    
+    user_stories: List[UserStory] = []
+    for req in requirements:
+        if req.id in kept:
+            user_stories.extend(kept.pop(req.id))
+        elif req.id in authored:
+            user_stories.append(authored.pop(req.id))
+        elif req.id in reuse_ids:
+            user_stories.extend(previous.get(req.id, []))
+    
+    state["user_stories"] = user_stories
+    # Keep requirement -> story lookups in step for quality and synthesis
+    TraceabilityIndex.for_state(state)
+    state["authoring_failures"] = failures
+    state["authoring_complete"] = True
+    
+    new_count = len([r for r in pending if r.id not in reuse_ids and r.id not in failures])
+    changed_count = len([r for r in pending if r.id in reuse_ids and r.id not in failures])
+    if first_run:
+        msg = f"I've drafted {len(user_stories)} user stories based on your requirements. Please review them."
+    else:
+        msg = (
+            f"I've updated the user stories: {new_count} new, {changed_count} regenerated for changed "
+            f"requirements, {dropped} removed. {len(user_stories)} stories in total."
         )
-        
+    if failures:
+        msg += (
+            f"\n\nI couldn't draft stories for {len(failures)} requirement(s): "
+            + ", ".join(sorted(failures))
+            + ". Say 'refine stories' to retry them."
+        )
+    
+    ConversationHistoryManager.add_message(
+        state["conversation_history"],
+        "assistant",
+        msg,
+        agent="Authoring Agent"
+    )
+    
     return state
 
 
@@ -491,15 +873,13 @@ def quality_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
     project_id = state["project_id"]
     logger.info(f"[{project_id}] Quality Agent active.")
     
-    # Run validation tools only once
-    if state["requirements_raw"] and not state["quality_complete"]:
-        validation_result = validate_requirements_quality(
-            state["requirements_raw"],
-            state["user_stories"]
-        )
-        
-        state["quality_issues"] = validation_result.issues_found
-        
+    # Re-validate on every visit; only requirements changed since the last
+    # run are re-checked, and issues still found keep their IDs
+    if not state["requirements_raw"]:
+        return state
+    
+    validation_result, issues_changed = refresh_quality_issues(state)
+    if not state["quality_complete"] or issues_changed:
         # Generate summary message
         issue_summary = (
             f"Found {validation_result.total_issues} issues: "
@@ -574,45 +954,248 @@ def prioritization_node(state: ForgeRequirementsState) -> ForgeRequirementsState
 # 6. Synthesis Node
 # ============================================================================
 
-def synthesis_node(state: ForgeRequirementsState) -> ForgeRequirementsState:
+def _synthesis_data_slices(state: ForgeRequirementsState) -> Dict[str, Any]:
+    """
+    Builds the named slices of project data that document sections draw on,
+    so each section prompt carries only what that section needs.
+    """
+    requirements = state["requirements_raw"]
+    stories = state["user_stories"]
+    trace = TraceabilityIndex.for_state(state)
+    return {
+        "project": {"project_name": state["project_name"], "context": state["user_context"]},
+        "requirement_index": [
+            {"id": r.id, "title": r.title, "type": r.type, "source": r.source} for r in requirements
+        ],
+        "requirements": [
+            {"id": r.id, "title": r.title, "type": r.type, "description": r.description} for r in requirements
+        ],
+        "functional_requirements": [r.model_dump() for r in requirements if r.type == "Functional"],
+        "non_functional_requirements": [r.model_dump() for r in requirements if r.type != "Functional"],
+        "traceability": trace.matrix(r.id for r in requirements),
+        "stories": [s.model_dump(exclude={"source_fingerprint"}) for s in stories],
+        "story_scenarios": [
+            {"id": s.id, "requirement_id": s.requirement_id, "title": s.title, "story_statement": s.story_statement}
+            for s in stories
+        ],
+        "acceptance_and_edge_cases": [
+            {"id": s.id, "title": s.title, "acceptance_criteria": s.acceptance_criteria, "edge_cases": s.edge_cases}
+            for s in stories
+        ],
+        "priorities": [p.model_dump() for p in state["prioritized_backlog"]],
+        "risks": [r.model_dump() for r in state["acknowledged_risks"]]
+    }
+
+
+def _build_section_messages(
+    number: int,
+    section: Dict[str, Any],
+    project_name: str,
+    slices: Dict[str, Any]
+) -> List[BaseMessage]:
+    """Builds the prompt for one document section from its data slices."""
+    data = {key: slices[key] for key in section["data"]}
+    prompt = SYNTHESIS_SECTION_PROMPT.format(
+        number=number,
+        title=section["title"],
+        instructions=section["instructions"],
+        project_name=project_name,
+        data=json.dumps(data, default=str)
+    )
+    return [SystemMessage(content=SYNTHESIS_SYSTEM_PROMPT), HumanMessage(content=prompt)]
+
+
+def _section_heading(number: int, section: Dict[str, Any]) -> str:
+    return f"## {number}. {section['title']}\n\n"
+
+
+def _generate_section(messages: List[BaseMessage], on_token=None) -> str:
+    """Writes one section, streaming tokens to on_token when given.
+    
+    Sections are deterministic, so regenerating an unchanged document is
+    served from FORGE_LLM_CACHE (a cached section streams as one token).
+    """
+    model = with_response_cache(llm)
+    if on_token is None:
+        return str(model.invoke(messages).content)
+    cached = lookup_streamed_response(model, messages)
+    if cached is not None:
+        on_token(cached)
+        return cached
+    parts: List[str] = []
+    for chunk in model.stream(messages):
+        text = chunk.content if isinstance(chunk.content, str) else str(chunk.content)
+        if text:
+            parts.append(text)
+            on_token(text)
+    section = "".join(parts)
+    store_streamed_response(model, messages, section)
+    return section
+
+
+def _synthesize_sections(
+    section_messages: List[List[BaseMessage]],
+    writer=None,
+    max_concurrency: int = SYNTHESIS_MAX_CONCURRENCY
+) -> Tuple[List[str], Dict[int, str]]:
+    """
+    Writes all sections concurrently and returns their bodies in document order.
+    
+    Sections whose call fails are resubmitted once to the pool; sections
+    that still fail come back empty and are reported in the failures dict
+    (section index -> error).
+    
+    With a stream writer, tokens are emitted in document order. The
+    earliest unfinished section streams live; later sections, running in
+    parallel, are buffered and flushed when their turn comes. If the live
+    section fails after streaming part of its text, a reset event
+    (``{"type": "synthesis_reset", "section": n, "discard": chars}``) tells
+    clients to drop the last ``chars`` characters before the retry streams,
+    so the stream with resets applied always matches the stitched document.
+    A buffered section's failed attempt is simply dropped. Section headings
+    are emitted by this function, not by the model.
+    """
+    count = len(section_messages)
+    events: "queue.Queue[Tuple[int, str, Any]]" = queue.Queue()
+    
+    def work(index: int):
+        on_token = None
+        if writer is not None:
+            on_token = lambda text: events.put((index, "token", text))
+        try:
+            events.put((index, "done", _generate_section(section_messages[index], on_token)))
+        except Exception as e:
+            events.put((index, "failed", e))
+    
+    bodies: List[Optional[str]] = [None] * count
+    failed: Dict[int, Exception] = {}
+    retried: set = set()
+    buffers: Dict[int, List[str]] = {index: [] for index in range(count)}
+    current = 0
+    # Characters of the live section's body streamed so far
+    live_chars = 0
+    
+    def emit(text: str):
+        writer({"type": SYNTHESIS_TOKEN_EVENT, "content": text})
+    
+    def go_live(index: int):
+        """Emits a section's heading and buffered tokens; it then streams directly."""
+        nonlocal live_chars
+        if index > 0:
+            emit("\n\n")
+        emit(_section_heading(index + 1, SYNTHESIS_SECTIONS[index]))
+        live_chars = 0
+        for text in buffers.pop(index):
+            emit(text)
+            live_chars += len(text)
+    
+    if writer is not None and count:
+        go_live(0)
+    
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        for index in range(count):
+            executor.submit(work, index)
+        finished = 0
+        while finished < count:
+            index, kind, payload = events.get()
+            if kind == "token":
+                if index == current:
+                    emit(payload)
+                    live_chars += len(payload)
+                else:
+                    buffers[index].append(payload)
+                continue
+            if kind == "failed":
+                # A worker's tokens are queued before its outcome, so this
+                # covers everything the failed attempt produced
+                if index == current and live_chars:
+                    writer({"type": SYNTHESIS_RESET_EVENT, "section": index + 1, "discard": live_chars})
+                    live_chars = 0
+                buffers[index] = []
+                if index not in retried:
+                    logger.warning(f"Section {index + 1} failed, retrying: {payload}")
+                    retried.add(index)
+                    executor.submit(work, index)
+                    continue
+                failed[index] = payload
+                payload = ""
+            finished += 1
+            bodies[index] = payload
+            # Move past every finished section; the next unfinished one goes live
+            while current < count and bodies[current] is not None:
+                current += 1
+                if writer is not None and current < count:
+                    go_live(current)
+    
+    return [body or "" for body in bodies], {index: str(e) for index, e in failed.items()}
+
+
+def _document_title(project_name: str) -> str:
+    return f"# Requirements Specification Document: {project_name}\n\n"
+
+
+def _stitch_document(project_name: str, bodies: List[str]) -> str:
+    """Joins section bodies under their numbered headings in document order."""
+    sections = [
+        _section_heading(number, section) + body.strip()
+        for number, (section, body) in enumerate(zip(SYNTHESIS_SECTIONS, bodies), start=1)
+    ]
+    return _document_title(project_name) + "\n\n".join(sections) + "\n"
+
+
+def synthesis_node(
+    state: ForgeRequirementsState,
+    config: Optional[RunnableConfig] = None
+) -> ForgeRequirementsState:
     """
     Generates the final requirements document.
+    
+    Each of the 10 sections is written by its own concurrent call
+    (bounded by FORGE_SYNTHESIS_CONCURRENCY) that sees only the data that
+    section needs. Sections are stitched in document order.
+    
+    When the graph is run with ``configurable={"stream_synthesis": True}``
+    the document is streamed in order: each token is emitted as a custom
+    stream event (``{"type": "synthesis_token", "content": ...}``) followed
+    by a single ``synthesis_done`` event. A ``synthesis_reset`` event
+    (``"discard"``: characters to drop from the end of the text so far)
+    retracts the partial output of a section that failed and is retried.
+    Consume them with ``stream_mode="custom"``.
     """
     project_id = state["project_id"]
     logger.info(f"[{project_id}] Synthesis Node active.")
     
     if not state["synthesis_complete"]:
-        # Prepare data for the prompt
-        data_context = {
-            "project_name": state["project_name"],
-            "context": state["user_context"],
-            "requirements": [r.model_dump() for r in state["requirements_raw"]],
-            "stories": [s.model_dump() for s in state["user_stories"]],
-            "priorities": [p.model_dump() for p in state["prioritized_backlog"]],
-            "risks": [r.model_dump() for r in state["acknowledged_risks"]]
-        }
+        slices = _synthesis_data_slices(state)
+        section_messages = [
+            _build_section_messages(number, section, state["project_name"], slices)
+            for number, section in enumerate(SYNTHESIS_SECTIONS, start=1)
+        ]
         
-        prompt = f"""
-        Generate the final Requirements Specification Document based on this data:
-        {json.dumps(data_context, default=str)}
+        writer = None
+        if (config or {}).get("configurable", {}).get("stream_synthesis"):
+            writer = get_stream_writer()
+            writer({"type": SYNTHESIS_TOKEN_EVENT, "content": _document_title(state["project_name"])})
         
-        Follow the 10-section structure defined in your system prompt.
-        Output valid Markdown.
-        """
+        bodies, failures = _synthesize_sections(section_messages, writer)
+        state["final_deliverable"] = _stitch_document(state["project_name"], bodies)
+        if writer is not None:
+            writer({"type": SYNTHESIS_DONE_EVENT, "length": len(state["final_deliverable"])})
         
-        response = llm.invoke([
-            SystemMessage(content=SYNTHESIS_SYSTEM_PROMPT),
-            HumanMessage(content=prompt)
-        ])
-        
-        state["final_deliverable"] = str(response.content)
         state["synthesis_complete"] = True
         # Don't set workflow_phase to "complete" - let user decide when done
         
+        message = "✅ Requirements Document Generated!\n\nYour final Requirements Specification Document is ready. You can download it from the sidebar.\n\nYou can also continue refining the requirements:\n- **Add requirements** - Return to discovery to add more requirements\n- **Refine stories** - Go back to authoring to adjust user stories\n- **Review issues** - Return to quality review\n- **Adjust priorities** - Go back to prioritization\n- **Regenerate document** - Create an updated version with current changes\n- **Done** - When you're satisfied, just say 'done' to finish"
+        if failures:
+            titles = ", ".join(
+                f"{index + 1}. {SYNTHESIS_SECTIONS[index]['title']}" for index in sorted(failures)
+            )
+            message += f"\n\n⚠️ These sections could not be generated and are empty: {titles}. Say 'regenerate document' to try again."
+        
         ConversationHistoryManager.add_message(
             state["conversation_history"],
             "assistant",
-            "✅ Requirements Document Generated!\n\nYour final Requirements Specification Document is ready. You can download it from the sidebar.\n\nYou can also continue refining the requirements:\n- **Add requirements** - Return to discovery to add more requirements\n- **Refine stories** - Go back to authoring to adjust user stories\n- **Review issues** - Return to quality review\n- **Adjust priorities** - Go back to prioritization\n- **Regenerate document** - Create an updated version with current changes\n- **Done** - When you're satisfied, just say 'done' to finish",
+            message,
             agent="Synthesis Agent"
         )
         
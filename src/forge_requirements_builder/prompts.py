@@ -78,6 +78,18 @@ Project: {project_name}
 Existing Requirements: {requirements_summary}
 """
 
+# Folds turns that age out of the verbatim history window into a running summary
+CONVERSATION_SUMMARY_PROMPT = """You maintain the running memory of a requirements discovery conversation.
+
+Update the existing summary so it also covers the new conversation turns. Keep:
+- Requirements, features and constraints the user described
+- Decisions, priorities and preferences the user stated
+- Open questions and topics still to explore
+
+Drop greetings and small talk. Write concise bullet points, oldest topics first,
+and keep the whole summary under {max_words} words. Output only the updated summary.
+"""
+
 # ============================================================================
 # Authoring Agent
 # ============================================================================
@@ -201,3 +213,71 @@ TONE AND STYLE:
 - Formal, clear, and comprehensive.
 - Documentation-ready.
 """
+
+# Each section of the document is written by its own call. Every entry gives
+# the section title, what to write, and the slices of project data the call
+# receives (see nodes._synthesis_data_slices).
+SYNTHESIS_SECTIONS = [
+    {
+        "title": "Executive Summary & Overview",
+        "instructions": "Summarize the project's purpose, scope and key value proposition. Mention the highest-priority capabilities.",
+        "data": ["project", "requirement_index", "priorities"]
+    },
+    {
+        "title": "User Scenarios & Workflows",
+        "instructions": "Describe the main user roles and the end-to-end workflows they follow.",
+        "data": ["project", "story_scenarios"]
+    },
+    {
+        "title": "Requirements (Master List)",
+        "instructions": "Present every requirement as a Markdown table with ID, title, type, source, and the user stories and quality issues that trace to it.",
+        "data": ["requirement_index", "traceability"]
+    },
+    {
+        "title": "User Stories & Acceptance Criteria",
+        "instructions": "List every user story with its statement, acceptance criteria and effort estimate, grouped by requirement.",
+        "data": ["stories"]
+    },
+    {
+        "title": "Functional Requirements (Detailed)",
+        "instructions": "Detail each functional requirement: behavior, inputs, outputs and business rules.",
+        "data": ["functional_requirements"]
+    },
+    {
+        "title": "Non-Functional Requirements",
+        "instructions": "Detail performance, security, usability and other quality attributes, plus constraints and assumptions.",
+        "data": ["non_functional_requirements"]
+    },
+    {
+        "title": "Data Model & Entities",
+        "instructions": "Identify the key data entities, their attributes and relationships implied by the requirements.",
+        "data": ["requirements"]
+    },
+    {
+        "title": "Testing Strategy & Edge Cases",
+        "instructions": "Describe the testing approach and list the edge cases and error scenarios to cover.",
+        "data": ["acceptance_and_edge_cases"]
+    },
+    {
+        "title": "Success Criteria & Measurable Outcomes",
+        "instructions": "Define measurable success criteria and how each will be verified, ordered by priority.",
+        "data": ["project", "priorities"]
+    },
+    {
+        "title": "Appendices (Risks, Glossary)",
+        "instructions": "List acknowledged risks with their mitigations, followed by a glossary of domain terms.",
+        "data": ["risks", "requirement_index"]
+    },
+]
+
+SYNTHESIS_SECTION_PROMPT = """Write section {number} of the Requirements Specification Document for project "{project_name}".
+
+SECTION: {number}. {title}
+WHAT TO WRITE: {instructions}
+
+DATA FOR THIS SECTION:
+{data}
+
+Output only the body of this section in Markdown. Do not repeat the section heading
+and do not write any other section. Use "###" or deeper for sub-headings.
+"""
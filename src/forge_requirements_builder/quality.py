@@ -0,0 +1,216 @@
+"""Incremental Quality Validation for Forge Requirements Builder
+
+Re-runs the quality rules of validate_requirements_quality (see rules.py)
+after every edit while only re-evaluating what the edit touched:
+
+- Issues of requirement rules are cached per requirement, keyed by its
+  content fingerprint, so unchanged requirements are not re-checked;
+  rules that use stories are redone when the requirement gains or loses
+  a user story.
+- Pairs of incremental pair rules (conflicts) are cached by requirement
+  ID; only pairs involving a new or changed requirement are searched for
+  again. Other pair rules (duplicate titles) are recomputed each run.
+- Story rules are recomputed each run.
+
+An issue found again (same category, location and description) is returned
+as it was in the previous run, keeping its QA-NNN ID and status; new issues
+get fresh IDs that never reuse old ones. On an empty cache the result, IDs
+included, is exactly that of validate_requirements_quality.
+
+The cache is a plain JSON-compatible dict stored in the project state
+(quality_cache), so it is saved and restored with serialize_state.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .rules import QualityRuleRegistry, RuleContext
+from .state import QualityIssue, RequirementRaw, UserStory
+from .tools import QUALITY_RULES, QualityValidationResult, quality_result
+from .traceability import TraceabilityIndex
+
+# Bump when a check changes; caches of another version are discarded
+QUALITY_CACHE_VERSION = 2
+
+_ISSUE_NUMBER = re.compile(r"QA-(\d+)$")
+
+
+def _issue_key(issue: QualityIssue) -> Tuple[str, str, str]:
+    """What makes two runs' issues the same issue."""
+    return issue.category, issue.location, issue.description
+
+
+def _dump(issues: List[QualityIssue]) -> List[Dict[str, Any]]:
+    return [issue.model_dump(exclude={"id"}) for issue in issues]
+
+
+def _load(issues: List[Dict[str, Any]]) -> List[QualityIssue]:
+    return [QualityIssue(id="", **fields) for fields in issues]
+
+
+class QualityEngine:
+    """Incremental quality validation over a JSON-compatible cache dict.
+
+    Example:
+        engine = QualityEngine.for_state(state)
+        result = engine.validate(state["requirements_raw"], state["user_stories"], state["quality_issues"])
+        engine.evaluated  # requirements re-checked by this run
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, rules: Optional[QualityRuleRegistry] = None):
+        """Wrap a cache dict (a new one if data is None, from another version or other rules).
+
+        Args:
+            data: Cache dict to read and update in place
+            rules: Rules to run (defaults to tools.QUALITY_RULES)
+        """
+        self.rules = QUALITY_RULES if rules is None else rules
+        names = [rule.name for rule in self.rules]
+        self.data = {} if data is None else data
+        if self.data.get("version") != QUALITY_CACHE_VERSION or self.data.get("rules") != names:
+            self.data.clear()
+            self.data.update({
+                "version": QUALITY_CACHE_VERSION, "rules": names, "requirements": {}, "pairs": {}, "next_id": 1
+            })
+        self.evaluated = 0
+
+    @classmethod
+    def for_state(cls, state: Dict[str, Any]) -> "QualityEngine":
+        """Engine using the cache stored in state["quality_cache"]."""
+        return cls(state.setdefault("quality_cache", {}))
+
+    def validate(
+        self,
+        requirements: List[RequirementRaw],
+        user_stories: Optional[List[UserStory]] = None,
+        previous_issues: Iterable[QualityIssue] = (),
+        workers: Optional[int] = None,
+        story_requirement_ids: Optional[Iterable[str]] = None
+    ) -> QualityValidationResult:
+        """Validate requirements, re-checking only what changed since the last run.
+
+        Args:
+            requirements: Current requirements
+            user_stories: Current user stories
+            previous_issues: Issues from the last run, whose IDs and statuses
+                are kept for issues that are still found
+            workers: Worker processes for re-checking requirements (see
+                QualityRuleRegistry.check_requirements)
+            story_requirement_ids: IDs of the requirements with a story, if
+                known (see RuleContext.build)
+
+        Returns:
+            QualityValidationResult in validate_requirements_quality order
+        """
+        ids = [req.id for req in requirements]
+        # Caching is keyed by requirement ID, so it needs unique IDs
+        cacheable = len(set(ids)) == len(ids)
+        cached = self.data["requirements"] if cacheable else {}
+        context = RuleContext.build(requirements, user_stories, story_requirement_ids)
+        story_rules = [rule for rule in self.rules.of_scope("requirement") if rule.uses_stories]
+
+        entries = {}
+        changed: List[int] = []
+        story_changed: List[int] = []
+        for position, req in enumerate(requirements):
+            fingerprint = req.content_fingerprint()
+            entry = cached.get(req.id)
+            if entry is None or entry["fingerprint"] != fingerprint:
+                changed.append(position)
+                entry = {"fingerprint": fingerprint, "issues": {}}
+            elif entry["has_story"] != context.has_story(req.id):
+                story_changed.append(position)
+            entries[req.id] = entry
+        self.evaluated = len(changed)
+
+        for positions, rules in ((changed, None), (story_changed, story_rules)):
+            if not positions:
+                continue
+            results = self.rules.check_requirements([requirements[i] for i in positions], context, rules, workers)
+            for position, issues in zip(positions, results):
+                req = requirements[position]
+                by_rule = dict(entries[req.id]["issues"])
+                by_rule.update((name, _dump(found)) for name, found in issues.items())
+                entries[req.id] = dict(entries[req.id], has_story=context.has_story(req.id), issues=by_rule)
+
+        pairs = self._find_pairs(requirements, set(changed) if cacheable else None)
+        requirement_issues = [
+            {name: _load(found) for name, found in entries[req.id]["issues"].items()} for req in requirements
+        ]
+        issues = self.rules.collect(requirements, user_stories, context, requirement_issues, pairs)
+
+        if cacheable:
+            self.data["requirements"] = entries
+            self.data["pairs"] = {
+                rule.name: [[ids[i], ids[j]] for i, j in pairs[rule.name]]
+                for rule in self.rules.of_scope("pair") if rule.incremental
+            }
+        return self._number(issues, list(previous_issues))
+
+    def _find_pairs(self, requirements: List[RequirementRaw], changed: Optional[Set[int]]) -> Dict[str, List[Tuple[int, int]]]:
+        """Pairs of each pair rule; for incremental rules, cached pairs between
+        unchanged requirements plus a search around the changed ones."""
+        if changed is None:
+            return self.rules.find_pairs(requirements)
+        pairs = {}
+        positions = {req.id: position for position, req in enumerate(requirements)}
+        for rule in self.rules.of_scope("pair"):
+            if not rule.incremental:
+                pairs[rule.name] = rule.candidates(requirements)
+                continue
+            found = set()
+            for first, second in self.data["pairs"].get(rule.name, ()):
+                i, j = positions.get(first), positions.get(second)
+                if i is not None and j is not None and i not in changed and j not in changed:
+                    found.add((min(i, j), max(i, j)))
+            if changed:
+                found.update(rule.candidates(requirements, only=changed))
+            pairs[rule.name] = sorted(found)
+        return pairs
+
+    def _number(self, issues: List[QualityIssue], previous_issues: List[QualityIssue]) -> QualityValidationResult:
+        """Return issues found before as they were (ID and status kept) and number new ones."""
+        previous = {}
+        next_id = self.data["next_id"]
+        for issue in previous_issues:
+            previous.setdefault(_issue_key(issue), issue)
+            match = _ISSUE_NUMBER.match(issue.id)
+            if match:
+                next_id = max(next_id, int(match.group(1)) + 1)
+
+        numbered = []
+        used = set()
+        for issue in issues:
+            old = previous.get(_issue_key(issue))
+            if old is not None and old.id not in used:
+                issue = old
+            else:
+                issue.id = f"QA-{next_id:03d}"
+                next_id += 1
+            used.add(issue.id)
+            numbered.append(issue)
+        self.data["next_id"] = next_id
+
+        return quality_result(numbered)
+
+
+def refresh_quality_issues(state: Dict[str, Any]) -> Tuple[QualityValidationResult, bool]:
+    """Re-validate the project incrementally and store the issues in state.
+
+    Which requirements have a story comes from the traceability index, which
+    is then updated with the new issues.
+
+    Returns:
+        (result, changed) where changed tells whether the set of issues
+        differs from the one stored before
+    """
+    previous = state.get("quality_issues") or []
+    trace = TraceabilityIndex.for_state(state)
+    result = QualityEngine.for_state(state).validate(
+        state["requirements_raw"], state["user_stories"], previous,
+        story_requirement_ids=trace.story_requirement_ids()
+    )
+    changed = [issue.id for issue in result.issues_found] != [issue.id for issue in previous]
+    state["quality_issues"] = result.issues_found
+    trace.sync(state["user_stories"], result.issues_found)
+    return result, changed
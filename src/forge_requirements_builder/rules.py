@@ -0,0 +1,324 @@
+"""Quality Rule Engine for Forge Requirements Builder
+
+Each quality check is a QualityRule registered in a QualityRuleRegistry,
+declaring the scope it works at:
+
+- "requirement": check(req, context) returns the issues of one
+  requirement. These rules see nothing but that requirement and the
+  context, so large sets are sharded across a process pool.
+- "pair": candidates(requirements, only) returns the (i, j) positions of
+  related requirements, and check(req1, req2, context) the issues of one
+  such pair. Finding the pairs is left to the rule (e.g. an inverted index)
+  rather than testing every pair.
+- "story": check(story, context) returns the issues of one user story.
+
+Rules run in registration order, each over its inputs in order, and the
+issues are numbered QA-001, QA-002... only at the end, so the result is
+the same however the work was sharded. Rules are sent to worker processes
+by reference, so their functions must be defined at module level.
+
+Worker processes are started with forkserver (spawn where that is not
+available), never fork: the Streamlit and MCP servers are multi-threaded,
+and forking a threaded process can deadlock the child.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .state import QualityIssue, RequirementRaw, UserStory
+
+# Worker processes for per-requirement rules (0 = one per CPU, or in-process
+# on machines with 2 CPUs or fewer; 1 = in-process)
+QUALITY_WORKERS = int(os.getenv("FORGE_QUALITY_WORKERS", "0"))
+
+# Smaller sets are checked in-process; pool start-up would cost more than it saves
+QUALITY_PARALLEL_MIN_REQUIREMENTS = int(os.getenv("FORGE_QUALITY_PARALLEL_MIN_REQUIREMENTS", "5000"))
+
+# Requirements handed to a worker per task
+QUALITY_REQUIREMENTS_PER_TASK = int(os.getenv("FORGE_QUALITY_REQUIREMENTS_PER_TASK", "2000"))
+
+SCOPES = ("requirement", "pair", "story")
+
+
+@dataclass(frozen=True)
+class RuleContext:
+    """Project facts rules may use besides their own inputs."""
+
+    # IDs of requirements that have a user story (None when there are no stories)
+    story_requirement_ids: Optional[FrozenSet[str]] = None
+    requirement_ids: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def build(
+        cls,
+        requirements: Sequence[RequirementRaw],
+        user_stories: Optional[Sequence[UserStory]] = None,
+        story_requirement_ids: Optional[Iterable[str]] = None
+    ) -> "RuleContext":
+        """Context of a set of requirements and their user stories.
+
+        Args:
+            requirements: Requirements to check
+            user_stories: Their user stories
+            story_requirement_ids: IDs of the requirements with a story, when
+                already known (e.g. from a TraceabilityIndex), so the stories
+                need not be scanned
+        """
+        if not user_stories:
+            story_requirement_ids = None
+        elif story_requirement_ids is None:
+            story_requirement_ids = frozenset(story.requirement_id for story in user_stories)
+        else:
+            story_requirement_ids = frozenset(story_requirement_ids)
+        return cls(story_requirement_ids=story_requirement_ids, requirement_ids=frozenset(req.id for req in requirements))
+
+    def has_story(self, requirement_id: str) -> Optional[bool]:
+        """Whether a requirement has a user story (None when there are no stories)."""
+        if self.story_requirement_ids is None:
+            return None
+        return requirement_id in self.story_requirement_ids
+
+
+@dataclass(frozen=True)
+class QualityRule:
+    """A quality check and the scope it runs at.
+
+    Attributes:
+        name: Unique name, also the key of the rule's cached results
+        scope: "requirement", "pair" or "story"
+        check: Returns the rule's issues for one input (see module docstring)
+        candidates: For pair rules, (requirements, only) -> (i, j) pairs in
+            report order; when only is a set of positions, just the pairs
+            involving one of them
+        uses_stories: For requirement rules, whether the result depends on
+            context.has_story (so it is redone when stories change)
+        incremental: For pair rules, whether the pairs of unchanged
+            requirements stay valid when others change, so they can be
+            cached and only searched again around changes (candidates must
+            then return pairs sorted)
+    """
+
+    name: str
+    scope: str
+    check: Callable[..., List[QualityIssue]]
+    candidates: Optional[Callable[..., List[Tuple[int, int]]]] = None
+    uses_stories: bool = False
+    incremental: bool = False
+
+    def __post_init__(self):
+        if self.scope not in SCOPES:
+            raise ValueError(f"Unknown rule scope '{self.scope}'. Use one of: {', '.join(SCOPES)}")
+        if (self.scope == "pair") != (self.candidates is not None):
+            raise ValueError("Pair rules, and only pair rules, need a candidates function")
+
+
+def number_issues(issues: Iterable[QualityIssue], start: int = 1) -> List[QualityIssue]:
+    """Give issues consecutive QA-NNN IDs, in order."""
+    numbered = []
+    for number, issue in enumerate(issues, start):
+        issue.id = f"QA-{number:03d}"
+        numbered.append(issue)
+    return numbered
+
+
+def _check_requirement_chunk(
+    rules: Tuple[QualityRule, ...],
+    requirements: Sequence[RequirementRaw],
+    context: RuleContext
+) -> List[Dict[str, List[QualityIssue]]]:
+    """Run requirement rules over some requirements: one {rule name: issues} per requirement."""
+    return [{rule.name: rule.check(req, context) for rule in rules} for req in requirements]
+
+
+def _worker_context(rules: Sequence[QualityRule] = ()) -> multiprocessing.context.BaseContext:
+    """Start method for rule workers: forkserver, or spawn where it is unavailable.
+
+    The fork server imports the modules defining the rules when it starts,
+    so each worker forked from it does not import them again.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload(sorted({rule.check.__module__ for rule in rules}))
+    return context
+
+
+def _default_workers() -> int:
+    """Workers for QUALITY_WORKERS=0: one per CPU, or 1 (in-process) with 2 CPUs or fewer."""
+    cpus = os.cpu_count() or 1
+    return cpus if cpus > 2 else 1
+
+
+# What a worker process checks, set once by _init_rule_worker so that tasks
+# only carry a range of positions
+_worker_job: Optional[Tuple[Tuple[QualityRule, ...], Sequence[RequirementRaw], RuleContext]] = None
+
+
+def _init_rule_worker(rules: Tuple[QualityRule, ...], requirements: Sequence[RequirementRaw], context: RuleContext) -> None:
+    """Set up a rule worker process."""
+    global _worker_job
+    _worker_job = (rules, requirements, context)
+
+
+def _check_requirement_range(start: int, stop: int) -> List[Tuple[int, str, List[dict]]]:
+    """Run the worker's rules over requirements[start:stop].
+
+    Returns:
+        (position, rule name, issues as plain dicts) for each rule that
+        found issues, which keeps the result small to send back
+    """
+    rules, requirements, context = _worker_job
+    found = []
+    for position in range(start, stop):
+        for rule in rules:
+            issues = rule.check(requirements[position], context)
+            if issues:
+                found.append((position, rule.name, [issue.model_dump() for issue in issues]))
+    return found
+
+
+class QualityRuleRegistry:
+    """Ordered set of quality rules, and how to run them.
+
+    Example:
+        registry = QualityRuleRegistry()
+
+        @registry.rule("no-tbd", scope="requirement")
+        def check_tbd(req, context):
+            return [QualityIssue(...)] if "TBD" in req.description else []
+
+        issues = registry.run(requirements, user_stories)
+    """
+
+    def __init__(self, rules: Iterable[QualityRule] = ()):
+        self._rules: List[QualityRule] = []
+        for rule in rules:
+            self.register(rule)
+
+    def __iter__(self) -> Iterator[QualityRule]:
+        return iter(self._rules)
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def register(self, rule: QualityRule) -> QualityRule:
+        """Add a rule after the existing ones.
+
+        Raises:
+            ValueError: If a rule with the same name is already registered
+        """
+        if any(existing.name == rule.name for existing in self._rules):
+            raise ValueError(f"A quality rule named '{rule.name}' is already registered")
+        self._rules.append(rule)
+        return rule
+
+    def rule(self, name: str, scope: str, **options) -> Callable:
+        """Decorator registering a check function as a rule (options as in QualityRule)."""
+        def decorator(check: Callable) -> Callable:
+            self.register(QualityRule(name=name, scope=scope, check=check, **options))
+            return check
+        return decorator
+
+    def of_scope(self, scope: str) -> List[QualityRule]:
+        """Rules of one scope, in registration order."""
+        return [rule for rule in self._rules if rule.scope == scope]
+
+    def check_requirements(
+        self,
+        requirements: Sequence[RequirementRaw],
+        context: RuleContext,
+        rules: Optional[Sequence[QualityRule]] = None,
+        workers: Optional[int] = None
+    ) -> List[Dict[str, List[QualityIssue]]]:
+        """Run requirement rules, in a process pool for large sets.
+
+        Args:
+            requirements: Requirements to check
+            context: Context the rules see
+            rules: Requirement rules to run (defaults to all of them)
+            workers: Worker processes (defaults to FORGE_QUALITY_WORKERS;
+                0 = one per CPU, in-process with 2 CPUs or fewer; 1 = check
+                in-process)
+
+        Returns:
+            {rule name: issues} for each requirement, in input order
+        """
+        rules = tuple(self.of_scope("requirement") if rules is None else rules)
+        per_task = max(1, QUALITY_REQUIREMENTS_PER_TASK)
+        workers = QUALITY_WORKERS if workers is None else workers
+        workers = min(workers or _default_workers(), -(-len(requirements) // per_task))
+        if workers <= 1 or len(requirements) < QUALITY_PARALLEL_MIN_REQUIREMENTS:
+            return _check_requirement_chunk(rules, requirements, context)
+
+        results: List[Dict[str, List[QualityIssue]]] = [{rule.name: [] for rule in rules} for _ in requirements]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=_worker_context(rules),
+            initializer=_init_rule_worker,
+            initargs=(rules, list(requirements), context)
+        ) as executor:
+            futures = [
+                executor.submit(_check_requirement_range, start, min(start + per_task, len(requirements)))
+                for start in range(0, len(requirements), per_task)
+            ]
+            # Merged in submission order, so results never depend on timing
+            for future in futures:
+                for position, name, issues in future.result():
+                    results[position][name] = [QualityIssue(**fields) for fields in issues]
+        return results
+
+    def find_pairs(self, requirements: Sequence[RequirementRaw]) -> Dict[str, List[Tuple[int, int]]]:
+        """Candidate pairs of every pair rule, by rule name."""
+        return {rule.name: rule.candidates(requirements) for rule in self.of_scope("pair")}
+
+    def collect(
+        self,
+        requirements: Sequence[RequirementRaw],
+        user_stories: Optional[Sequence[UserStory]],
+        context: RuleContext,
+        requirement_issues: Sequence[Dict[str, List[QualityIssue]]],
+        pairs: Dict[str, List[Tuple[int, int]]]
+    ) -> List[QualityIssue]:
+        """Put every rule's issues in report order (unnumbered).
+
+        Args:
+            requirements: Requirements checked
+            user_stories: User stories, for story rules
+            context: Context the rules see
+            requirement_issues: check_requirements() result for requirements
+            pairs: Candidate pairs of each pair rule, by rule name
+        """
+        issues: List[QualityIssue] = []
+        for rule in self._rules:
+            if rule.scope == "requirement":
+                for found in requirement_issues:
+                    issues.extend(found[rule.name])
+            elif rule.scope == "pair":
+                for i, j in pairs[rule.name]:
+                    issues.extend(rule.check(requirements[i], requirements[j], context))
+            else:
+                for story in user_stories or ():
+                    issues.extend(rule.check(story, context))
+        return issues
+
+    def run(
+        self,
+        requirements: Sequence[RequirementRaw],
+        user_stories: Optional[Sequence[UserStory]] = None,
+        workers: Optional[int] = None
+    ) -> List[QualityIssue]:
+        """Run every rule and return the issues numbered from QA-001.
+
+        Args:
+            requirements: Requirements to check
+            user_stories: User stories (for story rules and rules that use
+                context.has_story)
+            workers: Worker processes for requirement rules (see check_requirements)
+        """
+        context = RuleContext.build(requirements, user_stories)
+        requirement_issues = self.check_requirements(requirements, context, workers=workers)
+        pairs = self.find_pairs(requirements)
+        return number_issues(self.collect(requirements, user_stories, context, requirement_issues, pairs))
@@ -3,8 +3,9 @@
 Defines all Pydantic models and TypedDict for shared state management across agents.
 """
 
+import hashlib
 from datetime import datetime
-from typing import TypedDict, Optional, List
+from typing import TypedDict, Optional, List, Dict
 from pydantic import BaseModel, Field
 
 
@@ -22,6 +23,12 @@ class RequirementRaw(BaseModel):
     source: str = Field(..., description="Where this came from (discovery session, document, etc.)")
     tagged: Optional[List[str]] = Field(default=None, description="User-applied tags")
     needs_refinement: bool = Field(default=False, description="Marked [NEEDS_REFINEMENT] during clarification")
+    duplicate_of: Optional[str] = Field(default=None, description="ID of an existing requirement this one closely resembled when it was added")
+
+    def content_fingerprint(self) -> str:
+        """Return a stable hash of the fields that define the requirement's content."""
+        content = "\x1f".join([self.title.strip(), self.description.strip(), self.type.strip()])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
 
     class Config:
         json_schema_extra = {
@@ -48,6 +55,7 @@ class UserStory(BaseModel):
     edge_cases: List[str] = Field(default_factory=list, description="Edge cases and error scenarios")
     definition_of_done: List[str] = Field(default_factory=list, description="DoD checklist items")
     effort_estimate: str = Field(..., description="XS | S | M | L | XL")
+    source_fingerprint: Optional[str] = Field(default=None, description="Content fingerprint of the requirement this story was authored from")
 
     class Config:
         json_schema_extra = {
@@ -168,14 +176,18 @@ class ForgeRequirementsState(TypedDict):
     discovery_complete: bool
     discovery_gap_topics: List[str]  # Topics explored during discovery
     requirements_raw: List[RequirementRaw]
+    requirements_index: dict  # Near-duplicate (MinHash/LSH) index of requirements_raw, see dedup.py
     
     # Authoring phase state
     authoring_complete: bool
     user_stories: List[UserStory]
+    authoring_failures: Dict[str, str]  # requirement_id -> error from the last authoring run
     
     # Quality phase state
     quality_complete: bool
     quality_issues: List[QualityIssue]
+    quality_cache: dict  # Per-requirement check results for incremental re-validation, see quality.py
+    traceability: dict  # Requirement/story/issue links, see traceability.py
     quality_issues_resolved: bool
     acknowledged_risks: List[AcknowledgedRisk]
     requirements_formal: str  # Markdown formatted after quality validation
@@ -189,6 +201,8 @@ class ForgeRequirementsState(TypedDict):
     workflow_phase: str  # discovery | authoring | quality | prioritization | synthesis | complete
     current_agent: Optional[str]  # Which agent is currently executing
     conversation_history: List[dict]  # All messages for context
+    conversation_summary: str  # Rolling summary of turns folded out of the verbatim window
+    summarized_message_count: int  # Leading conversation_history messages covered by the summary
     user_preferences: dict  # Prioritization framework choice, output format, etc.
     
     # Final deliverable
@@ -232,14 +246,18 @@ def create_project_state(
         discovery_complete=False,
         discovery_gap_topics=[],
         requirements_raw=[],
+        requirements_index={},
         
         # Authoring phase
         authoring_complete=False,
         user_stories=[],
+        authoring_failures={},
         
         # Quality phase
         quality_complete=False,
         quality_issues=[],
+        quality_cache={},
+        traceability={},
         quality_issues_resolved=False,
         acknowledged_risks=[],
         requirements_formal="",
@@ -253,6 +271,8 @@ def create_project_state(
         workflow_phase="discovery",
         current_agent="orchestrator",
         conversation_history=[],
+        conversation_summary="",
+        summarized_message_count=0,
         user_preferences={},
         
         # Final deliverable
@@ -308,6 +328,16 @@ def deserialize_state(data: dict) -> ForgeRequirementsState:
         # Backwards compatibility: use created_at if last_updated doesn't exist
         data["last_updated"] = data.get("created_at", datetime.now())
     
+    # Backwards compatibility: projects saved before discovery memory existed
+    data.setdefault("conversation_summary", "")
+    data.setdefault("summarized_message_count", 0)
+    
+    # Projects saved before the near-duplicate index, quality cache and
+    # traceability index get them built on first use
+    data.setdefault("requirements_index", {})
+    data.setdefault("quality_cache", {})
+    data.setdefault("traceability", {})
+    
     # Convert lists of dicts back to Pydantic models
     if "requirements_raw" in data:
         data["requirements_raw"] = [
@@ -10,8 +10,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from forge_requirements_builder.state import create_project_state, ForgeRequirementsState, serialize_state, deserialize_state
-from forge_requirements_builder.graph import create_graph
+from forge_requirements_builder.graph import create_graph, stream_graph
 from forge_requirements_builder.utils import ProjectLogger
+from forge_requirements_builder.traceability import TraceabilityIndex
 
 # Page Configuration
 st.set_page_config(
@@ -145,6 +146,22 @@ with st.sidebar:
             if state.get("prioritization_complete"):
                 st.caption("✅ Prioritization Complete")
             
+            # Traceability: each requirement's stories and quality issues
+            if state.get("requirements_raw"):
+                with st.expander("Traceability"):
+                    trace = TraceabilityIndex.for_state(state)
+                    st.dataframe(
+                        [
+                            {
+                                "Requirement": req.id,
+                                "Stories": ", ".join(trace.stories_for(req.id)),
+                                "Issues": ", ".join(trace.issues_for(req.id))
+                            }
+                            for req in state["requirements_raw"]
+                        ],
+                        hide_index=True
+                    )
+            
             # Debug info
             with st.expander("Debug Info"):
                 last_update = state.get('last_updated')
@@ -261,6 +278,11 @@ if "current_project_id" in st.session_state:
                 mime="text/markdown"
             )
         
+        # Older turns are folded into a summary and may no longer be stored verbatim
+        if project_state.get("conversation_summary"):
+            with st.expander("Earlier conversation (summarized)"):
+                st.markdown(project_state["conversation_summary"])
+        
         # Display Chat History
         for msg in project_state.get("conversation_history", []):
             with st.chat_message(msg["role"]):
@@ -278,10 +300,30 @@ if "current_project_id" in st.session_state:
             
             # Run Graph
             with st.chat_message("assistant"):
+                # Synthesis output is rendered here token by token as it streams in
+                stream_placeholder = st.empty()
+                streamed_tokens = []
+                
+                def render_token(token: str):
+                    streamed_tokens.append(token)
+                    stream_placeholder.markdown("".join(streamed_tokens) + "▌")
+                
+                def discard_tokens(chars: int):
+                    # A section failed part-way and is being retried: drop its partial text
+                    text = "".join(streamed_tokens)
+                    streamed_tokens[:] = [text[:len(text) - chars]]
+                    stream_placeholder.markdown(streamed_tokens[0] + "▌")
+                
                 with st.spinner("Thinking..."):
                     try:
                         graph = create_graph()
-                        final_state = graph.invoke(current_state, config={"configurable": {"thread_id": project_id}})
+                        final_state = stream_graph(
+                            graph,
+                            current_state,
+                            {"configurable": {"thread_id": project_id}},
+                            render_token,
+                            discard_tokens
+                        )
                         
                         # Debug: Check if state was updated
                         req_count_before = len(project_state.get("requirements_raw", []))
@@ -0,0 +1,254 @@
+"""Size-Guarded Text File Reading for Forge Requirements Builder
+
+Reads plain-text documents without ever loading more than a byte budget
+(FORGE_MAX_TEXT_MB) into memory. Large files are memory-mapped so that
+only the part inside the budget is touched, the encoding is detected from
+the first few kilobytes, and lines can be streamed to parsers one at a
+time. Files over the budget come back truncated, with the truncation
+reported, instead of exhausting memory.
+"""
+
+import codecs
+import io
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+# Most bytes of a text file that are ever read
+MAX_TEXT_BYTES = int(float(os.getenv("FORGE_MAX_TEXT_MB", "50")) * 1024 * 1024)
+
+# Files at least this large are memory-mapped instead of read
+MMAP_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+# Bytes inspected to detect the encoding
+ENCODING_SAMPLE_BYTES = 64 * 1024
+
+# Fallback for text that is not valid UTF-8 (typical of Windows-authored files)
+FALLBACK_ENCODING = "cp1252"
+
+_BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+PathLike = Union[str, Path]
+
+
+class BinaryFileError(ValueError):
+    """Raised when a file meant to be read as text looks binary."""
+
+
+@dataclass(frozen=True)
+class TextReadResult:
+    """Text read from a file, and whether the byte budget cut it short."""
+
+    text: str
+    encoding: str
+    truncated: bool
+    bytes_read: int
+    file_size: int
+
+    def truncation_notice(self) -> str:
+        """Human-readable note on what was left out ("" if nothing was)."""
+        if not self.truncated:
+            return ""
+        return (
+            f"[... file truncated: read the first {_format_size(self.bytes_read)} "
+            f"of {_format_size(self.file_size)} ...]"
+        )
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} bytes"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.1f} {unit}"
+
+
+def detect_encoding(sample: bytes) -> str:
+    """Guess the encoding of text from its first bytes.
+
+    Checks for a byte-order mark, then whether the sample is valid UTF-8
+    (ignoring a character cut off at the end), and otherwise assumes cp1252.
+
+    Raises:
+        BinaryFileError: If the sample contains NUL bytes and no UTF-16/32 BOM
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+    if b"\x00" in sample:
+        raise BinaryFileError("File appears to be binary, not text")
+    try:
+        sample.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # A multi-byte character split by the sample boundary is still UTF-8
+        if e.start >= len(sample) - 3 and e.reason == "unexpected end of data":
+            return "utf-8"
+        return FALLBACK_ENCODING
+
+
+def _is_ascii_compatible(encoding: str) -> bool:
+    return codecs.lookup(encoding).name not in ("utf-16", "utf-32")
+
+
+def _budget_cut(data: bytes, encoding: str) -> bytes:
+    """Trim bytes cut at the budget back to a whole line (or whole code unit)."""
+    if not _is_ascii_compatible(encoding):
+        unit = 2 if codecs.lookup(encoding).name == "utf-16" else 4
+        return data[:len(data) - len(data) % unit]
+    newline = data.rfind(b"\n")
+    return data[:newline + 1] if newline > 0 else data
+
+
+def _open_buffer(f, size: int):
+    """Memory-map large files; small ones are cheaper to read outright."""
+    if size >= MMAP_THRESHOLD_BYTES:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return None
+
+
+def read_text(path: PathLike, max_bytes: Optional[int] = None) -> TextReadResult:
+    """Read a text file, never loading more than max_bytes of it.
+
+    Args:
+        path: File to read
+        max_bytes: Byte budget (defaults to FORGE_MAX_TEXT_MB)
+
+    Returns:
+        TextReadResult; when the file is over budget, text ends at the last
+        complete line inside the budget and truncated is True
+
+    Raises:
+        FileNotFoundError: If the file does not exist
+        BinaryFileError: If the file looks binary
+    """
+    budget = MAX_TEXT_BYTES if max_bytes is None else max_bytes
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        mapped = _open_buffer(f, size)
+        try:
+            if mapped is not None:
+                encoding = detect_encoding(mapped[:ENCODING_SAMPLE_BYTES])
+                data = mapped[:budget]
+            else:
+                data = f.read(budget + 1)[:budget] if size > budget else f.read()
+                encoding = detect_encoding(data[:ENCODING_SAMPLE_BYTES])
+        finally:
+            if mapped is not None:
+                mapped.close()
+
+    return _decode(data, encoding, size, budget)
+
+
+def decode_text(data: bytes, max_bytes: Optional[int] = None) -> TextReadResult:
+    """Decode text that is already in memory (e.g. an upload) like read_text.
+
+    Args:
+        data: Raw file content
+        max_bytes: Byte budget (defaults to FORGE_MAX_TEXT_MB)
+
+    Raises:
+        BinaryFileError: If the content looks binary
+    """
+    budget = MAX_TEXT_BYTES if max_bytes is None else max_bytes
+    encoding = detect_encoding(data[:ENCODING_SAMPLE_BYTES])
+    return _decode(data[:budget], encoding, len(data), budget)
+
+
+def _decode(data: bytes, encoding: str, size: int, budget: int) -> TextReadResult:
+    """Decode the bytes read within the budget, trimming a cut-off last line."""
+    truncated = size > budget
+    if truncated:
+        data = _budget_cut(data, encoding)
+    text = data.decode(encoding, errors="replace")
+    return TextReadResult(
+        text=text,
+        encoding=encoding,
+        truncated=truncated,
+        bytes_read=len(data),
+        file_size=size
+    )
+
+
+class LineStream:
+    """Iterates the lines of a text file (newlines kept) up to a byte budget.
+
+    ASCII-compatible encodings are scanned through a memory map, so lines
+    are decoded one at a time. After iteration, truncated tells whether the
+    budget stopped it before the end of the file.
+
+    Example:
+        lines = LineStream("meeting.log")
+        for line in lines:
+            ...
+        if lines.truncated:
+            ...
+    """
+
+    def __init__(self, path: PathLike, max_bytes: Optional[int] = None):
+        """Open the stream.
+
+        Raises:
+            FileNotFoundError: If the file does not exist
+            BinaryFileError: If the file looks binary
+        """
+        self.path = path
+        self.max_bytes = MAX_TEXT_BYTES if max_bytes is None else max_bytes
+        self.file_size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            self.encoding = detect_encoding(f.read(ENCODING_SAMPLE_BYTES))
+        self.truncated = False
+
+    def __iter__(self) -> Iterator[str]:
+        if self.file_size == 0:
+            return
+        limit = min(self.file_size, self.max_bytes)
+        with open(self.path, "rb") as f:
+            if _is_ascii_compatible(self.encoding):
+                yield from self._mapped_lines(f, limit)
+            else:
+                yield from self._decoded_lines(f, limit)
+
+    def _mapped_lines(self, f, limit: int) -> Iterator[str]:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            position = len(codecs.BOM_UTF8) if self.encoding == "utf-8-sig" else 0
+            while position < limit:
+                newline = mapped.find(b"\n", position, limit)
+                if newline >= 0:
+                    end = newline + 1
+                elif limit < self.file_size:
+                    # The last line would cross the budget
+                    self.truncated = True
+                    return
+                else:
+                    end = limit
+                yield mapped[position:end].decode(self.encoding, errors="replace")
+                position = end
+            self.truncated = limit < self.file_size
+        finally:
+            mapped.close()
+
+    def _decoded_lines(self, f, limit: int) -> Iterator[str]:
+        # Newlines are multi-byte in UTF-16/32; let the codec find them
+        unit = 2 if codecs.lookup(self.encoding).name == "utf-16" else 4
+        reader = io.TextIOWrapper(f, encoding=self.encoding, errors="replace", newline="")
+        consumed = 0
+        try:
+            for line in reader:
+                consumed += len(line) * unit
+                if consumed > limit:
+                    self.truncated = True
+                    return
+                yield line
+        finally:
+            reader.detach()
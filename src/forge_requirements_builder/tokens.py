@@ -0,0 +1,294 @@
+"""Token Counting and Prompt Budgeting for Forge Requirements Builder
+
+Counts tokens with tiktoken when it is installed and its encoding files are
+available locally, and falls back to a characters-per-token estimate when
+they are not; encodings are never downloaded unless FORGE_TOKENIZER is
+"tiktoken". TokenBudget fits the parts of a prompt (system prompt,
+history, requirements summary, document, ...) into a model's context
+window by trimming the lowest-priority parts first.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - optional dependency
+    tiktoken = None
+
+logger = logging.getLogger("forge_requirements_builder")
+
+# Tokenizer selection: "auto" uses tiktoken when its encoding is cached locally,
+# "tiktoken" also lets it download the encoding, "estimate" never uses it
+TOKENIZER_MODE = os.getenv("FORGE_TOKENIZER", "auto").lower()
+
+# Fallback estimate when no tokenizer is available
+DEFAULT_CHARS_PER_TOKEN = 4.0
+
+DEFAULT_MODEL = "gpt-4o"
+
+# Context windows (input + output tokens) for models this project uses
+MODEL_CONTEXT_WINDOWS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4": 8192,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_WINDOW = 128000
+
+TRUNCATION_MARKER = "[... content truncated for length ...]"
+
+# How far back from a hard cut we look for a paragraph/sentence boundary
+BOUNDARY_SEARCH_FRACTION = 0.2
+
+
+# Where tiktoken downloads its encoding files from
+TIKTOKEN_ENCODING_URL = "https://openaipublic.blob.core.windows.net/encodings/{name}.tiktoken"
+
+
+def _encoding_is_local(name: str) -> bool:
+    """Whether tiktoken can load an encoding without a network call.
+
+    Mirrors tiktoken's own file cache lookup (TIKTOKEN_CACHE_DIR,
+    DATA_GYM_CACHE_DIR, else data-gym-cache in the temp directory).
+    """
+    if name in getattr(getattr(tiktoken, "registry", None), "ENCODINGS", {}):
+        return True
+    cache_dir = os.environ.get(
+        "TIKTOKEN_CACHE_DIR",
+        os.environ.get("DATA_GYM_CACHE_DIR", os.path.join(tempfile.gettempdir(), "data-gym-cache"))
+    )
+    if not cache_dir:
+        return False
+    cache_key = hashlib.sha1(TIKTOKEN_ENCODING_URL.format(name=name).encode()).hexdigest()
+    return os.path.exists(os.path.join(cache_dir, cache_key))
+
+
+@lru_cache(maxsize=16)
+def _get_encoding(model: str):
+    """Return the tiktoken encoding for a model, or None to use the estimator.
+
+    In "auto" mode an encoding is only loaded when its file is already
+    cached locally, so counting never blocks on a download; any failure
+    is remembered so it is only attempted once per model.
+    """
+    if tiktoken is None or TOKENIZER_MODE == "estimate":
+        return None
+    try:
+        try:
+            name = tiktoken.encoding_name_for_model(model)
+        except KeyError:
+            name = "o200k_base"
+        if TOKENIZER_MODE != "tiktoken" and not _encoding_is_local(name):
+            logger.info(f"tiktoken encoding {name} is not cached locally, estimating tokens for {model} instead")
+            return None
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.info(f"tiktoken encoding for {model} unavailable, estimating tokens instead: {e}")
+        return None
+
+
+def has_tokenizer(model: Optional[str] = None) -> bool:
+    """Whether token counts for model come from a real tokenizer."""
+    return _get_encoding(model or DEFAULT_MODEL) is not None
+
+
+def context_window(model: Optional[str] = None) -> int:
+    """Return the context window size of a model in tokens."""
+    return MODEL_CONTEXT_WINDOWS.get(model or DEFAULT_MODEL, DEFAULT_CONTEXT_WINDOW)
+
+
+def count_tokens(
+    text: str,
+    model: Optional[str] = None,
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN
+) -> int:
+    """Count the tokens text uses in a prompt for model.
+
+    Args:
+        text: Text to measure
+        model: Model name (defaults to gpt-4o)
+        chars_per_token: Estimate used when no tokenizer is available
+
+    Returns:
+        Token count (exact with tiktoken, estimated otherwise)
+    """
+    if not text:
+        return 0
+    encoding = _get_encoding(model or DEFAULT_MODEL)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return max(1, int(len(text) / chars_per_token))
+
+
+def _snap_to_boundary(piece: str, keep: str) -> str:
+    """Move a hard cut back to the nearest paragraph, line or sentence break."""
+    window = int(len(piece) * BOUNDARY_SEARCH_FRACTION)
+    for boundary in ("\n\n", "\n", ". "):
+        if keep == "start":
+            position = piece.rfind(boundary, len(piece) - window)
+            if position > 0:
+                return piece[:position + (1 if boundary == ". " else 0)]
+        else:
+            position = piece.find(boundary, 0, window)
+            if position >= 0:
+                return piece[position + len(boundary):]
+    return piece
+
+
+def truncate_to_tokens(
+    text: str,
+    max_tokens: int,
+    model: Optional[str] = None,
+    keep: str = "start",
+    marker: str = TRUNCATION_MARKER,
+    chars_per_token: float = DEFAULT_CHARS_PER_TOKEN,
+    snap: bool = True
+) -> str:
+    """Truncate text to at most max_tokens, cutting at a natural boundary.
+
+    Args:
+        text: Text to truncate
+        max_tokens: Token limit, including the truncation marker
+        model: Model name (defaults to gpt-4o)
+        keep: "start" keeps the beginning of the text, "end" keeps the end
+        marker: Indicator added where content was removed ("" for none)
+        chars_per_token: Estimate used when no tokenizer is available
+        snap: Move the cut back to a paragraph/sentence break (may keep up
+            to 20% less text)
+
+    Returns:
+        The text unchanged if it fits, otherwise the kept portion plus marker
+    """
+    if count_tokens(text, model, chars_per_token) <= max_tokens:
+        return text
+
+    marker_text = f"\n\n{marker}" if marker else ""
+    room = max_tokens - count_tokens(marker_text, model, chars_per_token)
+    if room <= 0:
+        return ""
+
+    encoding = _get_encoding(model or DEFAULT_MODEL)
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        kept = tokens[:room] if keep == "start" else tokens[-room:]
+        piece = encoding.decode(kept)
+    else:
+        chars = int(room * chars_per_token)
+        piece = text[:chars] if keep == "start" else text[-chars:]
+
+    if snap:
+        piece = _snap_to_boundary(piece, keep)
+    piece = piece.strip()
+    if not marker_text:
+        return piece
+    return piece + marker_text if keep == "start" else marker_text.strip() + "\n\n" + piece
+
+
+class TokenBudget:
+    """Fits named prompt parts into a token budget by priority.
+
+    Each part is first cut to its own max_tokens cap, if it has one. Parts
+    are then trimmed lowest priority first (ties: the part added last is
+    trimmed first), each down to its min_tokens, until the total fits.
+
+    Example:
+        budget = TokenBudget(context_window(), reserve_output=2000)
+        budget.add("system", system_prompt, priority=100)
+        budget.add("history", history, priority=10, keep="end")
+        budget.add("document", document, priority=50)
+        parts = budget.fit()
+    """
+
+    def __init__(self, max_tokens: int, model: Optional[str] = None, reserve_output: int = 0):
+        """Initialize the budget.
+
+        Args:
+            max_tokens: Total tokens available (usually the context window)
+            model: Model used for counting
+            reserve_output: Tokens held back for the model's response
+        """
+        self.max_tokens = max_tokens
+        self.model = model
+        self.reserve_output = reserve_output
+        self._parts: List[Dict[str, Any]] = []
+        self.overflow = 0
+
+    @property
+    def available(self) -> int:
+        """Tokens available for prompt parts."""
+        return max(0, self.max_tokens - self.reserve_output)
+
+    def add(
+        self,
+        name: str,
+        text: str,
+        priority: int = 0,
+        min_tokens: int = 0,
+        max_tokens: Optional[int] = None,
+        keep: str = "start"
+    ) -> "TokenBudget":
+        """Add a prompt part.
+
+        Args:
+            name: Key the fitted text is returned under
+            text: Part content
+            priority: Higher priority parts are trimmed last
+            min_tokens: Never trim this part below this many tokens
+            max_tokens: Cap for this part regardless of the total budget
+            keep: Which end of the part survives trimming ("start" or "end")
+        """
+        self._parts.append({
+            "name": name,
+            "text": text or "",
+            "priority": priority,
+            "min_tokens": min_tokens,
+            "max_tokens": max_tokens,
+            "keep": keep,
+            "order": len(self._parts),
+        })
+        return self
+
+    def fit(self) -> Dict[str, str]:
+        """Return every part, trimmed so the total fits the budget.
+
+        If the parts cannot fit even at their min_tokens, the remaining
+        excess is recorded in ``overflow`` and a warning is logged.
+        """
+        texts = {}
+        for part in self._parts:
+            text = part["text"]
+            if part["max_tokens"] is not None:
+                text = truncate_to_tokens(text, part["max_tokens"], self.model, keep=part["keep"])
+            texts[part["name"]] = text
+        counts = {name: count_tokens(text, self.model) for name, text in texts.items()}
+        excess = sum(counts.values()) - self.available
+
+        trim_order = sorted(self._parts, key=lambda part: (part["priority"], -part["order"]))
+        for part in trim_order:
+            if excess <= 0:
+                break
+            name = part["name"]
+            cut = min(excess, counts[name] - part["min_tokens"])
+            if cut <= 0:
+                continue
+            trimmed = truncate_to_tokens(texts[name], counts[name] - cut, self.model, keep=part["keep"])
+            if count_tokens(trimmed, self.model) < part["min_tokens"]:
+                # Snapping to a sentence break would undercut the floor; cut exactly instead
+                trimmed = truncate_to_tokens(
+                    texts[name], counts[name] - cut, self.model, keep=part["keep"], snap=False
+                )
+            texts[name] = trimmed
+            new_count = count_tokens(trimmed, self.model)
+            excess -= counts[name] - new_count
+            counts[name] = new_count
+
+        self.overflow = max(0, excess)
+        if self.overflow:
+            logger.warning(f"Prompt exceeds token budget by {self.overflow} tokens after trimming")
+        return texts
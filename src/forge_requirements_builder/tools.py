@@ -3,12 +3,90 @@
 Implements all tool functions used by specialized agents in the requirements workflow.
 """
 
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Callable, FrozenSet, Iterable, Iterator, Tuple
 from pydantic import BaseModel, Field
+import glob
+import logging
+import os
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 
+from .cache import configure_extraction_cache, file_digest, make_cache_key
+from .dedup import NearDuplicateIndex, requirement_text
+from .docx_reader import iter_docx_blocks
+from .keywords import KeywordMatcher
+from .rules import QualityRule, QualityRuleRegistry, RuleContext
 from .state import RequirementRaw, UserStory, QualityIssue, PrioritizedRequirement
+from .text_reader import LineStream, read_text
+
+logger = logging.getLogger("forge_requirements_builder")
+
+# Bump whenever text extraction or parsing changes, so cached results are not reused
+EXTRACTOR_VERSION = "4"
+
+# Worker processes for PDF page extraction (0 = one per CPU, 1 = in-process)
+PDF_WORKERS = int(os.getenv("FORGE_PDF_WORKERS", "0"))
+
+# Smaller PDFs are extracted in-process; pool start-up would cost more than it saves
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("FORGE_PDF_PARALLEL_MIN_PAGES", "64"))
+
+# Pages handed to a worker per task
+PDF_PAGES_PER_TASK = int(os.getenv("FORGE_PDF_PAGES_PER_TASK", "16"))
+
+# Worker processes for bulk document extraction (0 = one per CPU, 1 = in-process)
+INGEST_WORKERS = int(os.getenv("FORGE_INGEST_WORKERS", "0"))
+
+# Streamed text files are parsed in blocks of about this many characters,
+# split at blank lines
+TEXT_BLOCK_CHARS = 1024 * 1024
+
+# File types extract_from_document understands
+SUPPORTED_DOCUMENT_TYPES = ("pdf", "txt", "md", "markdown", "docx", "doc")
+
+# Keyword tables of the rule-based checks, matched as substrings of the
+# lower-cased text
+_NFR_KEYWORDS = (
+    'performance', 'speed', 'fast', 'scalable', 'available', 'reliability',
+    'security', 'secure', 'usability', 'maintainable', 'portable',
+    'response time', 'throughput', 'latency', 'uptime', 'audit'
+)
+_CONSTRAINT_KEYWORDS = (
+    'must use', 'must support', 'compatible with', 'integrate with',
+    'comply with', 'standard', 'regulation', 'platform', 'technology'
+)
+_CAPTURE_VAGUE_TERMS = ('user-friendly', 'fast', 'efficient', 'good', 'bad', 'easy', 'simple')
+_TESTABLE_VERBS = ('can', 'should', 'must', 'will', 'displays', 'shows', 'returns', 'validates', 'redirects')
+_VAGUE_TERMS = {
+    'user-friendly': 'Define specific usability criteria (e.g., task completion time < 2 minutes)',
+    'fast': 'Specify performance targets (e.g., response time < 200ms)',
+    'efficient': 'Define efficiency metrics (e.g., CPU usage < 50%)',
+    'scalable': 'Specify scaling requirements (e.g., support 10,000 concurrent users)',
+    'reliable': 'Define reliability metrics (e.g., 99.9% uptime)',
+    'secure': 'Specify security standards (e.g., OAuth 2.0, AES-256 encryption)',
+    'easy to use': 'Define specific usability criteria',
+    'good': 'Specify measurable quality criteria',
+    'bad': 'Specify measurable quality criteria',
+    'simple': 'Define what constitutes simplicity',
+    'flexible': 'Specify what aspects should be configurable'
+}
+_ACTOR_WORDS = ('user', 'system', 'shall', 'must')
+_MEASURABLE_KEYWORDS = ('number', 'count', 'time', 'seconds', 'minutes', 'percent', '%', 'rate')
+
+# One automaton over every table, so a text is scanned once for all checks
+_KEYWORDS = KeywordMatcher([
+    *_NFR_KEYWORDS, *_CONSTRAINT_KEYWORDS, *_CAPTURE_VAGUE_TERMS, *_TESTABLE_VERBS,
+    *_VAGUE_TERMS, *_ACTOR_WORDS, *_MEASURABLE_KEYWORDS
+])
+
+
+@lru_cache(maxsize=4096)
+def _keywords_in(text: str) -> FrozenSet[str]:
+    """Table keywords occurring in text, computed once per distinct text."""
+    return _KEYWORDS.find(text)
 
 
 # ============================================================================
@@ -21,6 +99,7 @@ class ExtractedRequirement(BaseModel):
     description: str
     type: str  # Functional | Non-Functional | Constraint
     source: str
+    page: Optional[int] = None  # 1-based page number (paged formats only)
 
 
 class DocumentExtractionResult(BaseModel):
@@ -29,12 +108,21 @@ class DocumentExtractionResult(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class BulkExtractionResult(BaseModel):
+    """Result from extracting a set of documents."""
+    documents: List[DocumentExtractionResult]  # In file path order
+    errors: Dict[str, str] = Field(default_factory=dict)  # file path -> error message
+
+
 def extract_from_document(
     file_path: str,
     file_type: str = "auto"
 ) -> DocumentExtractionResult:
     """Extract requirements from uploaded document (PDF, DOCX, TXT).
     
+    Results are cached by file content (see configure_extraction_cache),
+    so re-uploading an unchanged document skips reading and parsing it.
+    
     Args:
         file_path: Path to the document file
         file_type: File type ("pdf", "docx", "txt", or "auto" to detect)
@@ -46,6 +134,66 @@ def extract_from_document(
         FileNotFoundError: If file doesn't exist
         ValueError: If file type not supported
     """
+    path, file_type = _resolve_document(file_path, file_type)
+    entry, cached = _load_extraction(path, file_type, need_text=False)
+    
+    # Cached entries may come from an upload of the same content under another name
+    requirements = [ExtractedRequirement(**{**req, "source": path.name}) for req in entry["requirements"]]
+    
+    return DocumentExtractionResult(
+        requirements=requirements,
+        metadata={
+            "file_path": str(path),
+            "file_type": file_type,
+            "file_size": path.stat().st_size,
+            "requirements_count": len(requirements),
+            "cached": cached,
+            **entry["metadata"]
+        }
+    )
+
+
+def extract_from_text(text: str, source: str = "text") -> DocumentExtractionResult:
+    """Extract requirements from text already in memory (chat turns, pasted notes).
+    
+    Uses the same parser as extract_from_document without touching the
+    filesystem.
+    
+    Args:
+        text: Text to parse
+        source: Label recorded as each requirement's source
+        
+    Returns:
+        DocumentExtractionResult with extracted requirements
+    """
+    requirements = _parse_requirements_from_text(text, source=source)
+    return DocumentExtractionResult(
+        requirements=requirements,
+        metadata={
+            "source": source,
+            "text_length": len(text),
+            "requirements_count": len(requirements)
+        }
+    )
+
+
+def load_document_text(file_path: str, file_type: str = "auto") -> str:
+    """Return the plain text of a document (PDF, DOCX, TXT).
+    
+    The text is always read from the file; the extraction cache only keeps
+    parsed requirements.
+    
+    Raises:
+        FileNotFoundError: If file doesn't exist
+        ValueError: If file type not supported
+    """
+    path, file_type = _resolve_document(file_path, file_type)
+    entry, _ = _load_extraction(path, file_type, need_text=True)
+    return entry["text"]
+
+
+def _resolve_document(file_path: str, file_type: str) -> Tuple[Path, str]:
+    """Check the file exists and resolve its type."""
     path = Path(file_path)
     
     if not path.exists():
@@ -55,75 +203,412 @@ def extract_from_document(
     if file_type == "auto":
         file_type = path.suffix.lower().lstrip('.')
     
+    if file_type not in SUPPORTED_DOCUMENT_TYPES:
+        raise ValueError(f"Unsupported file type: {file_type}")
+    return path, file_type
+
+
+def _load_extraction(path: Path, file_type: str, need_text: bool) -> Tuple[Dict[str, Any], bool]:
+    """Return (entry, cached) where entry holds requirements and metadata.
+    
+    Only requirements and metadata are cached, never the text, so a cache
+    hit costs no more memory than the parsed requirements and a miss still
+    streams the document unless need_text is set. Asking for the text
+    always reads the document (and refreshes its cache entry).
+    """
+    cache = configure_extraction_cache()
+    key = None
+    if cache is not None:
+        key = make_cache_key(EXTRACTOR_VERSION, file_type, file_digest(str(path)))
+        if not need_text:
+            entry = cache.get(key)
+            if entry is not None:
+                return entry, True
+    
+    entry = _extract_document(path, file_type, keep_text=need_text)
+    if cache is not None:
+        cache.set(key, {"requirements": entry["requirements"], "metadata": entry["metadata"]})
+    return entry, False
+
+
+def _extract_document(path: Path, file_type: str, keep_text: bool = True) -> Dict[str, Any]:
+    """Read and parse a document into a cacheable entry.
+    
+    With keep_text off, PDF pages, DOCX paragraphs and text-file blocks
+    are parsed as they stream in and discarded, and the entry's text is
+    empty. Text files are
+    read up to FORGE_MAX_TEXT_MB; metadata["truncated"] reports a cut.
+    """
+    metadata = {}
+
     # Extract text based on file type
-    if file_type in ["txt", "md", "markdown"]:
-        text = _extract_text_from_txt(path)
-    elif file_type == "pdf":
-        text = _extract_text_from_pdf(path)
-    elif file_type in ["docx", "doc"]:
-        text = _extract_text_from_docx(path)
+    if file_type == "pdf":
+        # Parse page by page instead of joining the full text first
+        page_texts = []
+        page_count = 0
+
+        def pages():
+            nonlocal page_count
+            for number, page_text in iter_pdf_pages(path):
+                page_count += 1
+                if keep_text:
+                    page_texts.append(page_text)
+                yield number, page_text
+
+        requirements = _parse_requirements_from_pages(pages(), source=path.name)
+        text = "\n\n".join(page_texts)
+        metadata["page_count"] = page_count
+    elif file_type in ["docx", "doc"] and not keep_text:
+        # Parse paragraphs as they stream out of the package, a blank line after each
+        lines = (line for paragraph in _iter_docx_blocks(path) for line in (f"{paragraph}\n", "\n"))
+        requirements = _parse_requirements_from_pages(
+            ((None, block) for block in _iter_text_blocks(lines)), source=path.name
+        )
+        text = ""
+    elif file_type in ["txt", "md", "markdown"] and not keep_text:
+        # Stream lines to the parser instead of decoding the whole file
+        lines = LineStream(path)
+        requirements = _parse_requirements_from_pages(
+            ((None, block) for block in _iter_text_blocks(lines)), source=path.name
+        )
+        text = ""
+        metadata["truncated"] = lines.truncated
     else:
-        raise ValueError(f"Unsupported file type: {file_type}")
+        if file_type in ["txt", "md", "markdown"]:
+            read = read_text(path)
+            text = read.text
+            metadata["truncated"] = read.truncated
+        else:
+            text = _extract_text_from_docx(path)
+
+        # Parse requirements from text
+        requirements = _parse_requirements_from_text(text, source=path.name)
+    
+    return {
+        "text": text,
+        "requirements": [req.model_dump() for req in requirements],
+        "metadata": metadata
+    }
+
+
+def find_documents(source: str, recursive: bool = False) -> List[Path]:
+    """Resolve a file, directory or glob pattern to supported documents.
     
-    # Parse requirements from text
-    requirements = _parse_requirements_from_text(text, source=path.name)
+    Args:
+        source: File path, directory, or glob pattern (e.g. "notes/*.md")
+        recursive: Include subdirectories when source is a directory
+        
+    Returns:
+        Matching document paths, sorted
+        
+    Raises:
+        FileNotFoundError: If nothing matches source
+    """
+    path = Path(source)
+    if path.is_file():
+        candidates = [path]
+    elif path.is_dir():
+        candidates = path.rglob("*") if recursive else path.iterdir()
+    else:
+        candidates = (Path(match) for match in glob.glob(source, recursive=True))
     
-    return DocumentExtractionResult(
-        requirements=requirements,
-        metadata={
-            "file_path": str(path),
-            "file_type": file_type,
-            "file_size": path.stat().st_size,
-            "requirements_count": len(requirements)
-        }
+    documents = sorted(
+        candidate for candidate in candidates
+        if candidate.is_file() and candidate.suffix.lower().lstrip('.') in SUPPORTED_DOCUMENT_TYPES
+    )
+    if not documents:
+        raise FileNotFoundError(f"No supported documents found at: {source}")
+    return documents
+
+
+def _init_ingest_worker() -> None:
+    """Set up a bulk-extraction worker process."""
+    global PDF_WORKERS
+    # Documents are already spread across processes; don't fan out again per page
+    PDF_WORKERS = 1
+    # Never share the parent's SQLite connection across fork
+    configure_extraction_cache(force=True)
+
+
+def _extract_document_safely(file_path: str) -> Tuple[str, Optional[DocumentExtractionResult], Optional[str]]:
+    """Extract one document, returning the error message instead of raising."""
+    try:
+        return file_path, extract_from_document(file_path), None
+    except Exception as e:
+        return file_path, None, f"{type(e).__name__}: {e}"
+
+
+def iter_extract_from_documents(
+    paths: Iterable[Path],
+    workers: Optional[int] = None
+) -> Iterator[Tuple[str, Optional[DocumentExtractionResult], Optional[str]]]:
+    """Extract documents in a process pool, yielding each as it finishes.
+    
+    Args:
+        paths: Documents to extract
+        workers: Worker processes (defaults to FORGE_INGEST_WORKERS; 0 = one
+            per CPU, 1 = extract in-process)
+        
+    Yields:
+        (file_path, result, error) in completion order; exactly one of
+        result and error is set
+    """
+    file_paths = [str(path) for path in paths]
+    workers = INGEST_WORKERS if workers is None else workers
+    workers = min(workers or os.cpu_count() or 1, len(file_paths))
+    if workers <= 1:
+        for file_path in file_paths:
+            yield _extract_document_safely(file_path)
+        return
+    
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_ingest_worker) as executor:
+        futures = [executor.submit(_extract_document_safely, file_path) for file_path in file_paths]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def extract_from_documents(
+    source: str,
+    recursive: bool = False,
+    workers: Optional[int] = None,
+    on_result: Optional[Callable[[str, Optional[DocumentExtractionResult], Optional[str]], None]] = None
+) -> BulkExtractionResult:
+    """Extract requirements from every document in a directory or glob.
+    
+    Files are parsed in parallel; a file that fails is reported in errors
+    without stopping the others.
+    
+    Args:
+        source: File path, directory, or glob pattern
+        recursive: Include subdirectories when source is a directory
+        workers: Worker processes (see iter_extract_from_documents)
+        on_result: Called with (file_path, result, error) as each file finishes
+        
+    Returns:
+        BulkExtractionResult with per-document results in file path order
+        
+    Raises:
+        FileNotFoundError: If no supported documents match source
+    """
+    paths = find_documents(source, recursive=recursive)
+    results: Dict[str, DocumentExtractionResult] = {}
+    errors: Dict[str, str] = {}
+    for file_path, result, error in iter_extract_from_documents(paths, workers=workers):
+        if result is not None:
+            results[file_path] = result
+        else:
+            errors[file_path] = error
+        if on_result is not None:
+            on_result(file_path, result, error)
+    
+    return BulkExtractionResult(
+        documents=[results[str(path)] for path in paths if str(path) in results],
+        errors={str(path): errors[str(path)] for path in paths if str(path) in errors}
     )
 
 
+def merge_extracted_requirements(
+    state: Dict[str, Any],
+    documents: List[DocumentExtractionResult],
+    source: Optional[str] = None
+) -> Tuple[int, int]:
+    """Add requirements extracted from documents to requirements_raw.
+    
+    Each requirement is checked against the project's near-duplicate index
+    (state["requirements_index"], see dedup.py), which is updated as
+    requirements are added, both against existing requirements and across
+    the documents themselves, without comparing every pair. Exact repeats
+    (same text ignoring case, punctuation and spacing) are skipped.
+    Rewordings at or above FORGE_NEAR_DUPLICATE_THRESHOLD are still added,
+    with duplicate_of set to the requirement they resemble, so the
+    "near-duplicate" quality rule asks the user to review them.
+    
+    Args:
+        state: Project state (requirements_raw and requirements_index are
+            updated in place)
+        documents: Extraction results, in the order they should be numbered
+        source: Source recorded on every added requirement (defaults to
+            "File: <path>" plus the page, if known)
+        
+    Returns:
+        (added, skipped) counts
+    """
+    current_count = len(state["requirements_raw"])
+    new_reqs = []
+    index = NearDuplicateIndex.for_state(state)
+    
+    skipped_count = 0
+    for document in documents:
+        file_path = document.metadata.get("file_path", "")
+        for extracted in document.requirements:
+            text = requirement_text(extracted.title, extracted.description)
+            repeated = index.exact_match(text)
+            if repeated is not None:
+                logger.debug(f"Skipping '{extracted.title}': repeats {repeated}")
+                skipped_count += 1
+                continue
+            
+            # Reworded duplicates are kept, but flagged for review
+            match = index.query(text)
+            if match is not None:
+                logger.debug(f"Flagging '{extracted.title}': near-duplicate of {match[0]} ({match[1]:.2f})")
+            
+            req_id = f"REQ-{current_count + len(new_reqs) + 1:03d}"
+            requirement = RequirementRaw(
+                id=req_id,
+                title=extracted.title,
+                description=extracted.description,
+                type=extracted.type,
+                source=source or (f"File: {file_path}" + (f", page {extracted.page}" if extracted.page else "")),
+                duplicate_of=match[0] if match is not None else None
+            )
+            new_reqs.append(requirement)
+            index.add(req_id, text, requirement.content_fingerprint())
+    
+    state["requirements_raw"].extend(new_reqs)
+    return len(new_reqs), skipped_count
+
+
 def _extract_text_from_txt(path: Path) -> str:
-    """Extract text from TXT file."""
-    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
-        return f.read()
+    """Extract text from TXT file (up to FORGE_MAX_TEXT_MB)."""
+    return read_text(path).text
 
 
-def _extract_text_from_pdf(path: Path) -> str:
-    """Extract text from PDF file using pypdf."""
+def _iter_text_blocks(lines: Iterable[str], block_chars: int = TEXT_BLOCK_CHARS) -> Iterator[str]:
+    """Group lines into blocks of about block_chars, ending each at a blank line."""
+    block: List[str] = []
+    size = 0
+    for line in lines:
+        block.append(line)
+        size += len(line)
+        if size >= block_chars and not line.strip():
+            yield "".join(block)
+            block, size = [], 0
+    if block:
+        yield "".join(block)
+
+
+def _import_pdf_reader():
     try:
         from pypdf import PdfReader
     except ImportError:
         raise ImportError("pypdf not installed. Install with: pip install pypdf")
+    return PdfReader
+
+
+def _read_pdf_pages(file_path: str, start: int, stop: int) -> List[Tuple[int, str]]:
+    """Extract pages [start, stop) of a PDF (runs in a worker process)."""
+    reader = _import_pdf_reader()(file_path)
+    return [(index + 1, reader.pages[index].extract_text() or "") for index in range(start, stop)]
+
+
+def iter_pdf_pages(
+    path: Path,
+    workers: Optional[int] = None,
+    pages_per_task: int = PDF_PAGES_PER_TASK
+) -> Iterator[Tuple[int, str]]:
+    """Yield (page_number, text) for each page of a PDF, in page order.
     
-    reader = PdfReader(path)
-    text_parts = []
-    
-    for page in reader.pages:
-        text_parts.append(page.extract_text())
+    Large PDFs are split into page ranges extracted by a process pool. At
+    most two ranges per worker are in flight, so memory stays flat however
+    long the document is.
     
-    return "\n\n".join(text_parts)
+    Args:
+        path: Path to the PDF file
+        workers: Worker processes (defaults to FORGE_PDF_WORKERS; 0 = one
+            per CPU, 1 = extract in-process)
+        pages_per_task: Pages handed to a worker at a time
+    """
+    reader = _import_pdf_reader()(path)
+    page_count = len(reader.pages)
+
+    workers = PDF_WORKERS if workers is None else workers
+    workers = min(workers or os.cpu_count() or 1, -(-page_count // max(1, pages_per_task)))
+    if workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+        for index, page in enumerate(reader.pages):
+            yield index + 1, page.extract_text() or ""
+        return
+    del reader
+
+    ranges = (
+        (start, min(start + pages_per_task, page_count))
+        for start in range(0, page_count, pages_per_task)
+    )
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque(
+            executor.submit(_read_pdf_pages, str(path), start, stop)
+            for start, stop in islice(ranges, workers * 2)
+        )
+        try:
+            while pending:
+                pages = pending.popleft().result()
+                for start, stop in islice(ranges, 1):
+                    pending.append(executor.submit(_read_pdf_pages, str(path), start, stop))
+                yield from pages
+        finally:
+            # Consumer stopped early or a worker failed: drop queued ranges
+            for future in pending:
+                future.cancel()
+
+
+def _extract_text_from_pdf(path: Path) -> str:
+    """Extract text from PDF file using pypdf."""
+    return "\n\n".join(text for _, text in iter_pdf_pages(path))
 
 
 def _extract_text_from_docx(path: Path) -> str:
-    """Extract text from DOCX file using python-docx."""
+    """Extract text from DOCX file, paragraphs and table rows in document order."""
+    return "\n\n".join(_iter_docx_blocks(path))
+
+
+def _iter_docx_blocks(path: Path) -> Iterator[str]:
+    """Stream a DOCX file's paragraphs and table rows (see docx_reader).
+    
+    Packages without a word/document.xml part are read with python-docx.
+    """
+    try:
+        return iter_docx_blocks(path)
+    except KeyError:
+        return _iter_docx_blocks_python_docx(path)
+
+
+def _iter_docx_blocks_python_docx(path: Path) -> Iterator[str]:
+    """Paragraphs, then table rows, of a DOCX file using python-docx."""
     try:
         from docx import Document
     except ImportError:
         raise ImportError("python-docx not installed. Install with: pip install python-docx")
     
     doc = Document(path)
-    text_parts = []
     
     # Extract paragraphs
     for para in doc.paragraphs:
         if para.text.strip():
-            text_parts.append(para.text)
+            yield para.text
     
     # Extract tables
     for table in doc.tables:
         for row in table.rows:
             row_text = " | ".join(cell.text.strip() for cell in row.cells)
             if row_text.strip():
-                text_parts.append(row_text)
-    
-    return "\n\n".join(text_parts)
+                yield row_text
+
+
+# Requirement patterns. The lower-case variants run case-sensitively over a
+# lower-cased copy of ASCII text, which lets the regex engine skip ahead on
+# literal prefixes instead of trying every position case-insensitively.
+_SYSTEM_PATTERN = r'(?:the\s+system|application|platform|product)\s+(?:shall|must|should|will)\s+([^.]+\.)'
+_ID_PATTERN = r'(req[-\s]?\d+)\s*[:\-]\s*([^\n]+)'
+_SYSTEM_REQUIREMENT = re.compile(_SYSTEM_PATTERN)
+_SYSTEM_REQUIREMENT_ANY_CASE = re.compile(_SYSTEM_PATTERN, re.IGNORECASE)
+_ID_REQUIREMENT = re.compile(_ID_PATTERN)
+_ID_REQUIREMENT_ANY_CASE = re.compile(_ID_PATTERN, re.IGNORECASE)
+_NUMBERED_REQUIREMENT = re.compile(r'^[^\S\n]*\d+\.[^\S\n]+([^\n]+)', re.MULTILINE)
+_NUMBERED_REQUIREMENT_WORDS = re.compile(r'must|should|will|shall|can|able')
 
 
 def _parse_requirements_from_text(text: str, source: str) -> List[ExtractedRequirement]:
@@ -134,71 +619,81 @@ def _parse_requirements_from_text(text: str, source: str) -> List[ExtractedRequi
     - Numbered requirements (1., 2., etc.)
     - REQ-XXX: format
     - Bullet points with requirement-like content
-    """
-    requirements = []
-    
-    # Pattern 1: "The system shall/must/should..." 
-    system_pattern = r'(?:the\s+system|application|platform|product)\s+(?:shall|must|should|will)\s+([^.]+\.)'
-    matches = re.finditer(system_pattern, text, re.IGNORECASE)
-    
-    for match in matches:
-        description = match.group(0).strip()
-        title = _generate_title_from_description(description)
-        
-        requirements.append(ExtractedRequirement(
-            title=title,
-            description=description,
-            type=_classify_requirement_type(description),
-            source=source
-        ))
-    
-    # Pattern 2: REQ-XXX format
-    req_pattern = r'(REQ[-\s]?\d+)\s*[:\-]\s*([^\n]+)'
-    matches = re.finditer(req_pattern, text, re.IGNORECASE)
     
-    for match in matches:
-        req_id = match.group(1)
-        description = match.group(2).strip()
-        
-        requirements.append(ExtractedRequirement(
-            title=f"{req_id}: {_generate_title_from_description(description)}",
+    Results list "system shall" matches first, then REQ-XXX, then numbered
+    items, each in document order. Duplicate descriptions are dropped as
+    they are found, and titles/types are only worked out for the survivors.
+    """
+    if text.isascii():
+        haystack = text.lower()
+        system_pattern, id_pattern = _SYSTEM_REQUIREMENT, _ID_REQUIREMENT
+    else:
+        # Lower-casing non-ASCII text can shift offsets; match case-insensitively instead
+        haystack = text
+        system_pattern, id_pattern = _SYSTEM_REQUIREMENT_ANY_CASE, _ID_REQUIREMENT_ANY_CASE
+
+    # description -> title prefix ("REQ-001: " for REQ-XXX matches)
+    found: Dict[str, str] = {}
+
+    for match in system_pattern.finditer(haystack):
+        description = text[match.start():match.end()].strip()
+        found.setdefault(description, "")
+
+    for match in id_pattern.finditer(haystack):
+        description = text[match.start(2):match.end(2)].strip()
+        found.setdefault(description, f"{text[match.start(1):match.end(1)]}: ")
+
+    for match in _NUMBERED_REQUIREMENT.finditer(text):
+        description = match.group(1).strip()
+        # Filter out non-requirement lines (TOC, headers, etc.)
+        if (
+            description not in found
+            and len(description) > 20
+            and _NUMBERED_REQUIREMENT_WORDS.search(description.lower())
+        ):
+            found[description] = ""
+
+    return [
+        ExtractedRequirement(
+            title=title_prefix + _generate_title_from_description(description),
             description=description,
             type=_classify_requirement_type(description),
             source=source
-        ))
+        )
+        for description, title_prefix in found.items()
+    ]
+
+
+def _parse_requirements_from_pages(
+    pages: Iterable[Tuple[int, str]],
+    source: str
+) -> List[ExtractedRequirement]:
+    """Parse requirements one page at a time, recording the page each came from.
     
-    # Pattern 3: Numbered list items that look like requirements
-    numbered_pattern = r'^\s*\d+\.\s+([^\n]+)'
-    for line in text.split('\n'):
-        match = re.match(numbered_pattern, line)
-        if match:
-            description = match.group(1).strip()
-            # Filter out non-requirement lines (TOC, headers, etc.)
-            if len(description) > 20 and any(word in description.lower() for word in ['must', 'should', 'will', 'shall', 'can', 'able']):
-                title = _generate_title_from_description(description)
-                
-                requirements.append(ExtractedRequirement(
-                    title=title,
-                    description=description,
-                    type=_classify_requirement_type(description),
-                    source=source
-                ))
-    
-    # Deduplicate by description
+    A requirement that appears on several pages is kept once, at its first page.
+    Sentences split across a page break are not joined.
+    """
     seen = set()
-    unique_requirements = []
-    for req in requirements:
-        if req.description not in seen:
-            seen.add(req.description)
-            unique_requirements.append(req)
-    
-    return unique_requirements
+    requirements = []
+    for page_number, text in pages:
+        for req in _parse_requirements_from_text(text, source=source):
+            if req.description not in seen:
+                seen.add(req.description)
+                req.page = page_number
+                requirements.append(req)
+    return requirements
+
+
+_TITLE_PREFIX = re.compile(
+    r'^(?:the\s+)?(?:system|application|platform|product)\s+(?:shall|must|should|will)\s+',
+    re.IGNORECASE
+)
 
 
 def _generate_title_from_description(description: str, max_length: int = 60) -> str:
     """Generate a concise title from requirement description."""
     # Remove common prefixes
-    title = re.sub(r'^(?:the\s+)?(?:system|application|platform|product)\s+(?:shall|must|should|will)\s+', '', description, flags=re.IGNORECASE)
+    title = _TITLE_PREFIX.sub('', description)
     
     # Truncate to max length
     if len(title) > max_length:
@@ -212,27 +707,14 @@ def _generate_title_from_description(description: str, max_length: int = 60) ->
 
 def _classify_requirement_type(description: str) -> str:
     """Classify requirement as Functional, Non-Functional, or Constraint."""
-    description_lower = description.lower()
-    
-    # Non-functional indicators
-    nfr_keywords = [
-        'performance', 'speed', 'fast', 'scalable', 'available', 'reliability',
-        'security', 'secure', 'usability', 'maintainable', 'portable',
-        'response time', 'throughput', 'latency', 'uptime', 'audit'
-    ]
-    
-    # Constraint indicators
-    constraint_keywords = [
-        'must use', 'must support', 'compatible with', 'integrate with',
-        'comply with', 'standard', 'regulation', 'platform', 'technology'
-    ]
+    keywords = _keywords_in(description)
     
     # Check for non-functional
-    if any(keyword in description_lower for keyword in nfr_keywords):
+    if not keywords.isdisjoint(_NFR_KEYWORDS):
         return "Non-Functional"
     
     # Check for constraints
-    if any(keyword in description_lower for keyword in constraint_keywords):
+    if not keywords.isdisjoint(_CONSTRAINT_KEYWORDS):
         return "Constraint"
     
     # Default to functional
@@ -276,8 +758,7 @@ def validate_requirement_capture(requirement: RequirementRaw) -> RequirementVali
         suggestions.append("Specify source: discovery_session, document, meeting, etc.")
     
     # Check for vague descriptions
-    vague_terms = ['user-friendly', 'fast', 'efficient', 'good', 'bad', 'easy', 'simple']
-    if any(term in requirement.description.lower() for term in vague_terms):
+    if not _keywords_in(requirement.description).isdisjoint(_CAPTURE_VAGUE_TERMS):
         suggestions.append("Description contains vague terms. Consider being more specific.")
     
     # Check if needs refinement flag
@@ -385,6 +866,21 @@ def validate_user_story(story: UserStory) -> UserStoryValidationResult:
     )
 
 
+class StoryDraft(BaseModel):
+    """Story drafted by the LLM for one requirement (IDs are assigned later)."""
+    requirement_id: str = Field(..., description="ID of the requirement this story implements, copied verbatim")
+    title: str = Field(..., description="Story title")
+    story_statement: str = Field(..., description="As a [role], I want [feature] so that [benefit]")
+    acceptance_criteria: List[str] = Field(default_factory=list, description="Testable acceptance criteria")
+    edge_cases: List[str] = Field(default_factory=list, description="Edge cases and error scenarios")
+    effort: str = Field(default="M", description="XS | S | M | L | XL")
+
+
+class StoryDraftBatch(BaseModel):
+    """Structured output for authoring several requirements in one call."""
+    stories: List[StoryDraft] = Field(default_factory=list, description="One story per requirement")
+
+
 def format_user_story_template(
     role: str,
     feature: str,
@@ -415,14 +911,9 @@ def validate_acceptance_criteria(criteria: List[str]) -> Dict[str, Any]:
     testable = []
     vague = []
     
-    # Testable verbs
-    testable_verbs = ['can', 'should', 'must', 'will', 'displays', 'shows', 'returns', 'validates', 'redirects']
-    
     for criterion in criteria:
-        criterion_lower = criterion.lower()
-        
         # Check if contains testable verbs
-        if any(verb in criterion_lower for verb in testable_verbs):
+        if not _keywords_in(criterion).isdisjoint(_TESTABLE_VERBS):
             testable.append(criterion)
         else:
             vague.append(criterion)
@@ -454,7 +945,8 @@ class QualityValidationResult(BaseModel):
 
 def validate_requirements_quality(
     requirements: List[RequirementRaw],
-    user_stories: Optional[List[UserStory]] = None
+    user_stories: Optional[List[UserStory]] = None,
+    workers: Optional[int] = None
 ) -> QualityValidationResult:
     """Validate requirements quality across 4 dimensions.
     
@@ -464,39 +956,22 @@ def validate_requirements_quality(
     3. Inconsistency - Contradictions
     4. Testability - Cannot be verified
     
+    Each check is a rule in QUALITY_RULES; rules registered there run too.
+    
     Args:
         requirements: List of requirements to validate
         user_stories: Optional list of user stories for cross-validation
+        workers: Worker processes for per-requirement rules (defaults to
+            FORGE_QUALITY_WORKERS; 0 = one per CPU, 1 = in-process)
         
     Returns:
         QualityValidationResult with all detected issues
     """
-    issues = []
-    issue_id_counter = 1
-    
-    # Dimension 1: Ambiguity Detection
-    for req in requirements:
-        ambiguity_issues = _detect_ambiguity(req, issue_id_counter)
-        issues.extend(ambiguity_issues)
-        issue_id_counter += len(ambiguity_issues)
-    
-    # Dimension 2: Completeness Check
-    for req in requirements:
-        completeness_issues = _check_completeness(req, issue_id_counter)
-        issues.extend(completeness_issues)
-        issue_id_counter += len(completeness_issues)
-    
-    # Dimension 3: Consistency Validation
-    consistency_issues = _validate_consistency(requirements, issue_id_counter)
-    issues.extend(consistency_issues)
-    issue_id_counter += len(consistency_issues)
-    
-    # Dimension 4: Testability Check
-    for req in requirements:
-        testability_issues = _check_testability(req, user_stories, issue_id_counter)
-        issues.extend(testability_issues)
-        issue_id_counter += len(testability_issues)
-    
+    return quality_result(QUALITY_RULES.run(requirements, user_stories, workers=workers))
+
+
+def quality_result(issues: List[QualityIssue]) -> QualityValidationResult:
+    """Wrap issues in a QualityValidationResult with their severity counts."""
     # Count by severity
     severity_counts = {
         "Critical": len([i for i in issues if i.severity == "Critical"]),
@@ -515,30 +990,15 @@ def validate_requirements_quality(
     )
 
 
-def _detect_ambiguity(req: RequirementRaw, start_id: int) -> List[QualityIssue]:
+def _detect_ambiguity(req: RequirementRaw, context: RuleContext) -> List[QualityIssue]:
     """Detect ambiguous terms in requirement."""
     issues = []
+    keywords = _keywords_in(req.description)
     
-    vague_terms = {
-        'user-friendly': 'Define specific usability criteria (e.g., task completion time < 2 minutes)',
-        'fast': 'Specify performance targets (e.g., response time < 200ms)',
-        'efficient': 'Define efficiency metrics (e.g., CPU usage < 50%)',
-        'scalable': 'Specify scaling requirements (e.g., support 10,000 concurrent users)',
-        'reliable': 'Define reliability metrics (e.g., 99.9% uptime)',
-        'secure': 'Specify security standards (e.g., OAuth 2.0, AES-256 encryption)',
-        'easy to use': 'Define specific usability criteria',
-        'good': 'Specify measurable quality criteria',
-        'bad': 'Specify measurable quality criteria',
-        'simple': 'Define what constitutes simplicity',
-        'flexible': 'Specify what aspects should be configurable'
-    }
-    
-    description_lower = req.description.lower()
-    
-    for term, fix in vague_terms.items():
-        if term in description_lower:
+    for term, fix in _VAGUE_TERMS.items():
+        if term in keywords:
             issues.append(QualityIssue(
-                id=f"QA-{start_id:03d}",
+                id="",
                 location=req.id,
                 category="Ambiguity",
                 severity="High" if term in ['secure', 'reliable', 'scalable'] else "Medium",
@@ -546,19 +1006,18 @@ def _detect_ambiguity(req: RequirementRaw, start_id: int) -> List[QualityIssue]:
                 recommended_fix=fix,
                 status="Identified"
             ))
-            start_id += 1
     
     return issues
 
 
-def _check_completeness(req: RequirementRaw, start_id: int) -> List[QualityIssue]:
+def _check_completeness(req: RequirementRaw, context: RuleContext) -> List[QualityIssue]:
     """Check requirement completeness."""
     issues = []
     
     # Check description length
     if len(req.description) < 30:
         issues.append(QualityIssue(
-            id=f"QA-{start_id:03d}",
+            id="",
             location=req.id,
             category="Incompleteness",
             severity="Medium",
@@ -566,12 +1025,11 @@ def _check_completeness(req: RequirementRaw, start_id: int) -> List[QualityIssue
             recommended_fix="Add more detail: who, what, why, when, where, how",
             status="Identified"
         ))
-        start_id += 1
     
     # Check for missing context
-    if req.type == "Functional" and not any(word in req.description.lower() for word in ['user', 'system', 'shall', 'must']):
+    if req.type == "Functional" and _keywords_in(req.description).isdisjoint(_ACTOR_WORDS):
         issues.append(QualityIssue(
-            id=f"QA-{start_id:03d}",
+            id="",
             location=req.id,
             category="Incompleteness",
             severity="Low",
@@ -579,49 +1037,89 @@ def _check_completeness(req: RequirementRaw, start_id: int) -> List[QualityIssue
             recommended_fix="Specify who performs the action and what the system does",
             status="Identified"
         ))
-        start_id += 1
     
     return issues
 
 
-def _validate_consistency(requirements: List[RequirementRaw], start_id: int) -> List[QualityIssue]:
-    """Validate consistency across requirements."""
-    issues = []
-    
-    # Check for duplicate titles
+def _duplicate_title_pairs(
+    requirements: List[RequirementRaw],
+    only: Optional[Iterable[int]] = None
+) -> List[Tuple[int, int]]:
+    """(first, repeat) positions of each requirement whose title repeats an earlier one."""
+    pairs = []
     titles = {}
-    for req in requirements:
+    for position, req in enumerate(requirements):
         if req.title in titles:
-            issues.append(QualityIssue(
-                id=f"QA-{start_id:03d}",
-                location=f"{titles[req.title]}, {req.id}",
-                category="Inconsistency",
-                severity="Medium",
-                description=f"Duplicate requirement title: '{req.title}'",
-                recommended_fix="Merge duplicate requirements or differentiate titles",
-                status="Identified"
-            ))
-            start_id += 1
+            pairs.append((titles[req.title], position))
         else:
-            titles[req.title] = req.id
-    
-    # Check for contradictions (simple keyword-based)
+            titles[req.title] = position
+    if only is not None:
+        only = set(only)
+        pairs = [(i, j) for i, j in pairs if i in only or j in only]
+    return pairs
+
+
+def _duplicate_title_issue(req1: RequirementRaw, req2: RequirementRaw, context: RuleContext) -> List[QualityIssue]:
+    """Issue for a requirement repeating an earlier one's title."""
+    return [QualityIssue(
+        id="",
+        location=f"{req1.id}, {req2.id}",
+        category="Inconsistency",
+        severity="Medium",
+        description=f"Duplicate requirement title: '{req2.title}'",
+        recommended_fix="Merge duplicate requirements or differentiate titles",
+        status="Identified"
+    )]
+
+
+def _near_duplicate_pairs(
+    requirements: List[RequirementRaw],
+    only: Optional[Iterable[int]] = None
+) -> List[Tuple[int, int]]:
+    """(original, flagged) positions of each requirement flagged as resembling another when added."""
+    positions = {req.id: position for position, req in enumerate(requirements)}
+    pairs = [
+        (positions[req.duplicate_of], position)
+        for position, req in enumerate(requirements)
+        if req.duplicate_of in positions
+    ]
+    if only is not None:
+        only = set(only)
+        pairs = [(i, j) for i, j in pairs if i in only or j in only]
+    return pairs
+
+
+def _near_duplicate_issue(req1: RequirementRaw, req2: RequirementRaw, context: RuleContext) -> List[QualityIssue]:
+    """Issue for a requirement that closely resembles an earlier one."""
+    return [QualityIssue(
+        id="",
+        location=f"{req1.id}, {req2.id}",
+        category="Inconsistency",
+        severity="Medium",
+        description=f"Possible duplicate: '{req2.title}' closely resembles {req1.id}",
+        recommended_fix="Merge the requirements if they ask for the same thing, or reword them to make the difference explicit",
+        status="Identified"
+    )]
+
+
+def _conflict_issue(req1: RequirementRaw, req2: RequirementRaw, context: RuleContext) -> List[QualityIssue]:
+    """Issue for a potential conflict between two requirements."""
     # This is a simplified check - real implementation would use NLP
-    for i, req1 in enumerate(requirements):
-        for req2 in requirements[i+1:]:
-            if _are_potentially_conflicting(req1, req2):
-                issues.append(QualityIssue(
-                    id=f"QA-{start_id:03d}",
-                    location=f"{req1.id}, {req2.id}",
-                    category="Inconsistency",
-                    severity="High",
-                    description=f"Potential conflict detected between requirements",
-                    recommended_fix="Review requirements for contradictions and resolve",
-                    status="Identified"
-                ))
-                start_id += 1
-    
-    return issues
+    return [QualityIssue(
+        id="",
+        location=f"{req1.id}, {req2.id}",
+        category="Inconsistency",
+        severity="High",
+        description="Potential conflict detected between requirements",
+        recommended_fix="Review requirements for contradictions and resolve",
+        status="Identified"
+    )]
+
+
+# Words marking a requirement as negated, and how many description words two
+# requirements must share (more than this) before a negation mismatch counts
+_NEGATIONS = frozenset({'not', 'no', 'never', 'cannot', 'must not', 'shall not'})
+_CONFLICT_MIN_OVERLAP = 5
 
 
 def _are_potentially_conflicting(req1: RequirementRaw, req2: RequirementRaw) -> bool:
@@ -633,45 +1131,100 @@ def _are_potentially_conflicting(req1: RequirementRaw, req2: RequirementRaw) ->
     overlap = words1 & words2
     
     # If significant overlap and one has negation, might be conflict
-    if len(overlap) > 5:
-        negations = {'not', 'no', 'never', 'cannot', 'must not', 'shall not'}
-        has_negation_1 = bool(words1 & negations)
-        has_negation_2 = bool(words2 & negations)
+    if len(overlap) > _CONFLICT_MIN_OVERLAP:
+        has_negation_1 = bool(words1 & _NEGATIONS)
+        has_negation_2 = bool(words2 & _NEGATIONS)
         
         return has_negation_1 != has_negation_2
     
     return False
 
 
-def _check_testability(
-    req: RequirementRaw,
-    user_stories: Optional[List[UserStory]],
-    start_id: int
-) -> List[QualityIssue]:
+def _find_conflicting_pairs(
+    requirements: List[RequirementRaw],
+    only: Optional[Iterable[int]] = None
+) -> List[Tuple[int, int]]:
+    """Index pairs (i < j) for which _are_potentially_conflicting holds, in order.
+    
+    Equivalent to testing every pair, without doing so. Each description is
+    split into words once. Only pairs where exactly one side is negated can
+    conflict, so negated requirements are only compared with non-negated
+    ones, and only when they share a word from their prefix filters: with
+    words ordered rarest first, two sets sharing more than
+    _CONFLICT_MIN_OVERLAP words must share one of the first
+    len(set) - _CONFLICT_MIN_OVERLAP words of each.
+    
+    Args:
+        requirements: Requirements to check
+        only: If given, positions of requirements to check against all
+            others; pairs not involving any of them are not reported
+    """
+    word_sets = [set(req.description.lower().split()) for req in requirements]
+    
+    # Sets too small to reach the overlap can never conflict
+    candidates = [i for i, words in enumerate(word_sets) if len(words) > _CONFLICT_MIN_OVERLAP]
+    negated = {i for i in candidates if word_sets[i] & _NEGATIONS}
+    if not negated or len(negated) == len(candidates):
+        return []
+    
+    frequency: Dict[str, int] = {}
+    for i in candidates:
+        for word in word_sets[i]:
+            frequency[word] = frequency.get(word, 0) + 1
+    
+    def prefix(i: int) -> List[str]:
+        words = sorted(word_sets[i], key=lambda word: (frequency[word], word))
+        return words[:len(words) - _CONFLICT_MIN_OVERLAP]
+    
+    if only is None:
+        # Index the smaller side, probe with the other
+        plain = [i for i in candidates if i not in negated]
+        side = sorted(negated)
+        indexed, probing = (side, plain) if len(side) <= len(plain) else (plain, side)
+    else:
+        # Probe with the requirements asked about, against everything
+        only = set(only)
+        indexed, probing = candidates, [i for i in candidates if i in only]
+    
+    postings: Dict[str, List[int]] = {}
+    for i in indexed:
+        for word in prefix(i):
+            postings.setdefault(word, []).append(i)
+    
+    pairs = set()
+    for j in probing:
+        words = word_sets[j]
+        seen = set()
+        for word in prefix(j):
+            for i in postings.get(word, ()):
+                if i not in seen and (i in negated) != (j in negated):
+                    seen.add(i)
+                    if len(words & word_sets[i]) > _CONFLICT_MIN_OVERLAP:
+                        pairs.add((min(i, j), max(i, j)))
+    
+    return sorted(pairs)
+
+
+def _check_testability(req: RequirementRaw, context: RuleContext) -> List[QualityIssue]:
     """Check if requirement is testable."""
     issues = []
     
     # Check if requirement has corresponding user story with acceptance criteria
-    if user_stories:
-        has_story = any(story.requirement_id == req.id for story in user_stories)
-        
-        if not has_story:
-            issues.append(QualityIssue(
-                id=f"QA-{start_id:03d}",
-                location=req.id,
-                category="Untestable",
-                severity="Medium",
-                description="No user story with acceptance criteria for this requirement",
-                recommended_fix="Create user story with testable acceptance criteria",
-                status="Identified"
-            ))
-            start_id += 1
+    if context.has_story(req.id) is False:
+        issues.append(QualityIssue(
+            id="",
+            location=req.id,
+            category="Untestable",
+            severity="Medium",
+            description="No user story with acceptance criteria for this requirement",
+            recommended_fix="Create user story with testable acceptance criteria",
+            status="Identified"
+        ))
     
     # Check for measurable criteria
-    measurable_keywords = ['number', 'count', 'time', 'seconds', 'minutes', 'percent', '%', 'rate']
-    if req.type == "Non-Functional" and not any(kw in req.description.lower() for kw in measurable_keywords):
+    if req.type == "Non-Functional" and _keywords_in(req.description).isdisjoint(_MEASURABLE_KEYWORDS):
         issues.append(QualityIssue(
-            id=f"QA-{start_id:03d}",
+            id="",
             location=req.id,
             category="Untestable",
             severity="High",
@@ -679,11 +1232,22 @@ def _check_testability(
             recommended_fix="Add specific metrics (e.g., response time < 200ms, uptime > 99.9%)",
             status="Identified"
         ))
-        start_id += 1
     
     return issues
 
 
+# Checks run by validate_requirements_quality, in report order; register
+# more rules here to have them run (and cached) with the built-in ones
+QUALITY_RULES = QualityRuleRegistry([
+    QualityRule("ambiguity", "requirement", _detect_ambiguity),
+    QualityRule("completeness", "requirement", _check_completeness),
+    QualityRule("duplicate-title", "pair", _duplicate_title_issue, candidates=_duplicate_title_pairs),
+    QualityRule("near-duplicate", "pair", _near_duplicate_issue, candidates=_near_duplicate_pairs),
+    QualityRule("conflict", "pair", _conflict_issue, candidates=_find_conflicting_pairs, incremental=True),
+    QualityRule("testability", "requirement", _check_testability, uses_stories=True),
+])
+
+
 # ============================================================================
 # Prioritization Agent Tools
 # ============================================================================
@@ -844,7 +1408,7 @@ def _apply_kano(requirements: List[RequirementRaw], inputs: Dict[str, Any]) -> P
             # Default classification logic
             if req.type in ["Constraint", "Non-Functional"]:
                 category = "Must-haves"
-            elif "should" in req.description.lower():
+            elif "should" in _keywords_in(req.description):
                 category = "Performance"
             else:
                 category = "Delighters"
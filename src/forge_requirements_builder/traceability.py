@@ -0,0 +1,195 @@
+"""Requirement Traceability Index for Forge Requirements Builder
+
+Keeps the links between a project's requirements, user stories and quality
+issues as lookup tables, so that "which stories cover REQ-012?", "which
+requirement is STORY-040 for?" and "which issues are open on REQ-012?"
+are answered without scanning the story or issue lists:
+
+- stories: requirement ID -> story IDs, in story order
+- requirements: story ID -> requirement ID
+- issues: requirement ID -> issue IDs, in issue order
+
+An issue is traced to each requirement named in its location (a pair
+issue to both), and an issue located on a story to that story's
+requirement.
+
+The index is a plain JSON-compatible dict stored in the project state
+(traceability), so it is saved and restored with serialize_state. It is
+updated per story and per issue: link_story()/unlink_story() and
+link_issue()/unlink_issue() touch only the entries of that one ID, and
+sync() compares the state's lists with the index by ID and applies just
+those deltas, so a sync after a node that changed a few stories or issues
+updates a few entries instead of rebuilding the tables.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+
+from .state import QualityIssue, UserStory
+
+# Bump when the tables change shape; indexes of another version are rebuilt
+TRACEABILITY_VERSION = 2
+
+
+class TraceabilityIndex:
+    """Requirement/story/issue links over a JSON-compatible dict, updated in place.
+
+    Example:
+        trace = TraceabilityIndex.for_state(state)
+        trace.stories_for("REQ-012")   # ["STORY-012", "STORY-031"]
+        trace.requirement_for("STORY-031")  # "REQ-012"
+        trace.issues_for("REQ-012")    # ["QA-004"]
+    """
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None):
+        """Wrap an index dict (a new one if data is None or from another version).
+
+        Args:
+            data: Index dict to read and update in place
+        """
+        self.data = {} if data is None else data
+        if self.data.get("version") != TRACEABILITY_VERSION:
+            self.data.clear()
+            self.data.update({
+                "version": TRACEABILITY_VERSION,
+                "stories": {},
+                "requirements": {},
+                "issues": {},
+                "issue_locations": {},
+                # issue ID -> requirement IDs it was filed under, so it can be
+                # unlinked even after the stories it names have moved
+                "issue_requirements": {},
+                # location part (requirement or story ID) -> issue IDs, to find
+                # the issues to re-link when a story moves
+                "issues_at": {}
+            })
+
+    @classmethod
+    def for_state(cls, state: Dict[str, Any]) -> "TraceabilityIndex":
+        """Index stored in state["traceability"], synced with the state's stories and issues."""
+        index = cls(state.setdefault("traceability", {}))
+        index.sync(state.get("user_stories") or [], state.get("quality_issues") or [])
+        return index
+
+    def sync(self, user_stories: Iterable[UserStory], quality_issues: Iterable[QualityIssue]) -> bool:
+        """Bring the index in step with the current stories and issues.
+
+        Only stories and issues that were added, removed, or whose
+        requirement or location changed are re-linked (plus the issues
+        located on a re-linked story).
+
+        Returns:
+            Whether any link changed
+        """
+        moved = set()
+        links = {story.id: story.requirement_id for story in user_stories}
+        current = self.data["requirements"]
+        if links != current:
+            for story_id in [story_id for story_id in current if story_id not in links]:
+                self.unlink_story(story_id)
+                moved.add(story_id)
+            for story_id, requirement_id in links.items():
+                if current.get(story_id) != requirement_id:
+                    self.link_story(story_id, requirement_id)
+                    moved.add(story_id)
+
+        changed = bool(moved)
+        locations = {issue.id: issue.location for issue in quality_issues}
+        current = self.data["issue_locations"]
+        if locations != current:
+            changed = True
+            for issue_id in [issue_id for issue_id in current if issue_id not in locations]:
+                self.unlink_issue(issue_id)
+            for issue_id, location in locations.items():
+                if current.get(issue_id) != location:
+                    self.link_issue(issue_id, location)
+
+        # Issues located on a moved story follow it to its new requirement
+        for story_id in moved:
+            for issue_id in list(self.data["issues_at"].get(story_id, ())):
+                self.link_issue(issue_id, self.data["issue_locations"][issue_id])
+        return changed
+
+    def link_story(self, story_id: str, requirement_id: str) -> None:
+        """Record (or move) a user story under its requirement."""
+        self.unlink_story(story_id)
+        self.data["requirements"][story_id] = requirement_id
+        self.data["stories"].setdefault(requirement_id, []).append(story_id)
+
+    def unlink_story(self, story_id: str) -> None:
+        """Forget a user story, if known."""
+        requirement_id = self.data["requirements"].pop(story_id, None)
+        if requirement_id is not None:
+            _remove(self.data["stories"], requirement_id, story_id)
+
+    def link_issue(self, issue_id: str, location: str) -> None:
+        """Record (or move) a quality issue under the requirements at its location."""
+        self.unlink_issue(issue_id)
+        self.data["issue_locations"][issue_id] = location
+        for part in _location_parts(location):
+            self.data["issues_at"].setdefault(part, []).append(issue_id)
+        requirement_ids = self._requirements_at(location)
+        self.data["issue_requirements"][issue_id] = requirement_ids
+        for requirement_id in requirement_ids:
+            self.data["issues"].setdefault(requirement_id, []).append(issue_id)
+
+    def unlink_issue(self, issue_id: str) -> None:
+        """Forget a quality issue, if known."""
+        location = self.data["issue_locations"].pop(issue_id, None)
+        if location is None:
+            return
+        for part in _location_parts(location):
+            _remove(self.data["issues_at"], part, issue_id)
+        for requirement_id in self.data["issue_requirements"].pop(issue_id, ()):
+            _remove(self.data["issues"], requirement_id, issue_id)
+
+    def _requirements_at(self, location: str) -> List[str]:
+        """Requirement IDs an issue location refers to (stories mapped to their requirement)."""
+        found = []
+        for part in _location_parts(location):
+            requirement_id = self.data["requirements"].get(part, part)
+            if requirement_id not in found:
+                found.append(requirement_id)
+        return found
+
+    def stories_for(self, requirement_id: str) -> List[str]:
+        """IDs of the user stories written for a requirement."""
+        return list(self.data["stories"].get(requirement_id, ()))
+
+    def has_story(self, requirement_id: str) -> bool:
+        """Whether a requirement has at least one user story."""
+        return requirement_id in self.data["stories"]
+
+    def requirement_for(self, story_id: str) -> Optional[str]:
+        """ID of the requirement a user story is for."""
+        return self.data["requirements"].get(story_id)
+
+    def issues_for(self, requirement_id: str) -> List[str]:
+        """IDs of the quality issues raised on a requirement."""
+        return list(self.data["issues"].get(requirement_id, ()))
+
+    def story_requirement_ids(self) -> List[str]:
+        """IDs of the requirements that have a user story."""
+        return list(self.data["stories"])
+
+    def matrix(self, requirement_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Traceability matrix rows: each requirement with its story and issue IDs."""
+        return [
+            {"requirement_id": requirement_id, "stories": self.stories_for(requirement_id), "issues": self.issues_for(requirement_id)}
+            for requirement_id in requirement_ids
+        ]
+
+
+def _location_parts(location: str) -> List[str]:
+    """The IDs named in an issue location ("REQ-001, REQ-004" -> both)."""
+    return [part for part in (part.strip() for part in location.split(",")) if part]
+
+
+def _remove(table: Dict[str, List[str]], key: str, value: str) -> None:
+    """Remove value from table[key], dropping the key once its list is empty."""
+    values = table.get(key)
+    if values is None:
+        return
+    if value in values:
+        values.remove(value)
+    if not values:
+        del table[key]
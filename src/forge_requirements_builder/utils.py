@@ -10,6 +10,8 @@ from typing import List, Dict, Callable, Any, Optional
 from functools import wraps
 import re
 
+from .tokens import count_tokens, truncate_to_tokens
+
 
 # ============================================================================
 # Content Type Detection
@@ -180,6 +182,57 @@ class ConversationHistoryManager:
                 formatted.append(f"[{role.upper()}]: {content}")
         
         return "\n".join(formatted)
+    
+    @staticmethod
+    def messages_to_fold(
+        history: List[dict],
+        summarized_count: int,
+        recent_messages: int = 10,
+        block_size: int = 10
+    ) -> Optional[tuple]:
+        """Find the block of messages that has aged out of the verbatim window.
+        
+        Messages are folded into the summary a whole block at a time, so the
+        summary is only regenerated once at least block_size messages sit
+        between the summarized head and the last recent_messages.
+        
+        Args:
+            history: Current conversation history
+            summarized_count: Leading messages already covered by the summary
+            recent_messages: Messages always kept verbatim
+            block_size: Minimum number of aged-out messages worth folding
+            
+        Returns:
+            (start, end) slice of history to fold, or None if nothing is due
+        """
+        end = len(history) - recent_messages
+        if end - summarized_count < max(1, block_size):
+            return None
+        return summarized_count, end
+    
+    @staticmethod
+    def compact(
+        history: List[dict],
+        summarized_count: int,
+        retain: int
+    ) -> tuple:
+        """Drop summarized messages from the head of history beyond retain.
+        
+        Only messages already covered by the summary are dropped, so no
+        context is lost from the prompt.
+        
+        Args:
+            history: Current conversation history
+            summarized_count: Leading messages already covered by the summary
+            retain: Number of messages to keep (0 keeps everything)
+            
+        Returns:
+            (compacted history, updated summarized_count)
+        """
+        if retain <= 0 or len(history) <= retain:
+            return history, summarized_count
+        drop = min(len(history) - retain, summarized_count)
+        return history[drop:], summarized_count - drop
 
 
 # ============================================================================
@@ -343,6 +396,22 @@ class FallbackHandler:
 # Text Processing Utilities
 # ============================================================================
 
+def estimate_tokens(text: str, chars_per_token: float = 4.0) -> int:
+    """Estimate how many tokens text will use in an LLM prompt.
+    
+    Uses the real tokenizer when one is available (see tokens.count_tokens).
+    
+    Args:
+        text: Text to measure
+        chars_per_token: Approximate characters per token, used when no
+            tokenizer is available
+        
+    Returns:
+        Token count
+    """
+    return count_tokens(text, chars_per_token=chars_per_token)
+
+
 def truncate_for_context(
     text: str,
     max_tokens: int = 4000,
@@ -350,21 +419,19 @@ def truncate_for_context(
 ) -> str:
     """Truncate text to fit within token limit for LLM context.
     
+    Cuts at the nearest paragraph, line or sentence break rather than
+    mid-sentence (see tokens.truncate_to_tokens).
+    
     Args:
         text: Text to truncate
         max_tokens: Maximum number of tokens
-        chars_per_token: Approximate characters per token
+        chars_per_token: Approximate characters per token, used when no
+            tokenizer is available
         
     Returns:
         Truncated text with indicator if truncated
     """
-    max_chars = int(max_tokens * chars_per_token)
-    
-    if len(text) <= max_chars:
-        return text
-    
-    truncated = text[:max_chars]
-    return truncated + "\n\n[... content truncated for length ...]"
+    return truncate_to_tokens(text, max_tokens, chars_per_token=chars_per_token)
 
 
 def extract_requirements_count(text: str) -> int:
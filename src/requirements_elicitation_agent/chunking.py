@@ -0,0 +1,168 @@
+"""
+Document chunking for map-reduce requirement extraction.
+
+Splits a document into chunks that each fit one extraction call, breaking
+at headings and paragraphs where possible and repeating a little context
+across chunk boundaries. Requirements extracted from the chunks are then
+merged, dropping the duplicates the overlap produces.
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Pattern, Sequence, Tuple
+
+from forge_requirements_builder.tokens import count_tokens
+
+# A new block starts after a blank line or at a Markdown heading
+_BLOCK_START = re.compile(r'\n[^\S\n]*\n|\n(?=#{1,6}[ \t])')
+_HEADING = re.compile(r'\s*#{1,6}[ \t]')
+# Fallbacks for blocks larger than a chunk
+_LINE_START = re.compile(r'\n')
+_SENTENCE_START = re.compile(r'(?<=[.!?])\s+')
+
+
+@dataclass(frozen=True)
+class DocumentChunk:
+    """A slice of a document, with its character offsets in the original."""
+
+    index: int
+    start: int
+    end: int
+    text: str
+
+
+@dataclass(frozen=True)
+class _Piece:
+    start: int
+    end: int
+    tokens: int
+    heading: bool = False
+
+
+def _spans(text: str, pattern: Pattern, start: int, end: int) -> List[Tuple[int, int]]:
+    """Split text[start:end] into contiguous spans, each starting at a pattern match end."""
+    cuts = [start]
+    cuts.extend(m.end() for m in pattern.finditer(text, start, end) if start < m.end() < end)
+    cuts.append(end)
+    return [(a, b) for a, b in zip(cuts, cuts[1:]) if a < b]
+
+
+def _split_oversized(
+    text: str,
+    start: int,
+    end: int,
+    max_tokens: int,
+    model: Optional[str],
+    patterns: Sequence[Pattern] = (_LINE_START, _SENTENCE_START)
+) -> List[_Piece]:
+    """Break a block larger than max_tokens at lines, then sentences, then characters."""
+    for position, pattern in enumerate(patterns):
+        spans = _spans(text, pattern, start, end)
+        if len(spans) > 1:
+            pieces = []
+            for a, b in spans:
+                tokens = count_tokens(text[a:b], model)
+                if tokens <= max_tokens:
+                    pieces.append(_Piece(a, b, tokens))
+                else:
+                    pieces.extend(_split_oversized(text, a, b, max_tokens, model, patterns[position + 1:]))
+            return pieces
+
+    # No natural break left: cut at an estimated character width, with some headroom
+    tokens = count_tokens(text[start:end], model)
+    step = max(1, int((end - start) * max_tokens * 0.9 / tokens))
+    return [
+        _Piece(a, min(a + step, end), count_tokens(text[a:min(a + step, end)], model))
+        for a in range(start, end, step)
+    ]
+
+
+def _overlap_tail(pieces: List[_Piece], overlap_tokens: int) -> List[_Piece]:
+    """Trailing pieces of a chunk, up to overlap_tokens in total."""
+    tail, total = [], 0
+    for piece in reversed(pieces):
+        if total + piece.tokens > overlap_tokens:
+            break
+        tail.insert(0, piece)
+        total += piece.tokens
+    return tail
+
+
+def split_document(
+    text: str,
+    max_tokens: int,
+    overlap_tokens: int = 0,
+    model: Optional[str] = None
+) -> List[DocumentChunk]:
+    """Split a document into chunks of at most max_tokens.
+
+    Chunks are built from whole paragraphs; a heading starts a new chunk
+    once the current one is half full. Paragraphs larger than a chunk are
+    split at line breaks, then sentences, then characters. Each chunk after
+    the first repeats up to overlap_tokens of trailing paragraphs from the
+    previous one, so requirements that straddle a boundary are seen whole.
+
+    Args:
+        text: Document content
+        max_tokens: Token limit per chunk
+        overlap_tokens: Context repeated from the previous chunk
+        model: Model used for counting
+
+    Returns:
+        Chunks in document order (empty for a blank document)
+    """
+    if not text.strip():
+        return []
+
+    pieces: List[_Piece] = []
+    for start, end in _spans(text, _BLOCK_START, 0, len(text)):
+        tokens = count_tokens(text[start:end], model)
+        if tokens <= max_tokens:
+            pieces.append(_Piece(start, end, tokens, bool(_HEADING.match(text, start))))
+        else:
+            pieces.extend(_split_oversized(text, start, end, max_tokens, model))
+
+    groups: List[List[_Piece]] = []
+    current: List[_Piece] = []
+    current_tokens = 0
+    for piece in pieces:
+        full = current_tokens + piece.tokens > max_tokens
+        at_section = piece.heading and current_tokens >= max_tokens // 2
+        if current and (full or at_section):
+            groups.append(current)
+            current = _overlap_tail(current, min(overlap_tokens, max_tokens - piece.tokens))
+            current_tokens = sum(p.tokens for p in current)
+        current.append(piece)
+        current_tokens += piece.tokens
+    if current:
+        groups.append(current)
+
+    return [
+        DocumentChunk(index=i, start=group[0].start, end=group[-1].end, text=text[group[0].start:group[-1].end])
+        for i, group in enumerate(groups)
+    ]
+
+
+def normalize_description(description: str) -> str:
+    """Comparison key for requirement text: case, spacing and end punctuation ignored."""
+    return " ".join(description.lower().split()).rstrip(".!;: ")
+
+
+def merge_chunk_results(results: Iterable[Tuple[DocumentChunk, list]]) -> List[Tuple[object, DocumentChunk]]:
+    """Merge per-chunk extractions in document order, dropping repeats.
+
+    Args:
+        results: (chunk, extracted requirements) pairs, in any order
+
+    Returns:
+        (requirement, chunk) pairs ordered by chunk, each requirement kept
+        at the first chunk it was extracted from
+    """
+    merged, seen = [], set()
+    for chunk, requirements in sorted(results, key=lambda result: result[0].index):
+        for requirement in requirements:
+            key = normalize_description(requirement.description)
+            if key and key not in seen:
+                seen.add(key)
+                merged.append((requirement, chunk))
+    return merged
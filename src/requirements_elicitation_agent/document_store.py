@@ -0,0 +1,128 @@
+"""
+In-memory document store for uploaded documents.
+
+Document content is kept in process memory under a content-addressed
+handle ("sha256:<hex>"), and only the handle travels through graph state.
+doc_reader and doc_extractor share the one copy read at upload time, and
+concurrent sessions uploading same-named documents cannot overwrite each
+other, because handles are derived from content rather than names.
+
+Entries are reference counted: each put() takes a reference and each
+release() drops one. Entries nobody releases (e.g. a declined upload) are
+evicted least recently used first once the store exceeds its byte budget.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+# Most bytes of document text kept in memory across all sessions
+DOCUMENT_STORE_MAX_BYTES = int(float(os.getenv("FORGE_DOCUMENT_STORE_MB", "256")) * 1024 * 1024)
+
+HANDLE_PREFIX = "sha256:"
+
+
+@dataclass
+class _Entry:
+    text: str
+    size: int
+    references: int
+
+
+def document_handle(text: str) -> str:
+    """Content-addressed handle for document text."""
+    return HANDLE_PREFIX + hashlib.sha256(text.encode("utf-8", errors="surrogatepass")).hexdigest()
+
+
+class DocumentStore:
+    """Thread-safe, reference-counted store of document text by content hash."""
+
+    def __init__(self, max_bytes: int = DOCUMENT_STORE_MAX_BYTES):
+        """Initialize the store.
+
+        Args:
+            max_bytes: Size (UTF-8 bytes) above which unreleased entries are
+                evicted, least recently used first
+        """
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def put(self, text: str) -> str:
+        """Store text (or take another reference to identical text).
+
+        Returns:
+            The handle to pass through state and to get()/release()
+        """
+        handle = document_handle(text)
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                entry = _Entry(text=text, size=len(text.encode("utf-8", errors="surrogatepass")), references=0)
+                self._entries[handle] = entry
+                self._size += entry.size
+            entry.references += 1
+            self._entries.move_to_end(handle)
+            self._evict(keep=handle)
+        return handle
+
+    def get(self, handle: Optional[str]) -> Optional[str]:
+        """Return the text for handle, or None if it is unknown or was evicted."""
+        if not handle:
+            return None
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return None
+            self._entries.move_to_end(handle)
+            return entry.text
+
+    def release(self, handle: Optional[str]) -> None:
+        """Drop one reference to handle, removing the text when none are left."""
+        if not handle:
+            return
+        with self._lock:
+            entry = self._entries.get(handle)
+            if entry is None:
+                return
+            entry.references -= 1
+            if entry.references <= 0:
+                del self._entries[handle]
+                self._size -= entry.size
+
+    def clear(self) -> None:
+        """Remove every document."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        """Return entry count and total size in bytes."""
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._size}
+
+    def _evict(self, keep: str) -> None:
+        # Oldest first; the document just stored is never evicted
+        while self._size > self.max_bytes and len(self._entries) > 1:
+            handle = next(iter(self._entries))
+            if handle == keep:
+                break
+            entry = self._entries.pop(handle)
+            self._size -= entry.size
+
+
+_document_store: Optional[DocumentStore] = None
+_document_store_lock = threading.Lock()
+
+
+def get_document_store() -> DocumentStore:
+    """Return the process-wide document store, creating it on first use."""
+    global _document_store
+    with _document_store_lock:
+        if _document_store is None:
+            _document_store = DocumentStore()
+        return _document_store
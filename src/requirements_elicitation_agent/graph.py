@@ -57,6 +57,10 @@ def router(state: AgentState) -> Literal["initializer", "doc_reader", "doc_extra
         if any(re.search(pattern, content_lower) for pattern in output_patterns):
             return "output_generator"
     
+    # Documents uploaded by content go to the reader whatever the phase
+    if isinstance(last_message, HumanMessage) and state.get("uploaded_document"):
+        return "doc_reader"
+    
     # Route based on current phase
     if current_phase == "init":
         if not messages or len(messages) <= 1:
@@ -0,0 +1,273 @@
+"""
+Pooled LLM clients for the requirements elicitation agent.
+
+Keeps one chat model per (model, temperature) for the life of the process
+(ChatOpenAI unless FORGE_LLM_BACKEND selects an offline backend). All
+instances share a single HTTP connection pool, so keep-alive connections
+survive across node calls instead of paying a new TLS handshake per call.
+
+Environment configuration is read once and only re-read on an explicit
+reload_llm_config().
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from forge_requirements_builder.llm_backend import create_chat_model, llm_backend
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LLMPoolConfig:
+    """Snapshot of the environment settings the client registry uses."""
+
+    api_key: Optional[str]
+    backend: str
+    model: str
+    temperature: float
+    base_url: Optional[str]
+    max_connections: int
+    max_keepalive_connections: int
+    keepalive_expiry: float
+    timeout: float
+
+    @classmethod
+    def from_env(cls) -> "LLMPoolConfig":
+        """Read settings from environment variables.
+
+        Raises:
+            ValueError: If OPENAI_API_KEY is not set and the backend
+                (FORGE_LLM_BACKEND) calls OpenAI.
+        """
+        backend = llm_backend()
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key and backend in ("openai", "record"):
+            raise ValueError(
+                "OPENAI_API_KEY not found. Please set it in your .env file or environment variables."
+            )
+        return cls(
+            api_key=api_key,
+            backend=backend,
+            model=os.getenv("OPENAI_MODEL", "gpt-4o"),
+            temperature=float(os.getenv("OPENAI_TEMPERATURE", "0.7")),
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            max_connections=int(os.getenv("FORGE_LLM_POOL_MAX_CONNECTIONS", "20")),
+            max_keepalive_connections=int(os.getenv("FORGE_LLM_POOL_MAX_KEEPALIVE", "10")),
+            keepalive_expiry=float(os.getenv("FORGE_LLM_POOL_KEEPALIVE_EXPIRY", "30")),
+            timeout=float(os.getenv("FORGE_LLM_TIMEOUT", "60")),
+        )
+
+
+class _ConnectionPools:
+    """The sync and async HTTP pools shared by one generation of clients.
+
+    Every client built on the pools is counted as a borrower until it is
+    garbage collected. Once the registry retires the pools (on reload) and
+    the last borrower is gone, both pools are closed, so clients handed out
+    earlier keep working for as long as someone holds them.
+    """
+
+    def __init__(self, config: LLMPoolConfig):
+        limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        )
+        timeout = httpx.Timeout(config.timeout)
+        self.http_client = httpx.Client(limits=limits, timeout=timeout)
+        self.async_http_client = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self._lock = threading.Lock()
+        self._borrowers = 0
+        self._retired = False
+
+    def lend(self, client: BaseChatModel) -> None:
+        """Count client as a borrower until it is garbage collected."""
+        with self._lock:
+            self._borrowers += 1
+        weakref.finalize(client, self._release)
+
+    def retire(self) -> None:
+        """Close the pools once no borrower is left (now, if there is none)."""
+        with self._lock:
+            self._retired = True
+            idle = self._borrowers == 0
+        if idle:
+            self.close()
+
+    def _release(self) -> None:
+        with self._lock:
+            self._borrowers -= 1
+            idle = self._retired and self._borrowers == 0
+        if idle:
+            self.close()
+
+    def close(self) -> None:
+        """Close both pools."""
+        self.http_client.close()
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            try:
+                asyncio.run(self.async_http_client.aclose())
+            except Exception as e:
+                logger.debug(f"Closing retired async HTTP pool failed: {e}")
+        else:
+            # Called from async code: close on its loop without blocking it
+            task = asyncio.ensure_future(self.async_http_client.aclose())
+            _closing_tasks.add(task)
+            task.add_done_callback(_closing_tasks.discard)
+
+
+# Pending async pool closes, kept referenced until they finish
+_closing_tasks: set = set()
+
+
+class LLMClientRegistry:
+    """Process-wide registry of chat model clients sharing one connection pool."""
+
+    def __init__(self, config: Optional[LLMPoolConfig] = None):
+        """Initialize the registry.
+
+        Args:
+            config: Settings to use. Defaults to reading the environment
+                lazily on first use.
+        """
+        self._lock = threading.Lock()
+        self._config = config
+        self._pools: Optional[_ConnectionPools] = None
+        self._clients: Dict[Tuple[str, float], BaseChatModel] = {}
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def config(self) -> LLMPoolConfig:
+        """Current settings, read from the environment on first access."""
+        if self._config is None:
+            with self._lock:
+                if self._config is None:
+                    self._config = LLMPoolConfig.from_env()
+        return self._config
+
+    def get(self, model: Optional[str] = None, temperature: Optional[float] = None) -> BaseChatModel:
+        """Return the shared client for (model, temperature), creating it once.
+
+        Args:
+            model: Model name. Defaults to OPENAI_MODEL.
+            temperature: Sampling temperature. Defaults to OPENAI_TEMPERATURE.
+        """
+        config = self.config
+        key = (model or config.model, config.temperature if temperature is None else float(temperature))
+        client = self._clients.get(key)
+        if client is not None:
+            self._hits += 1
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                if config.backend in ("replay", "fake"):
+                    # Offline backends make no HTTP calls
+                    client = create_chat_model(key[0], key[1], backend=config.backend)
+                else:
+                    if self._pools is None:
+                        self._pools = _ConnectionPools(config)
+                    client = create_chat_model(
+                        key[0],
+                        key[1],
+                        backend=config.backend,
+                        api_key=config.api_key,
+                        base_url=config.base_url,
+                        http_client=self._pools.http_client,
+                        http_async_client=self._pools.async_http_client,
+                    )
+                    self._pools.lend(client)
+                self._clients[key] = client
+                self._misses += 1
+            else:
+                self._hits += 1
+        return client
+
+    def reload(self, config: Optional[LLMPoolConfig] = None) -> LLMPoolConfig:
+        """Re-read settings and start over with a fresh pool and client set.
+
+        Clients handed out before the reload keep working with the old
+        settings; the old sync and async pools are closed once the last of
+        those clients is garbage collected.
+
+        Args:
+            config: Settings to use instead of reading the environment.
+        """
+        new_config = config or LLMPoolConfig.from_env()
+        with self._lock:
+            old_pools = self._pools
+            self._config = new_config
+            self._clients = {}
+            self._pools = None
+            self._hits = 0
+            self._misses = 0
+        if old_pools is not None:
+            old_pools.retire()
+        return new_config
+
+    def stats(self) -> dict:
+        """Return registry counters and connection pool usage."""
+        config = self._config
+        stats = {
+            "clients": [{"model": model, "temperature": temperature} for model, temperature in self._clients],
+            "hits": self._hits,
+            "misses": self._misses,
+            "limits": None,
+            "connections": _pool_connection_stats(self._pools.http_client if self._pools else None),
+        }
+        if config is not None:
+            stats["limits"] = {
+                "max_connections": config.max_connections,
+                "max_keepalive_connections": config.max_keepalive_connections,
+                "keepalive_expiry": config.keepalive_expiry,
+            }
+        return stats
+
+
+def _pool_connection_stats(http_client: Optional[httpx.Client]) -> dict:
+    """Count open and idle connections in an httpx client's pool."""
+    pool = getattr(getattr(http_client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []))
+    idle = sum(1 for connection in connections if connection.is_idle())
+    return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+
+
+# Global registry instance
+_registry: Optional[LLMClientRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_client_registry() -> LLMClientRegistry:
+    """Get the global LLMClientRegistry instance, creating it if necessary."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LLMClientRegistry()
+    return _registry
+
+
+def get_pooled_llm(model: Optional[str] = None, temperature: Optional[float] = None) -> BaseChatModel:
+    """Return the shared chat model client for (model, temperature)."""
+    return get_client_registry().get(model, temperature)
+
+
+def reload_llm_config() -> LLMPoolConfig:
+    """Re-read LLM environment settings and rebuild the client pool."""
+    return get_client_registry().reload()
+
+
+def get_pool_stats() -> dict:
+    """Return client registry and connection pool statistics."""
+    return get_client_registry().stats()
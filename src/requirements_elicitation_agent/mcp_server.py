@@ -16,6 +16,7 @@ from mcp.server.fastmcp import FastMCP
 from langchain_core.messages import HumanMessage, AIMessage
 
 from .graph import create_graph
+from .document_store import get_document_store
 
 # Timeout configuration (in seconds)
 TOOL_TIMEOUT = 120  # 2 minutes max per tool call
@@ -231,18 +232,15 @@ def _register_tools(server: FastMCP) -> None:
         
         @with_timeout(TOOL_TIMEOUT)
         def _execute():
-            import tempfile
-            
             graph, config = _sessions[session_id]
             
-            # Create a temporary file for the agent to process
-            temp_dir = Path(tempfile.gettempdir())
-            temp_path = temp_dir / document_name
-            with open(temp_path, "w", encoding="utf-8") as f:
-                f.write(document_content)
-            
-            file_message = f"I uploaded a file: {temp_path}"
-            state = {"messages": [HumanMessage(content=file_message)]}
+            # Hand the content to the graph through the in-memory store
+            handle = get_document_store().put(document_content)
+            file_message = f"I uploaded a file: {document_name}"
+            state = {
+                "messages": [HumanMessage(content=file_message)],
+                "uploaded_document": {"handle": handle, "name": document_name}
+            }
             
             response_text = ""
             for event in graph.stream(state, config, stream_mode="values"):
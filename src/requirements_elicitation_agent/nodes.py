@@ -5,27 +5,45 @@ Implements all nodes defined in plan.md Section 4, with persona behaviors
 from persona.md integrated throughout.
 """
 
-import re
 import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Literal, Optional
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
-from langchain_openai import ChatOpenAI
+from forge_requirements_builder.cache import with_response_cache
+from forge_requirements_builder.tokens import TokenBudget, context_window, count_tokens
 
 from .state import AgentState, Requirement, TodoItem
 from .tools import read_file, RecordRequirement, DocumentSummary, RequirementExtraction, MultipleRequirements
+from .llm_pool import get_pooled_llm
+from .chunking import DocumentChunk, split_document, merge_chunk_results
+from .document_store import get_document_store
 from .persona_loader import load_greeting, load_interviewer_prompt, load_recorder_prompt, load_gap_analyzer_prompt, load_doc_extractor_prompt
 
+# Token budgets for the prompt parts the nodes assemble
+HISTORY_MAX_TOKENS = int(os.getenv("FORGE_HISTORY_MAX_TOKENS", "800"))
+REQUIREMENTS_SUMMARY_MAX_TOKENS = int(os.getenv("FORGE_REQUIREMENTS_SUMMARY_MAX_TOKENS", "4000"))
+DOC_SUMMARY_MAX_TOKENS = int(os.getenv("FORGE_DOC_SUMMARY_MAX_TOKENS", "1500"))
+# Tokens held back for the structured extraction response
+EXTRACTION_OUTPUT_TOKENS = int(os.getenv("FORGE_EXTRACTION_OUTPUT_TOKENS", "4096"))
+# Documents are extracted in chunks of this size, several at a time, so no
+# single call has to fit the whole document or finish within the tool timeout
+EXTRACTION_CHUNK_TOKENS = int(os.getenv("FORGE_EXTRACTION_CHUNK_TOKENS", "6000"))
+EXTRACTION_CHUNK_OVERLAP_TOKENS = int(os.getenv("FORGE_EXTRACTION_CHUNK_OVERLAP_TOKENS", "200"))
+EXTRACTION_MAX_CONCURRENCY = int(os.getenv("FORGE_EXTRACTION_CONCURRENCY", "4"))
 
-def get_llm():
-    """Get or create LLM instance lazily."""
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError(
-            "OPENAI_API_KEY not found. Please set it in your .env file or environment variables."
-        )
-    model = os.getenv("OPENAI_MODEL", "gpt-4o")  # Default to gpt-4o if not specified
-    temperature = float(os.getenv("OPENAI_TEMPERATURE", "0.7"))
-    return ChatOpenAI(model=model, temperature=temperature)
+
+def get_llm(temperature: Optional[float] = None):
+    """Get the shared, pooled LLM client for the configured model.
+    
+    Clients are reused across calls (see llm_pool); environment changes
+    take effect after reload_llm_config().
+    
+    Args:
+        temperature: Overrides OPENAI_TEMPERATURE (structured extraction
+            calls use 0, so their answers can be served from FORGE_LLM_CACHE)
+    """
+    return get_pooled_llm(temperature=temperature)
 
 
 def initializer(state: AgentState) -> dict:
@@ -43,12 +61,19 @@ def initializer(state: AgentState) -> dict:
     if not current_phase or (len(messages) == 1 and isinstance(messages[0], HumanMessage)):
         greeting = load_greeting()
         
+        # The fields below are cleared, so any documents they hold are released
+        store = get_document_store()
+        store.release((state.get("uploaded_document") or {}).get("handle"))
+        store.release(state.get("pending_document"))
+        
         return {
             "messages": [AIMessage(content=greeting)],
             "current_phase": "init",
             "requirements": [],
             "todo_list": [],
             "clarification_counts": {},
+            "uploaded_document": None,
+            "pending_document": None,
             "pending_file_path": None,
             "pending_risk_warning": None,
             "pending_paraphrase": None,
@@ -72,6 +97,13 @@ def interviewer(state: AgentState) -> dict:
     messages = state.get("messages", [])
     user_expertise = state.get("user_expertise", None)
     
+    # Routed here from analysis_confirm: the user declined extraction, so
+    # the document awaiting confirmation is dropped
+    declined = {}
+    if state.get("current_phase") == "analysis_confirm":
+        get_document_store().release(state.get("pending_document"))
+        declined = {"pending_document": None, "pending_file_path": None, "current_phase": "elicitation"}
+    
     # Seed todo list if empty - FOCUS on functional requirements from user perspective first
     if not todo_list:
         todo_list = [
@@ -99,7 +131,7 @@ I think we've explored the main areas. Would you like to:
 - **Move forward** with what we have
 
 What would you like to do?"""
-        return {"messages": [AIMessage(content=completion_message)]}
+        return {"messages": [AIMessage(content=completion_message)], **declined}
     
     current_topic = pending_topics[0]["topic"]
     
@@ -129,15 +161,22 @@ What would you like to do?"""
         breadcrumb=breadcrumb
     )
     
-    # Get previous context for adaptive questioning
+    # Get previous context for adaptive questioning, keeping the most recent turns
     recent_messages = messages[-4:] if len(messages) >= 4 else messages
     context_str = "\n".join([
-        f"{'AI' if isinstance(m, AIMessage) else 'Human'}: {m.content[:200]}"
+        f"{'AI' if isinstance(m, AIMessage) else 'Human'}: {m.content}"
         for m in recent_messages
     ])
+    llm = get_llm()
+    parts = (
+        TokenBudget(context_window(llm.model_name), llm.model_name)
+        .add("system", system_prompt, priority=100)
+        .add("history", context_str, priority=10, max_tokens=HISTORY_MAX_TOKENS, keep="end")
+        .fit()
+    )
     
     user_prompt = f"""Recent conversation:
-{context_str}
+{parts["history"]}
 
 Generate your question about {current_topic}. Remember to:
 - {breadcrumb}
@@ -145,15 +184,16 @@ Generate your question about {current_topic}. Remember to:
 - Match the user's expertise level
 - Be encouraging and patient"""
     
-    response = get_llm().invoke([
-        SystemMessage(content=system_prompt),
+    response = llm.invoke([
+        SystemMessage(content=parts["system"]),
         HumanMessage(content=user_prompt)
     ])
     
     return {
         "messages": [AIMessage(content=response.content)],
         "current_phase": "elicitation",
-        "todo_list": todo_list
+        "todo_list": todo_list,
+        **declined
     }
 
 
@@ -243,8 +283,9 @@ def requirement_recorder(state: AgentState) -> dict:
         clarification_count=clarification_counts.get('total', 0)
     )
     
-    # Use structured output for multiple requirements
-    structured_llm = get_llm().with_structured_output(MultipleRequirements)
+    # Use structured output for multiple requirements (deterministic, so cacheable)
+    llm = get_llm(temperature=0)
+    structured_llm = with_response_cache(llm).with_structured_output(MultipleRequirements)
     
     try:
         result: MultipleRequirements = structured_llm.invoke([
@@ -447,13 +488,20 @@ def gap_analyzer(state: AgentState) -> dict:
         req_summary = "\n".join([f"- {r['description']}" for r in requirements])
         
         prompt_template = load_gap_analyzer_prompt()
-        system_prompt = prompt_template.format(
-            standard_domains=', '.join(standard_domains),
-            requirements=req_summary
-        )
         
         try:
-            response = get_llm().invoke([SystemMessage(content=system_prompt)])
+            llm = get_llm()
+            parts = (
+                TokenBudget(context_window(llm.model_name), llm.model_name)
+                .add("template", prompt_template, priority=100)
+                .add("requirements", req_summary, priority=10, max_tokens=REQUIREMENTS_SUMMARY_MAX_TOKENS)
+                .fit()
+            )
+            system_prompt = prompt_template.format(
+                standard_domains=', '.join(standard_domains),
+                requirements=parts["requirements"]
+            )
+            response = llm.invoke([SystemMessage(content=system_prompt)])
             covered_domains = []
             for line in response.content.split('\n'):
                 if ':' in line:
@@ -490,7 +538,8 @@ def doc_reader(state: AgentState) -> dict:
     Ref: Plan Section 4.6, Persona Directive #9
     Task: 3.8
     
-    Validates document relevance before extraction.
+    Validates document relevance before extraction. The document is read
+    once into the document store; doc_extractor reuses that copy.
     """
     messages = state.get("messages", [])
     
@@ -501,30 +550,50 @@ def doc_reader(state: AgentState) -> dict:
     if not isinstance(last_message, HumanMessage):
         return {}
     
-    # Extract file path from message
-    file_path_match = re.search(r'file:///(.+?)(?:\s|$)', last_message.content)
-    if not file_path_match:
-        # Try "I uploaded a file: <path>" pattern
-        file_path_match = re.search(r'(?:uploaded\s+a\s+file|file):\s*(.+?\.(?:txt|md|pdf|docx))(?:\s|$)', 
-                                   last_message.content, re.IGNORECASE)
-    if not file_path_match:
-        # Try other patterns
-        file_path_match = re.search(r'(?:uploaded?|file|analyze|read)\s+(.+?\.(?:txt|md|pdf|docx))(?:\s|$)', 
-                                   last_message.content, re.IGNORECASE)
-    
-    if not file_path_match:
-        return {}
-    
-    file_path = file_path_match.group(1).strip()
+    store = get_document_store()
+    uploaded = state.get("uploaded_document")
     
-    # Read file
-    content = read_file.invoke({"file_path": file_path})
-    
-    if content.startswith("Error"):
-        return {"messages": [AIMessage(content=content)]}
+    if uploaded:
+        # Content was handed over directly; nothing to read from disk
+        file_path = uploaded["name"]
+        handle = uploaded["handle"]
+        content = store.get(handle)
+        if content is None:
+            return {
+                "messages": [AIMessage(content=f"Error: The content of {file_path} is no longer available. Please upload it again.")],
+                "uploaded_document": None
+            }
+    else:
+        # Extract file path from message
+        file_path_match = re.search(r'file:///(.+?)(?:\s|$)', last_message.content)
+        if not file_path_match:
+            # Try "I uploaded a file: <path>" pattern
+            file_path_match = re.search(r'(?:uploaded\s+a\s+file|file):\s*(.+?\.(?:txt|md|pdf|docx))(?:\s|$)', 
+                                       last_message.content, re.IGNORECASE)
+        if not file_path_match:
+            # Try other patterns
+            file_path_match = re.search(r'(?:uploaded?|file|analyze|read)\s+(.+?\.(?:txt|md|pdf|docx))(?:\s|$)', 
+                                       last_message.content, re.IGNORECASE)
+        
+        if not file_path_match:
+            return {}
+        
+        file_path = file_path_match.group(1).strip()
+        
+        # Read file
+        content = read_file.invoke({"file_path": file_path})
+        
+        if content.startswith("Error"):
+            return {"messages": [AIMessage(content=content)]}
+        
+        handle = store.put(content)
     
     # Generate summary and validate relevance (Directive #9)
-    structured_llm = get_llm().with_structured_output(DocumentSummary)
+    llm = get_llm(temperature=0)
+    structured_llm = with_response_cache(llm).with_structured_output(DocumentSummary)
+    
+    # The opening of the document is enough to judge what it is about
+    excerpt = TokenBudget(DOC_SUMMARY_MAX_TOKENS, llm.model_name).add("document", content).fit()["document"]
     
     try:
         summary: DocumentSummary = structured_llm.invoke([
@@ -534,7 +603,7 @@ def doc_reader(state: AgentState) -> dict:
 3. The document type (meeting notes, technical spec, email, user story, etc.)
 
 Keep the summary natural and concise."""),
-            HumanMessage(content=f"Document content:\n{content[:2000]}")  # First 2000 chars
+            HumanMessage(content=f"Document content:\n{excerpt}")
         ])
         
         # Ask for confirmation (Directive #9)
@@ -543,15 +612,21 @@ Keep the summary natural and concise."""),
 Should I extract requirements from this document?
 (Reply 'yes' to proceed, or 'no' to skip)"""
         
+        # A document still awaiting confirmation is replaced by this one
+        store.release(state.get("pending_document"))
+        
         return {
             "messages": [AIMessage(content=confirmation_msg)],
+            "uploaded_document": None,
+            "pending_document": handle,
             "pending_file_path": file_path,
             "current_phase": "analysis_confirm"
         }
         
     except Exception as e:
+        store.release(handle)
         error_msg = f"I had trouble analyzing that document. Could you confirm it's a text file? (Error: {str(e)})"
-        return {"messages": [AIMessage(content=error_msg)]}
+        return {"messages": [AIMessage(content=error_msg)], "uploaded_document": None}
 
 
 def doc_extractor(state: AgentState) -> dict:
@@ -560,67 +635,121 @@ def doc_extractor(state: AgentState) -> dict:
     Ref: Plan Section 4.7, Persona Directives #10, #11
     Task: 3.9
     
-    Extracts atomic requirements with source attribution.
+    Extracts atomic requirements with source attribution. The document is
+    split into overlapping chunks that are extracted concurrently and then
+    merged, so its size is not bounded by one call's context or latency.
     """
     pending_file_path = state.get("pending_file_path")
+    pending_document = state.get("pending_document")
     requirements = state.get("requirements", [])
     
     if not pending_file_path:
         return {}
     
-    # Read file content
-    content = read_file.invoke({"file_path": pending_file_path})
+    filename = pending_file_path.split('/')[-1].split('\\')[-1]
+    
+    # Use the copy doc_reader stored. Never go back to the filesystem for
+    # it: for uploads, pending_file_path is a client-supplied name
+    store = get_document_store()
+    content = store.get(pending_document)
+    store.release(pending_document)
+    if content is None and pending_document:
+        return {
+            "messages": [AIMessage(content=f"The document {filename} has expired. Please upload it again.")],
+            "pending_document": None,
+            "pending_file_path": None,
+            "current_phase": "elicitation"
+        }
+    if content is None:
+        content = read_file.invoke({"file_path": pending_file_path})
     
     if content.startswith("Error"):
         return {
             "messages": [AIMessage(content=content)],
+            "pending_document": None,
             "pending_file_path": None
         }
     
     # Extract requirements atomically (Directive #10)
-    structured_llm = get_llm().with_structured_output(RequirementExtraction)
+    llm = get_llm(temperature=0)
+    structured_llm = with_response_cache(llm).with_structured_output(RequirementExtraction)
     
     prompt_template = load_doc_extractor_prompt()
     system_prompt = prompt_template
     
-    try:
-        extraction: RequirementExtraction = structured_llm.invoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=f"Document content:\n{content}")
-        ])
-        
-        # Create requirement objects with source attribution (Directive #11)
-        filename = pending_file_path.split('/')[-1].split('\\')[-1]
-        new_reqs = []
-        
-        for idx, req in enumerate(extraction.requirements):
-            req_id = f"REQ-{len(requirements) + idx + 1:03d}"
-            new_req: Requirement = {
-                "id": req_id,
-                "description": req.description,
-                "category": req.category,
-                "tags": [],
-                "source": f"File: {filename}"  # Directive #11
-            }
-            new_reqs.append(new_req)
-        
-        updated_reqs = requirements + new_reqs
-        
-        summary_msg = f"I extracted {len(new_reqs)} requirements from {filename}."
-        
-        return {
-            "messages": [AIMessage(content=summary_msg)],
-            "requirements": updated_reqs,
-            "pending_file_path": None,
-            "current_phase": "elicitation"
+    # Chunks must leave room for the system prompt and the response
+    chunk_tokens = min(
+        EXTRACTION_CHUNK_TOKENS,
+        context_window(llm.model_name) - count_tokens(system_prompt, llm.model_name) - EXTRACTION_OUTPUT_TOKENS
+    )
+    chunks = split_document(content, chunk_tokens, EXTRACTION_CHUNK_OVERLAP_TOKENS, llm.model_name)
+    
+    # Map: extract every chunk concurrently
+    results = []
+    failures = []
+    with ThreadPoolExecutor(max_workers=max(1, min(EXTRACTION_MAX_CONCURRENCY, len(chunks)))) as executor:
+        futures = {
+            executor.submit(_extract_chunk, structured_llm, system_prompt, chunk, len(chunks)): chunk
+            for chunk in chunks
         }
-        
-    except Exception as e:
-        error_msg = f"I had trouble extracting requirements from that document. (Error: {str(e)})"
+        for future in as_completed(futures):
+            chunk = futures[future]
+            try:
+                results.append((chunk, future.result().requirements))
+            except Exception as e:
+                failures.append((chunk, e))
+    
+    if failures and not results:
+        error_msg = f"I had trouble extracting requirements from that document. (Error: {str(failures[0][1])})"
         return {
             "messages": [AIMessage(content=error_msg)],
+            "pending_document": None,
             "pending_file_path": None
         }
+    
+    # Reduce: merge in document order, dropping repeats from overlapping chunks
+    new_reqs = []
+    
+    for idx, (req, chunk) in enumerate(merge_chunk_results(results)):
+        req_id = f"REQ-{len(requirements) + idx + 1:03d}"
+        source = f"File: {filename}"  # Directive #11
+        if len(chunks) > 1:
+            source += f" (chars {chunk.start}-{chunk.end})"
+        new_req: Requirement = {
+            "id": req_id,
+            "description": req.description,
+            "category": req.category,
+            "tags": [],
+            "source": source
+        }
+        new_reqs.append(new_req)
+    
+    updated_reqs = requirements + new_reqs
+    
+    summary_msg = f"I extracted {len(new_reqs)} requirements from {filename}."
+    if failures:
+        skipped = ", ".join(f"{chunk.start}-{chunk.end}" for chunk, _ in sorted(failures, key=lambda f: f[0].index))
+        summary_msg += f" Some parts of the document could not be analyzed (characters {skipped}); you may want to upload them again."
+    
+    return {
+        "messages": [AIMessage(content=summary_msg)],
+        "requirements": updated_reqs,
+        "pending_document": None,
+        "pending_file_path": None,
+        "current_phase": "elicitation"
+    }
+
+
+def _extract_chunk(structured_llm, system_prompt: str, chunk: DocumentChunk, chunk_count: int) -> RequirementExtraction:
+    """Extract requirements from one document chunk."""
+    if chunk_count == 1:
+        header = "Document content:"
+    else:
+        header = f"Document content (part {chunk.index + 1} of {chunk_count}, characters {chunk.start}-{chunk.end}):"
+    return structured_llm.invoke([
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=f"{header}\n{chunk.text}")
+    ])
 
 
 def output_generator(state: AgentState) -> dict:
@@ -36,6 +36,17 @@ class TodoItem(TypedDict):
     status: Literal["pending", "covered", "skipped"]
 
 
+class UploadedDocument(TypedDict):
+    """Document content handed to the graph directly instead of as a file path.
+    
+    Attributes:
+        handle: Document store handle of the content (see document_store)
+        name: Document name, used for source attribution
+    """
+    handle: str
+    name: str
+
+
 class AgentState(TypedDict):
     """Main agent state schema.
     
@@ -48,6 +59,8 @@ class AgentState(TypedDict):
         requirements: List of all captured requirements (append-only)
         todo_list: Topics to cover during gap analysis
         clarification_counts: Tracks clarification attempts per topic (max 3)
+        uploaded_document: Document uploaded by content, not yet read by doc_reader
+        pending_document: Document store handle of the file awaiting confirmation
         pending_file_path: File awaiting user confirmation for analysis
         pending_risk_warning: Risk warning awaiting user response
         user_expertise: Detected user expertise level for adaptive communication
@@ -64,6 +77,8 @@ class AgentState(TypedDict):
     clarification_counts: Dict[str, int]  # topic_key -> attempt count (max 3)
     
     # Pending state
+    uploaded_document: Optional[UploadedDocument]  # Content upload awaiting doc_reader
+    pending_document: Optional[str]       # Store handle of the file awaiting confirmation
     pending_file_path: Optional[str]      # File awaiting confirmation
     pending_risk_warning: Optional[str]   # Risk warning awaiting user response
     pending_paraphrase: Optional[dict]    # Paraphrased requirement awaiting confirmation
@@ -20,6 +20,8 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from src.requirements_elicitation_agent.graph import create_graph
+from src.requirements_elicitation_agent.document_store import get_document_store
+from forge_requirements_builder.text_reader import BinaryFileError, decode_text
 
 
 # Page configuration (Task 5.1)
@@ -148,21 +150,29 @@ with st.sidebar:
 
 # Handle file upload (Task 5.4)
 if uploaded_file and uploaded_file.name not in st.session_state.processed_files:
-    # Save file temporarily using cross-platform temp directory
-    import tempfile
-    temp_dir = Path(tempfile.gettempdir())
-    temp_path = temp_dir / uploaded_file.name
-    with open(temp_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+    # Hand the content to the agent in memory (no temp file)
+    try:
+        upload = decode_text(uploaded_file.getvalue())
+    except BinaryFileError:
+        st.session_state.processed_files.add(uploaded_file.name)
+        st.session_state.messages.append({
+            "role": "assistant",
+            "content": f"I can only analyze text documents, and {uploaded_file.name} looks like a binary file."
+        })
+        st.rerun()
+    content = upload.text
+    if upload.truncated:
+        content += f"\n\n{upload.truncation_notice()}"
+    uploaded_document = {"handle": get_document_store().put(content), "name": uploaded_file.name}
     
     # Add file message
-    file_message = f"I uploaded a file: {temp_path}"
+    file_message = f"I uploaded a file: {uploaded_file.name}"
     st.session_state.messages.append({"role": "human", "content": file_message})
     st.session_state.processed_files.add(uploaded_file.name)
     
     # Process through agent
     config = {"configurable": {"thread_id": st.session_state.thread_id}}
-    state = {"messages": [HumanMessage(content=file_message)]}
+    state = {"messages": [HumanMessage(content=file_message)], "uploaded_document": uploaded_document}
     
     for event in st.session_state.graph.stream(state, config, stream_mode="values"):
         if "messages" in event and event["messages"]:
@@ -7,6 +7,7 @@ Implements tools defined in plan.md Section 5.
 from typing import Optional, Annotated
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
+from forge_requirements_builder.text_reader import read_text
 
 
 @tool
@@ -14,6 +15,8 @@ def read_file(file_path: Annotated[str, "The absolute path to the file to read"]
     """Read the contents of a file to extract requirements.
     
     Supports .txt, .md files. PDF and DOCX support are stretch goals.
+    The encoding is detected, and files larger than FORGE_MAX_TEXT_MB are
+    truncated with a note at the end instead of being loaded whole.
     
     Args:
         file_path: The absolute path to the file to read
@@ -26,13 +29,16 @@ def read_file(file_path: Annotated[str, "The absolute path to the file to read"]
         IOError: If the file cannot be read
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        return content
+        result = read_text(file_path)
     except FileNotFoundError:
         return f"Error: File not found at {file_path}"
     except Exception as e:
         return f"Error reading file: {str(e)}"
+    
+    # Oversized files are cut at FORGE_MAX_TEXT_MB rather than loaded whole
+    if result.truncated:
+        return f"{result.text}\n\n{result.truncation_notice()}"
+    return result.text
 
 
 class RecordRequirement(BaseModel):
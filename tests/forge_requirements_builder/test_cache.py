@@ -0,0 +1,242 @@
+"""Unit tests for the LLM response cache."""
+
+import time
+from typing import ClassVar
+import pytest
+from unittest.mock import patch
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+from langchain_core.messages import HumanMessage, SystemMessage
+from forge_requirements_builder.cache import (
+    LRUCache,
+    SQLiteCache,
+    TieredCache,
+    LLMResponseCache,
+    configure_llm_cache,
+    create_llm_cache,
+    with_response_cache,
+    create_extraction_cache,
+    file_digest,
+    make_cache_key
+)
+from forge_requirements_builder import nodes as forge_nodes
+from forge_requirements_builder.llm_backend import FakeChatModel
+from forge_requirements_builder.state import RequirementRaw
+from src.requirements_elicitation_agent import nodes as elicitation_nodes
+
+
+@pytest.fixture
+def llm_cache():
+    previous = configure_llm_cache()
+    cache = configure_llm_cache(LLMResponseCache(), force=True)
+    yield cache
+    configure_llm_cache(previous, force=True)
+
+
+class _CountingFakeModel(FakeChatModel):
+    """Fake model that opts into caching and counts the calls reaching it."""
+
+    cache: object = None
+    calls: ClassVar[list] = []
+
+    def _respond(self, messages, kwargs):
+        self.calls.append(messages)
+        return super()._respond(messages, kwargs)
+
+# ============================================================================
+# Storage Tiers
+# ============================================================================
+
+def test_lru_cache_evicts_least_recently_used():
+    """Test LRU tier keeps only the most recently used entries."""
+    cache = LRUCache(max_entries=2)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # touch a so b becomes LRU
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_lru_cache_ttl_expires_entries():
+    """Test expired entries are treated as misses."""
+    cache = LRUCache(ttl_seconds=0.05)
+    cache.set("a", "1")
+    assert cache.get("a") == "1"
+    time.sleep(0.1)
+    assert cache.get("a") is None
+
+
+def test_sqlite_cache_persists_across_instances(tmp_path):
+    """Test the persistent tier survives reopening the database."""
+    path = tmp_path / "cache.sqlite"
+    first = SQLiteCache(str(path))
+    first.set("key", "value")
+    first.close()
+
+    second = SQLiteCache(str(path))
+    assert second.get("key") == "value"
+
+
+def test_sqlite_cache_size_based_eviction(tmp_path):
+    """Test the persistent tier evicts least recently accessed entries when over budget."""
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite"), max_bytes=250)
+    cache.set("a", "x" * 100)
+    time.sleep(0.01)
+    cache.set("b", "y" * 100)
+    time.sleep(0.01)
+    cache.get("a")  # a is now more recently used than b
+    time.sleep(0.01)
+    cache.set("c", "z" * 100)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.total_bytes() <= 250
+
+
+def test_tiered_cache_promotes_persistent_hits(tmp_path):
+    """Test a persistent hit is copied into the memory tier."""
+    persistent = SQLiteCache(str(tmp_path / "cache.sqlite"))
+    persistent.set("key", "value")
+    cache = TieredCache(LRUCache(), persistent)
+
+    assert cache.get("key") == "value"
+    assert cache.memory.get("key") == "value"
+
+# ============================================================================
+# LangChain Integration
+# ============================================================================
+
+def test_llm_response_cache_serves_identical_prompts():
+    """Test a repeated prompt is answered from the cache, not the model."""
+    cache = LLMResponseCache()
+    model = FakeListChatModel(responses=["first", "second"], cache=cache)
+    messages = [SystemMessage(content="sys"), HumanMessage(content="hello")]
+
+    assert model.invoke(messages).content == "first"
+    assert model.invoke(messages).content == "first"
+    assert model.invoke([HumanMessage(content="different")]).content == "second"
+    assert cache.stats()["memory"]["hits"] == 1
+
+
+def test_llm_response_cache_key_includes_model_config():
+    """Test the same messages under a different model config are cached separately."""
+    cache = LLMResponseCache()
+    messages = [HumanMessage(content="hello")]
+
+    FakeListChatModel(responses=["a"], cache=cache).invoke(messages)
+    other = FakeListChatModel(responses=["b"], cache=cache)
+
+    assert other.invoke(messages).content == "b"
+
+
+def test_only_opted_in_models_use_the_llm_cache():
+    """Test the cache is never installed globally and only wraps models that opt in."""
+    from langchain_core.globals import get_llm_cache
+    import forge_requirements_builder.nodes  # noqa: F401 - importing a graph must not install a cache
+
+    previous = configure_llm_cache()
+    cache = configure_llm_cache(LLMResponseCache(), force=True)
+    try:
+        messages = [HumanMessage(content="hello")]
+        plain = FakeListChatModel(responses=["first", "second", "third"])
+        cached = with_response_cache(plain)
+
+        assert get_llm_cache() is None
+        assert [plain.invoke(messages).content for _ in range(2)] == ["first", "second"]
+        assert cached.invoke(messages).content == cached.invoke(messages).content
+        assert with_response_cache(FakeListChatModel(responses=["x"], cache=False)).cache is False
+    finally:
+        configure_llm_cache(previous, force=True)
+
+
+def test_deterministic_forge_calls_are_served_from_the_cache(llm_cache):
+    """Test story drafts and synthesis sections, streamed or not, repeat from the cache."""
+    _CountingFakeModel.calls = []
+    req = RequirementRaw(id="REQ-001", title="Export", description="Users must export reports", type="Functional", source="Test")
+    messages = [HumanMessage(content="Write section 1")]
+    streamed = []
+
+    with patch.object(forge_nodes, "llm", _CountingFakeModel(response_tokens=3)):
+        draft = forge_nodes._generate_story_data(req)
+        assert forge_nodes._generate_story_data(req) == draft
+        assert len(_CountingFakeModel.calls) == 1
+
+        section = forge_nodes._generate_section(messages, on_token=streamed.append)
+        assert forge_nodes._generate_section(messages, on_token=streamed.append) == section
+        assert forge_nodes._generate_section(messages) == section
+        assert len(_CountingFakeModel.calls) == 2
+
+    assert section == "lorem lorem lorem"
+    assert "".join(streamed) == section * 2
+
+
+def test_elicitation_structured_calls_use_the_cache_at_temperature_0(llm_cache):
+    """Test the recorder's structured call runs at temperature 0 and repeats from the cache."""
+    _CountingFakeModel.calls = []
+    model = _CountingFakeModel()
+    state = {"messages": [HumanMessage(content="Users must export reports as CSV")], "requirements": []}
+
+    with patch.object(elicitation_nodes, "get_llm", return_value=model) as get_llm:
+        elicitation_nodes.requirement_recorder(dict(state))
+        elicitation_nodes.requirement_recorder(dict(state))
+
+    get_llm.assert_called_with(temperature=0)
+    assert len(_CountingFakeModel.calls) == 1
+
+
+def test_create_llm_cache_modes(tmp_path):
+    """Test cache factory modes."""
+    assert create_llm_cache("off") is None
+    assert create_llm_cache("memory").store.persistent is None
+
+    sqlite_cache = create_llm_cache("sqlite", path=str(tmp_path / "llm.sqlite"))
+    assert sqlite_cache.store.persistent is not None
+
+    with pytest.raises(ValueError):
+        create_llm_cache("redis")
+
+
+def test_make_cache_key_is_content_addressed():
+    """Test keys depend only on content and part boundaries."""
+    assert make_cache_key("a", "b") == make_cache_key("a", "b")
+    assert make_cache_key("a", "b") != make_cache_key("ab", "")
+
+# ============================================================================
+# Document Extraction Cache
+# ============================================================================
+
+def test_extraction_cache_persists_entries(tmp_path):
+    """Test extraction entries survive reopening the persistent tier."""
+    path = str(tmp_path / "extract.sqlite")
+    create_extraction_cache("sqlite", path=path).set("k", {"requirements": [{"title": "t"}], "metadata": {}})
+
+    assert create_extraction_cache("sqlite", path=path).get("k")["requirements"] == [{"title": "t"}]
+    assert create_extraction_cache("off") is None
+    with pytest.raises(ValueError):
+        create_extraction_cache("redis")
+
+
+def test_persistent_tier_defaults_to_user_cache_dir(tmp_path, monkeypatch):
+    """Test the SQLite file goes under the user cache directory, not the working directory."""
+    monkeypatch.delenv("FORGE_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "xdg"))
+    monkeypatch.chdir(tmp_path)
+
+    cache = create_extraction_cache("sqlite")
+
+    assert cache.store.persistent.path == tmp_path / "xdg" / "forge_requirements_builder" / "extraction_cache.sqlite"
+    assert not (tmp_path / ".forge_cache").exists()
+
+
+def test_file_digest_tracks_content(tmp_path):
+    """Test the digest depends on file content only."""
+    a, b = tmp_path / "a.txt", tmp_path / "b.txt"
+    a.write_bytes(b"x" * 3000)
+    b.write_bytes(b"x" * 3000)
+
+    assert file_digest(str(a), block_size=1024) == file_digest(str(b))
+    b.write_bytes(b"y")
+    assert file_digest(str(a)) != file_digest(str(b))
@@ -0,0 +1,143 @@
+"""Unit tests for near-duplicate requirement detection."""
+
+import json
+
+from forge_requirements_builder.dedup import (
+    NearDuplicateIndex,
+    minhash_signature,
+    requirement_text,
+    signature_similarity
+)
+from forge_requirements_builder.state import RequirementRaw, create_project_state, deserialize_state, serialize_state
+from forge_requirements_builder.tools import (
+    DocumentExtractionResult,
+    ExtractedRequirement,
+    merge_extracted_requirements,
+    validate_requirements_quality
+)
+
+
+def _extracted(title, description):
+    return ExtractedRequirement(title=title, description=description, type="Functional", source="notes.md")
+
+
+# ============================================================================
+# Signatures and Index
+# ============================================================================
+
+def test_rewordings_are_similar_and_different_asks_are_not():
+    """Test filler words and plurals do not change the signature, modals and negations do."""
+    reworded = signature_similarity(
+        minhash_signature("Users must be able to reset passwords"),
+        minhash_signature("Users must be able to reset their password.")
+    )
+    different = signature_similarity(
+        minhash_signature("Reports export to CSV"),
+        minhash_signature("Reports export to PDF")
+    )
+    weaker = signature_similarity(
+        minhash_signature("Users must reset passwords every 90 days"),
+        minhash_signature("Users may reset passwords every 90 days")
+    )
+
+    assert reworded == 1.0
+    assert different < 0.8
+    assert weaker < 1.0
+
+
+def test_index_finds_best_match_above_threshold():
+    """Test query returns the closest indexed entry, or None."""
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("REQ-001", "Encrypt all data at rest using AES-256")
+    index.add("REQ-002", "Export the audit log as CSV")
+
+    match = index.query("The platform encrypts data at rest with AES-256.")
+
+    assert match == ("REQ-001", 1.0)
+    assert index.query("Reports load within 2 seconds") is None
+
+
+def test_index_never_matches_negated_with_plain_requirement():
+    """Test a negation keeps otherwise identical requirements apart."""
+    index = NearDuplicateIndex(threshold=0.5)
+    index.add("REQ-001", "The system shall let administrators delete audit logs")
+
+    assert index.query("The system shall not let administrators delete audit logs") is None
+    assert index.query("The system shall let administrators delete the audit logs")[0] == "REQ-001"
+
+
+def test_exact_match_ignores_case_punctuation_and_spacing():
+    """Test only repeats of the same text are exact matches."""
+    index = NearDuplicateIndex()
+    index.add("REQ-001", "Email receipts. The system shall email receipts.")
+
+    assert index.exact_match("email receipts  the SYSTEM shall email receipts") == "REQ-001"
+    assert index.exact_match("Email receipts. The system should email receipts.") is None
+
+
+def test_index_round_trips_through_state_json():
+    """Test the index is saved with the state and re-synced by ID and content."""
+    state = create_project_state("Dedup", "Context")
+    merge_extracted_requirements(state, [DocumentExtractionResult(requirements=[
+        _extracted("Password reset", "Users must be able to reset passwords")
+    ])])
+
+    restored = deserialize_state(json.loads(json.dumps(serialize_state(state))))
+    index = NearDuplicateIndex.for_state(restored)
+    assert len(index) == 1
+    assert index.sync(restored["requirements_raw"]) is False
+
+    restored["requirements_raw"].append(RequirementRaw(
+        id="REQ-002", title="Audit export", description="Export the audit log as CSV",
+        type="Functional", source="import"
+    ))
+    index = NearDuplicateIndex.for_state(restored)
+    assert index.query(requirement_text("Audit log export", "Export audit logs as CSV"))[0] == "REQ-002"
+
+    # Same count, different content: the edited requirement is re-indexed
+    restored["requirements_raw"][1] = restored["requirements_raw"][1].model_copy(
+        update={"title": "Invoice archive", "description": "Archive invoices nightly"}
+    )
+    index = NearDuplicateIndex.for_state(restored)
+    assert index.query(requirement_text("Audit log export", "Export audit logs as CSV")) is None
+    assert index.query(requirement_text("Invoice archive", "Archive the invoices nightly"))[0] == "REQ-002"
+
+
+# ============================================================================
+# Merging Extracted Requirements
+# ============================================================================
+
+def test_merge_skips_repeats_and_flags_rewordings():
+    """Test exact repeats are skipped and rewordings are kept with duplicate_of set."""
+    state = create_project_state("Dedup", "Context")
+    merge_extracted_requirements(state, [DocumentExtractionResult(requirements=[
+        _extracted("Password reset", "Users must be able to reset passwords"),
+    ])])
+
+    added, skipped = merge_extracted_requirements(state, [DocumentExtractionResult(requirements=[
+        _extracted("Password reset", "Users must be able to reset their password."),
+        _extracted("Password reset", "users must be able to reset passwords!"),
+        _extracted("CSV export", "Reports export to CSV"),
+    ])])
+
+    assert (added, skipped) == (2, 1)
+    assert [(r.id, r.duplicate_of) for r in state["requirements_raw"]] == [
+        ("REQ-001", None), ("REQ-002", "REQ-001"), ("REQ-003", None)
+    ]
+    issues = validate_requirements_quality(state["requirements_raw"]).issues_found
+    assert [i.location for i in issues if i.description.startswith("Possible duplicate")] == ["REQ-001, REQ-002"]
+
+
+def test_merge_keeps_requirements_differing_in_format_or_negation():
+    """Test requirements that differ by one significant word are never dropped."""
+    state = create_project_state("Dedup", "Context")
+
+    added, skipped = merge_extracted_requirements(state, [DocumentExtractionResult(requirements=[
+        _extracted("Report export", "The system shall let users export the monthly sales report to PDF format"),
+        _extracted("Report export", "The system shall let users export the monthly sales report to CSV format"),
+        _extracted("Admin deletion", "The system shall let administrators delete user accounts and their data"),
+        _extracted("Admin deletion", "The system shall not let administrators delete user accounts and their data"),
+    ])])
+
+    assert (added, skipped) == (4, 0)
+    assert [r.duplicate_of for r in state["requirements_raw"]] == [None, "REQ-001", None, None]
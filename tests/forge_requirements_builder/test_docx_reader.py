@@ -0,0 +1,88 @@
+"""Unit tests for streaming DOCX text extraction."""
+
+import zipfile
+
+import pytest
+from docx import Document
+from forge_requirements_builder import tools
+from forge_requirements_builder.docx_reader import iter_docx_blocks
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+MC = 'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"'
+
+
+def _write_package(path, body, part="word/document.xml"):
+    """Write a ZIP package whose main part has the given w:body content."""
+    with zipfile.ZipFile(path, "w") as package:
+        package.writestr(part, f'<w:document {W} {MC}><w:body>{body}</w:body></w:document>')
+    return path
+
+
+@pytest.fixture
+def spec_docx(tmp_path):
+    """A DOCX with a table between two paragraphs."""
+    doc = Document()
+    doc.add_paragraph("Scope of the portal")
+    table = doc.add_table(rows=2, cols=2)
+    table.cell(0, 0).text = "ID"
+    table.cell(0, 1).text = "Requirement"
+    table.cell(1, 0).text = "R1"
+    table.cell(1, 1).text = "The system shall export reports."
+    doc.add_paragraph("Closing\tnotes")
+    path = tmp_path / "spec.docx"
+    doc.save(path)
+    return path
+
+
+def test_blocks_keep_document_order(spec_docx):
+    """Test table rows come out between the paragraphs around them."""
+    assert list(iter_docx_blocks(spec_docx)) == [
+        "Scope of the portal",
+        "ID | Requirement",
+        "R1 | The system shall export reports.",
+        "Closing\tnotes",
+    ]
+
+
+def test_blocks_match_python_docx_content(spec_docx):
+    """Test the streamed text is what python-docx reports, reordered."""
+    streamed = list(iter_docx_blocks(spec_docx))
+
+    assert sorted(streamed) == sorted(tools._iter_docx_blocks_python_docx(spec_docx))
+
+
+def test_tracked_changes_and_fallback_content(tmp_path):
+    """Test deletions and mc:Fallback duplicates are left out, insertions kept."""
+    path = _write_package(tmp_path / "tracked.docx", (
+        '<w:p><w:r><w:t>Users </w:t></w:r>'
+        '<w:del><w:r><w:delText>may</w:delText></w:r></w:del>'
+        '<w:ins><w:r><w:t>must</w:t></w:r></w:ins>'
+        '<w:r><w:t xml:space="preserve"> log in</w:t><w:br/><w:t>daily</w:t></w:r></w:p>'
+        '<w:p><mc:AlternateContent><mc:Choice><w:r><w:t>Shape</w:t></w:r></mc:Choice>'
+        '<mc:Fallback><w:r><w:t>Shape</w:t></w:r></mc:Fallback></mc:AlternateContent></w:p>'
+        '<w:p><w:r><w:t>  </w:t></w:r></w:p>'
+    ))
+
+    assert list(iter_docx_blocks(path)) == ["Users must log in\ndaily", "Shape"]
+
+
+def test_missing_main_part_falls_back_to_python_docx(tmp_path, monkeypatch):
+    """Test packages without word/document.xml are read with python-docx."""
+    path = _write_package(tmp_path / "odd.docx", "", part="word/document2.xml")
+    monkeypatch.setattr(tools, "_iter_docx_blocks_python_docx", lambda p: iter(["From python-docx"]))
+
+    with pytest.raises(KeyError):
+        iter_docx_blocks(path)
+    assert tools._extract_text_from_docx(path) == "From python-docx"
+
+
+def test_streamed_extraction_matches_full_text(spec_docx, monkeypatch):
+    """Test parsing streamed paragraphs finds what parsing the joined text does."""
+    monkeypatch.setattr(tools, "TEXT_BLOCK_CHARS", 10)
+
+    streamed = tools._extract_document(spec_docx, "docx", keep_text=False)["requirements"]
+    full = tools._extract_document(spec_docx, "docx", keep_text=True)["requirements"]
+
+    assert [r["description"] for r in streamed] == [r["description"] for r in full] == [
+        "The system shall export reports."
+    ]
@@ -1,8 +1,12 @@
 """Integration tests for the full workflow."""
 
+import asyncio
+import re
+import threading
 import pytest
 from unittest.mock import patch
-from forge_requirements_builder.graph import create_graph
+from langchain_core.messages import AIMessageChunk
+from forge_requirements_builder.graph import create_graph, stream_graph, astream_graph
 from forge_requirements_builder.state import RequirementRaw, create_project_state
 
 # ============================================================================
@@ -125,3 +129,150 @@ def test_full_workflow_happy_path(mock_llm_responses):
     except Exception as e:
         # If it hits recursion limit, check where it got
         pytest.fail(f"Graph execution failed: {e}")
+
+
+# ============================================================================
+# Synthesis Streaming
+# ============================================================================
+
+def _ready_for_synthesis_state():
+    state = create_project_state("Streaming Test", "Testing synthesis streaming")
+    state["requirements_raw"] = [RequirementRaw(
+        id="R1", title="Login", description="Users login", type="Functional", source="User"
+    )]
+    state["workflow_phase"] = "prioritization"
+    state["prioritization_complete"] = True
+    return state
+
+
+def _section_stream(messages):
+    """Streams 'Body <n>' for the section named in the prompt."""
+    number = re.search(r"SECTION: (\d+)\.", messages[1].content).group(1)
+    return iter([AIMessageChunk(content="Body "), AIMessageChunk(content=number)])
+
+
+def test_stream_graph_emits_synthesis_tokens(mock_llm_responses):
+    """Test synthesis tokens reach the caller in document order as they are produced."""
+    mock_llm_responses.stream.side_effect = _section_stream
+    tokens = []
+    
+    result = stream_graph(
+        create_graph(), _ready_for_synthesis_state(),
+        {"configurable": {"thread_id": "stream-thread"}}, tokens.append
+    )
+    
+    streamed = "".join(tokens)
+    assert streamed.startswith("# Requirements Specification Document: Streaming Test")
+    assert streamed.index("## 1. Executive Summary") < streamed.index("Body 1") < streamed.index("## 2. User Scenarios")
+    assert streamed + "\n" == result["final_deliverable"]
+    assert result["synthesis_complete"] == True
+    mock_llm_responses.invoke.assert_not_called()
+
+
+def _apply_stream():
+    """Callbacks collecting streamed text, with resets applied."""
+    text = []
+    
+    def on_reset(chars):
+        joined = "".join(text)
+        text[:] = [joined[:len(joined) - chars]]
+    
+    return text, text.append, on_reset
+
+
+def test_stream_graph_streams_the_first_section_live(mock_llm_responses):
+    """Test the first section's tokens reach the caller before that section has finished."""
+    first_token_seen = threading.Event()
+    live = []
+    
+    def slow_stream(messages):
+        number = re.search(r"SECTION: (\d+)\.", messages[1].content).group(1)
+        yield AIMessageChunk(content="Body ")
+        if number == "1":
+            live.append(first_token_seen.wait(timeout=5))
+        yield AIMessageChunk(content=number)
+    
+    def on_token(token):
+        if token == "Body ":
+            first_token_seen.set()
+    
+    mock_llm_responses.stream.side_effect = slow_stream
+    
+    result = stream_graph(
+        create_graph(), _ready_for_synthesis_state(),
+        {"configurable": {"thread_id": "live-thread"}}, on_token
+    )
+    
+    assert live == [True]
+    assert "Body 10" in result["final_deliverable"]
+
+
+def test_stream_graph_resets_partial_output_of_a_retried_live_section(mock_llm_responses):
+    """Test a live section failing mid-stream is retracted with a reset event, then retried."""
+    calls = []
+    resets = []
+    
+    def flaky_stream(messages):
+        number = re.search(r"SECTION: (\d+)\.", messages[1].content).group(1)
+        calls.append(number)
+        if number == "1" and calls.count("1") == 1:
+            yield AIMessageChunk(content="Partial ")
+            raise RuntimeError("connection reset")
+        yield from _section_stream(messages)
+    
+    mock_llm_responses.stream.side_effect = flaky_stream
+    text, on_token, on_reset = _apply_stream()
+    
+    result = stream_graph(
+        create_graph(), _ready_for_synthesis_state(),
+        {"configurable": {"thread_id": "flaky-live-thread"}}, on_token,
+        lambda chars: (resets.append(chars), on_reset(chars))
+    )
+    
+    assert calls.count("1") == 2
+    assert resets == [len("Partial ")]
+    assert "".join(text) + "\n" == result["final_deliverable"]
+    assert "## 1. Executive Summary & Overview\n\nBody 1" in result["final_deliverable"]
+
+
+def test_stream_graph_drops_tokens_of_failed_section_attempt(mock_llm_responses):
+    """Test a section failing mid-stream is retried and its partial tokens never survive in the stream."""
+    calls = []
+    
+    def flaky_stream(messages):
+        number = re.search(r"SECTION: (\d+)\.", messages[1].content).group(1)
+        calls.append(number)
+        if number == "3" and calls.count("3") == 1:
+            yield AIMessageChunk(content="Partial ")
+            raise RuntimeError("connection reset")
+        yield from _section_stream(messages)
+    
+    mock_llm_responses.stream.side_effect = flaky_stream
+    text, on_token, on_reset = _apply_stream()
+    
+    result = stream_graph(
+        create_graph(), _ready_for_synthesis_state(),
+        {"configurable": {"thread_id": "flaky-thread"}}, on_token, on_reset
+    )
+    
+    assert calls.count("3") == 2
+    assert "Partial" not in "".join(text)
+    assert "".join(text) + "\n" == result["final_deliverable"]
+    assert "## 3. Requirements (Master List)\n\nBody 3" in result["final_deliverable"]
+
+
+def test_astream_graph_awaits_token_callback(mock_llm_responses):
+    """Test the async runner forwards tokens to an async callback."""
+    mock_llm_responses.stream.side_effect = _section_stream
+    tokens = []
+    
+    async def on_token(token):
+        tokens.append(token)
+    
+    result = asyncio.run(astream_graph(
+        create_graph(), _ready_for_synthesis_state(),
+        {"configurable": {"thread_id": "astream-thread"}}, on_token
+    ))
+    
+    assert "".join(tokens) + "\n" == result["final_deliverable"]
+    assert "Body 10" in result["final_deliverable"]
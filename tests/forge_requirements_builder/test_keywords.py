@@ -0,0 +1,25 @@
+"""Unit tests for multi-pattern keyword matching."""
+
+import random
+
+from forge_requirements_builder.keywords import KeywordMatcher
+
+
+def test_find_reports_overlapping_and_nested_keywords():
+    """Test every occurring keyword is found, including ones inside others."""
+    matcher = KeywordMatcher(["fast", "response time", "time", "must", "must use", "%"])
+
+    assert matcher.find("Response TIME must be breakfast-fast, 99%") == {"fast", "response time", "time", "must", "%"}
+    assert matcher.find("nothing here") == frozenset()
+
+
+def test_find_matches_substring_search():
+    """Test the automaton agrees with `keyword in text.lower()` on random inputs."""
+    rng = random.Random(3)
+    for _ in range(500):
+        keywords = ["".join(rng.choice("ab c") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 10))]
+        text = "".join(rng.choice("abAB c") for _ in range(rng.randint(0, 30)))
+
+        expected = {keyword for keyword in keywords if keyword in text.lower()}
+
+        assert KeywordMatcher(keywords).find(text) == expected
@@ -0,0 +1,139 @@
+"""Unit tests for the pluggable chat-model backends."""
+
+import json
+import time
+import pytest
+from unittest.mock import patch
+from langchain_core.messages import HumanMessage, SystemMessage
+from forge_requirements_builder.llm_backend import (
+    FakeChatModel,
+    RecordingChatModel,
+    ReplayChatModel,
+    ReplayMissError,
+    create_chat_model
+)
+from forge_requirements_builder.nodes import _generate_story_data, authoring_node
+from forge_requirements_builder.state import RequirementRaw, create_project_state
+from forge_requirements_builder.tools import StoryDraft, StoryDraftBatch
+
+MESSAGES = [SystemMessage(content="You are helpful."), HumanMessage(content="Describe login.")]
+
+
+@pytest.fixture
+def cassette(tmp_path):
+    return str(tmp_path / "cassette.jsonl")
+
+# ============================================================================
+# Record / Replay
+# ============================================================================
+
+def test_record_then_replay_round_trip(cassette):
+    """Test recorded text and structured calls replay without the inner model."""
+    recorder = RecordingChatModel(inner=FakeChatModel(response_tokens=3), cassette_path=cassette, cache=False)
+    text = recorder.invoke(MESSAGES).content
+    draft = recorder.with_structured_output(StoryDraft).invoke(MESSAGES)
+
+    replay = ReplayChatModel(cassette_path=cassette, latency_ms=0)
+
+    assert replay.invoke(MESSAGES).content == text
+    assert replay.with_structured_output(StoryDraft).invoke(MESSAGES) == draft
+    assert "".join(chunk.content for chunk in replay.stream(MESSAGES)) == text
+
+
+def test_replay_repeats_in_recording_order(cassette):
+    """Test identical requests recorded twice replay their responses in order."""
+    recorder = RecordingChatModel(inner=FakeChatModel(response_tokens=1), cassette_path=cassette, cache=False)
+    recorder.invoke(MESSAGES)
+    recorder.inner = FakeChatModel(response_tokens=2)
+    recorder.invoke(MESSAGES)
+
+    replay = ReplayChatModel(cassette_path=cassette, latency_ms=0)
+
+    assert replay.invoke(MESSAGES).content == "lorem"
+    assert replay.invoke(MESSAGES).content == "lorem lorem"
+    assert replay.invoke(MESSAGES).content == "lorem lorem"
+
+
+def test_replay_miss_behaviour(cassette):
+    """Test unrecorded calls raise by default or fall back to fake responses."""
+    with pytest.raises(ReplayMissError):
+        ReplayChatModel(cassette_path=cassette).invoke(MESSAGES)
+
+    fallback = ReplayChatModel(cassette_path=cassette, on_miss="fake")
+    assert fallback.invoke(MESSAGES).content.startswith("lorem")
+
+# ============================================================================
+# Fake Backend and Factory
+# ============================================================================
+
+def test_fake_model_structured_output_satisfies_schema():
+    """Test fake tool calls carry every field, filled in."""
+    draft = FakeChatModel().with_structured_output(StoryDraft).invoke(MESSAGES)
+
+    assert isinstance(draft, StoryDraft)
+    assert draft.title and draft.story_statement
+
+
+def test_fake_model_answers_every_requirement_in_a_batch():
+    """Test a batch schema gets one item per requirement ID in the prompt."""
+    prompt = HumanMessage(content="[REQ-001]\nTitle: Login\n\n[REQ-007]\nTitle: Export\n")
+    batch = FakeChatModel().with_structured_output(StoryDraftBatch).invoke([prompt])
+
+    assert [draft.requirement_id for draft in batch.stories] == ["REQ-001", "REQ-007"]
+    assert all(draft.title and draft.story_statement for draft in batch.stories)
+
+
+def test_fake_model_returns_json_when_asked():
+    """Test plain calls asking for JSON get the prompt's example object back."""
+    prompt = HumanMessage(content='Output JSON format:\n{"title": "Story Title", "effort": "M"}')
+    content = FakeChatModel().invoke([prompt]).content
+
+    assert json.loads(content) == {"title": "Story Title", "effort": "M"}
+
+
+def test_fake_backend_runs_authoring_end_to_end():
+    """Test authoring_node writes a story per requirement on the fake backend."""
+    state = create_project_state("Offline", "Fake backend")
+    state["requirements_raw"] = [
+        RequirementRaw(id=f"REQ-{i:03d}", title=f"Capability {i}", description=f"The system shall manage item {i}.", type="Functional", source="Test")
+        for i in range(1, 6)
+    ]
+    state["discovery_complete"] = True
+
+    with patch("forge_requirements_builder.nodes.llm", FakeChatModel()):
+        result = authoring_node(state)
+        single = _generate_story_data(state["requirements_raw"][0])
+
+    assert [story.requirement_id for story in result["user_stories"]] == [f"REQ-{i:03d}" for i in range(1, 6)]
+    assert not result["authoring_failures"]
+    assert single["title"]
+
+
+def test_fake_model_simulates_latency_and_usage():
+    """Test configurable time-to-first-token and token counts."""
+    model = FakeChatModel(latency_ms=50, response_tokens=10)
+
+    started = time.perf_counter()
+    response = model.invoke(MESSAGES)
+
+    assert time.perf_counter() - started >= 0.05
+    assert len(response.content.split()) == 10
+    assert response.usage_metadata["output_tokens"] > 0
+
+
+def test_create_chat_model_backends(monkeypatch, cassette, tmp_path):
+    """Test the factory honours FORGE_LLM_BACKEND."""
+    monkeypatch.setenv("FORGE_LLM_CASSETTE", cassette)
+
+    monkeypatch.setenv("FORGE_LLM_BACKEND", "fake")
+    assert isinstance(create_chat_model(), FakeChatModel)
+
+    monkeypatch.setenv("FORGE_LLM_BACKEND", "replay")
+    assert isinstance(create_chat_model(), ReplayChatModel)
+
+    monkeypatch.delenv("FORGE_LLM_CASSETTE")
+    assert create_chat_model().cassette_path == str(tmp_path / "forge_cache" / "llm_cassette.jsonl")
+
+    monkeypatch.setenv("FORGE_LLM_BACKEND", "carrier-pigeon")
+    with pytest.raises(ValueError):
+        create_chat_model()
@@ -1,5 +1,7 @@
 """Unit tests for Graph Nodes."""
 
+import re
+import time
 import pytest
 import tempfile
 import os
@@ -187,6 +189,79 @@ def test_discovery_node_marks_complete(mock_llm):
     assert new_state["discovery_complete"] == True
 
 
+def test_discovery_node_captures_reported_requirements_in_memory(mock_llm):
+    """Test requirements the agent reports are extracted without temp files."""
+    state = create_project_state("Test", "Context")
+    state["conversation_history"].append({"role": "user", "content": "Users forget passwords."})
+    mock_llm.invoke.return_value = Mock(
+        content="I've captured this as a new requirement: The system shall let users reset passwords."
+    )
+    
+    with patch("tempfile.NamedTemporaryFile", side_effect=AssertionError("filesystem used")):
+        new_state = discovery_node(state)
+    
+    assert [(r.id, r.description, r.source) for r in new_state["requirements_raw"]] == [
+        ("REQ-001", "The system shall let users reset passwords.", "Discovery Conversation")
+    ]
+
+
+def test_discovery_node_folds_old_turns_into_summary(mock_llm):
+    """Test aged-out turns are summarized once per block and recent turns stay verbatim."""
+    state = create_project_state("Test", "Context")
+    for i in range(25):
+        role = "user" if i % 2 == 0 else "assistant"
+        state["conversation_history"].append({"role": role, "content": f"turn {i}"})
+    
+    summary_calls = []
+    
+    def fake_invoke(messages):
+        if "running memory" in messages[0].content:
+            summary_calls.append(messages[1].content)
+            return Mock(content="- user wants a login page")
+        return Mock(content="What else should the system do?")
+    
+    mock_llm.invoke.side_effect = fake_invoke
+    
+    new_state = discovery_node(state)
+    
+    assert len(summary_calls) == 1
+    assert "turn 0" in summary_calls[0] and "turn 14" in summary_calls[0] and "turn 15" not in summary_calls[0]
+    assert new_state["conversation_summary"] == "- user wants a login page"
+    assert new_state["summarized_message_count"] == 15
+    
+    prompt = mock_llm.invoke.call_args[0][0]
+    assert "user wants a login page" in prompt[1].content
+    assert [m.content for m in prompt[2:]] == [f"turn {i}" for i in range(15, 25)]
+    
+    # The next turn does not age out a whole block, so no new summary call
+    new_state["conversation_history"].append({"role": "user", "content": "turn 26"})
+    discovery_node(new_state)
+    assert len(summary_calls) == 1
+
+
+def test_discovery_node_prompt_stays_bounded_on_long_sessions(mock_llm):
+    """Test a 500-turn session keeps a bounded prompt and stored history."""
+    state = create_project_state("Test", "Context")
+    for i in range(500):
+        role = "user" if i % 2 == 0 else "assistant"
+        state["conversation_history"].append({"role": role, "content": f"turn {i} " + "detail " * 50})
+    
+    def fake_invoke(messages):
+        if "running memory" in messages[0].content:
+            return Mock(content="- summary so far")
+        return Mock(content="Next question?")
+    
+    mock_llm.invoke.side_effect = fake_invoke
+    
+    new_state = discovery_node(state)
+    
+    prompt = mock_llm.invoke.call_args[0][0]
+    assert len(prompt) <= 2 + 20
+    assert new_state["conversation_summary"] == "- summary so far"
+    # Retained history plus this turn's reply
+    assert len(new_state["conversation_history"]) <= 200 + 1
+    assert new_state["conversation_history"][-1]["agent"] == "Discovery Agent"
+
 def test_discovery_node_extracts_from_response(mock_llm):
     """Test discovery node extracts requirements from its own response."""
     state = create_project_state("Test", "Context")
@@ -200,7 +275,7 @@ def test_discovery_node_extracts_from_response(mock_llm):
     mock_llm.invoke.return_value = mock_response
     
     # Mock the extraction from the response
-    with patch("forge_requirements_builder.nodes.extract_from_document") as mock_extract:
+    with patch("forge_requirements_builder.nodes.extract_from_text") as mock_extract:
         mock_result = Mock()
         mock_result.requirements = [
             Mock(title="User Authentication", description="The system should allow users to login with credentials", type="Functional")
@@ -347,6 +422,89 @@ def test_authoring_node_doesnt_regenerate_existing_stories(mock_llm):
     assert new_state["user_stories"][0].title == "Existing Story"
 
 
+def test_authoring_node_numbering_independent_of_completion_order(mock_llm):
+    """Test STORY IDs follow requirement order even when calls finish out of order."""
+    state = create_project_state("Test", "Context")
+    state["requirements_raw"] = [
+        RequirementRaw(id=f"REQ-00{i}", title=f"Req {i}", description=f"Requirement {i}", type="Functional", source="User")
+        for i in range(1, 4)
+    ]
+    
+    def slow_first(messages):
+        prompt = messages[1].content
+        if "Req 1" in prompt:
+            time.sleep(0.2)
+        title = prompt.split("Title: ")[1].split("\n")[0]
+        return Mock(content=f'{{"title": "{title} story", "story_statement": "As a user...", "acceptance_criteria": ["AC1"], "effort": "S"}}')
+    
+    mock_llm.invoke.side_effect = slow_first
+    
+    new_state = authoring_node(state)
+    
+    stories = new_state["user_stories"]
+    assert [s.id for s in stories] == ["STORY-001", "STORY-002", "STORY-003"]
+    assert [s.requirement_id for s in stories] == ["REQ-001", "REQ-002", "REQ-003"]
+    assert stories[0].title == "Req 1 story"
+
+
+def test_authoring_node_records_failures_without_stopping(mock_llm):
+    """Test a failed requirement is recorded and the rest of the batch still completes."""
+    state = create_project_state("Test", "Context")
+    state["requirements_raw"] = [
+        RequirementRaw(id="REQ-001", title="Login", description="Users login", type="Functional", source="User"),
+        RequirementRaw(id="REQ-002", title="Broken", description="Bad response", type="Functional", source="User"),
+        RequirementRaw(id="REQ-003", title="Logout", description="Users logout", type="Functional", source="User")
+    ]
+    
+    def respond(messages):
+        if "Broken" in messages[1].content:
+            return Mock(content="not json")
+        return Mock(content='{"title": "Story", "story_statement": "As a user...", "acceptance_criteria": ["AC1"], "effort": "M"}')
+    
+    mock_llm.invoke.side_effect = respond
+    
+    new_state = authoring_node(state)
+    
+    assert [s.requirement_id for s in new_state["user_stories"]] == ["REQ-001", "REQ-003"]
+    assert [s.id for s in new_state["user_stories"]] == ["STORY-001", "STORY-002"]
+    assert list(new_state["authoring_failures"]) == ["REQ-002"]
+    assert "REQ-002" in new_state["conversation_history"][-1]["content"]
+    assert new_state["authoring_complete"] == True
+
+
+def test_refine_stories_retries_only_failed_requirements(mock_llm):
+    """Test 'refine stories' after a failed draft re-runs authoring for the failures alone."""
+    state = create_project_state("Test", "Context")
+    state["requirements_raw"] = [
+        RequirementRaw(id="REQ-001", title="Login", description="Users login", type="Functional", source="User"),
+        RequirementRaw(id="REQ-002", title="Broken", description="Bad response", type="Functional", source="User")
+    ]
+    mock_llm.invoke.side_effect = lambda messages: Mock(
+        content="not json" if "Broken" in messages[1].content else
+        '{"title": "Story", "story_statement": "As a user...", "acceptance_criteria": ["AC1"], "effort": "M"}'
+    )
+    state = authoring_node(state)
+    state["workflow_phase"] = "quality"
+    state["conversation_history"].append({"role": "user", "content": "Refine stories please"})
+    
+    state = orchestrator_node(state)
+    
+    assert state["workflow_phase"] == "authoring"
+    assert state["current_agent"] == "authoring_agent"
+    
+    mock_llm.invoke.reset_mock()
+    mock_llm.invoke.side_effect = None
+    mock_llm.invoke.return_value = Mock(
+        content='{"title": "Fixed", "story_statement": "As a user...", "acceptance_criteria": ["AC1"], "effort": "S"}'
+    )
+    state = authoring_node(state)
+    
+    assert mock_llm.invoke.call_count == 1
+    assert "Broken" in mock_llm.invoke.call_args[0][0][1].content
+    assert [s.requirement_id for s in state["user_stories"]] == ["REQ-001", "REQ-002"]
+    assert state["authoring_failures"] == {}
+
+
 # ============================================================================
 # QUALITY NODE TESTS
 # ============================================================================
@@ -496,6 +654,129 @@ def test_prioritization_node_uses_selected_framework(mock_llm):
         assert call_args[0] == "RICE"  # First argument is the framework
 
 
+def test_authoring_node_batches_requirements_and_retries_dropped_items(mock_llm):
+    """Test requirements share one structured call and only dropped items are retried."""
+    from forge_requirements_builder.tools import StoryDraft, StoryDraftBatch
+    state = create_project_state("Test", "Context")
+    state["requirements_raw"] = [
+        RequirementRaw(id=f"REQ-00{i}", title=f"Req {i}", description=f"Requirement {i}", type="Functional", source="User")
+        for i in range(1, 4)
+    ]
+    
+    structured = mock_llm.with_structured_output.return_value
+    structured.invoke.return_value = StoryDraftBatch(stories=[
+        StoryDraft(requirement_id="REQ-003", title="Third", story_statement="As a user...", effort="S"),
+        StoryDraft(requirement_id="REQ-001", title="First", story_statement="As a user...", edge_cases=["Timeout"]),
+        StoryDraft(requirement_id="REQ-999", title="Unknown", story_statement="As a user..."),
+    ])
+    mock_llm.invoke.return_value = Mock(content='{"title": "Second", "story_statement": "As a user...", "acceptance_criteria": ["AC1"], "effort": "M"}')
+    
+    new_state = authoring_node(state)
+    
+    assert structured.invoke.call_count == 1
+    assert mock_llm.invoke.call_count == 1
+    assert "Req 2" in mock_llm.invoke.call_args[0][0][1].content
+    stories = new_state["user_stories"]
+    assert [(s.id, s.requirement_id, s.title) for s in stories] == [
+        ("STORY-001", "REQ-001", "First"),
+        ("STORY-002", "REQ-002", "Second"),
+        ("STORY-003", "REQ-003", "Third"),
+    ]
+    assert stories[0].edge_cases == ["Timeout"]
+
+
+def test_authoring_node_only_regenerates_new_or_changed_requirements(mock_llm):
+    """Test incremental authoring keeps current stories and drops orphaned ones."""
+    from forge_requirements_builder.tools import StoryDraft, StoryDraftBatch
+    unchanged = RequirementRaw(id="REQ-001", title="Login", description="Users login", type="Functional", source="User")
+    edited = RequirementRaw(id="REQ-002", title="Logout", description="Users logout", type="Functional", source="User")
+    
+    def story(story_id, req, title):
+        return UserStory(
+            id=story_id, requirement_id=req.id, title=title,
+            story_statement="As a user...", acceptance_criteria=["AC1"],
+            effort_estimate="M", source_fingerprint=req.content_fingerprint()
+        )
+    
+    state = create_project_state("Test", "Context")
+    state["user_stories"] = [
+        story("STORY-001", unchanged, "Kept"),
+        story("STORY-002", edited, "Old logout"),
+        story("STORY-003", RequirementRaw(id="REQ-009", title="Gone", description="Removed", type="Functional", source="User"), "Orphan"),
+    ]
+    state["requirements_raw"] = [
+        unchanged,
+        edited.model_copy(update={"description": "Users logout from every device"}),
+        RequirementRaw(id="REQ-003", title="Reset", description="Users reset password", type="Functional", source="User"),
+    ]
+    
+    structured = mock_llm.with_structured_output.return_value
+    structured.invoke.return_value = StoryDraftBatch(stories=[
+        StoryDraft(requirement_id="REQ-002", title="New logout", story_statement="As a user..."),
+        StoryDraft(requirement_id="REQ-003", title="Reset", story_statement="As a user..."),
+    ])
+    
+    new_state = authoring_node(state)
+    
+    prompt = structured.invoke.call_args[0][0][1].content
+    assert "[REQ-002]" in prompt and "[REQ-003]" in prompt and "[REQ-001]" not in prompt
+    mock_llm.invoke.assert_not_called()
+    assert [(s.id, s.requirement_id, s.title) for s in new_state["user_stories"]] == [
+        ("STORY-001", "REQ-001", "Kept"),
+        ("STORY-002", "REQ-002", "New logout"),
+        ("STORY-004", "REQ-003", "Reset"),
+    ]
+    assert new_state["user_stories"][1].source_fingerprint == state["requirements_raw"][1].content_fingerprint()
+    
+    # A second run with nothing changed makes no calls
+    structured.invoke.reset_mock()
+    new_state["authoring_complete"] = False
+    authoring_node(new_state)
+    structured.invoke.assert_not_called()
+    assert new_state["authoring_complete"] == True
+
+
+def test_orchestrator_reopens_authoring_for_new_requirements():
+    """Test returning from discovery with a new requirement re-runs authoring."""
+    req = RequirementRaw(id="REQ-001", title="Login", description="Users login", type="Functional", source="User")
+    state = create_project_state("Test", "Context")
+    state["requirements_raw"] = [req]
+    state["user_stories"] = [
+        UserStory(
+            id="STORY-001", requirement_id="REQ-001", title="Login", story_statement="As a user...",
+            effort_estimate="M", source_fingerprint=req.content_fingerprint()
+        )
+    ]
+    state["authoring_complete"] = True
+    state["discovery_complete"] = True
+    
+    state = orchestrator_node(state)
+    assert state["authoring_complete"] == True
+    
+    state["workflow_phase"] = "discovery"
+    state["requirements_raw"].append(
+        RequirementRaw(id="REQ-002", title="Logout", description="Users logout", type="Functional", source="User")
+    )
+    state = orchestrator_node(state)
+    assert state["workflow_phase"] == "authoring"
+    assert state["authoring_complete"] == False
+
+def test_plan_authoring_batches_respects_token_budget():
+    """Test batch size adapts to the token budget."""
+    from forge_requirements_builder.nodes import _plan_authoring_batches
+    reqs = [
+        RequirementRaw(id=f"REQ-{i:03d}", title=f"Req {i}", description="x" * 400, type="Functional", source="User")
+        for i in range(10)
+    ]
+    
+    assert _plan_authoring_batches(reqs, token_budget=0) == [[i] for i in range(10)]
+    assert _plan_authoring_batches(reqs, token_budget=100_000, max_batch_size=4) == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+    
+    small = _plan_authoring_batches(reqs, token_budget=2500, max_batch_size=20)
+    large = _plan_authoring_batches(reqs, token_budget=8000, max_batch_size=20)
+    assert len(small) > len(large)
+    assert [p for batch in small for p in batch] == list(range(10))
+
 # ============================================================================
 # SYNTHESIS NODE TESTS
 # ============================================================================
@@ -600,6 +881,60 @@ Additional info
     assert "Prioritization" in deliverable
 
 
+
+def _section_number(messages):
+    return int(re.search(r"SECTION: (\d+)\.", messages[1].content).group(1))
+
+
+def test_synthesis_node_writes_sections_concurrently_in_order(mock_llm):
+    """Test sections finish out of order but are stitched in document order."""
+    state = create_project_state("Test", "Context")
+    state["requirements_raw"] = [
+        RequirementRaw(id="REQ-001", title="Login", description="Users login", type="Functional", source="User"),
+        RequirementRaw(id="REQ-002", title="Speed", description="Pages load fast", type="Non-Functional", source="User")
+    ]
+    prompts = {}
+    
+    def fake_invoke(messages):
+        number = _section_number(messages)
+        prompts[number] = messages[1].content
+        time.sleep(0.01 * (10 - number))  # later sections finish first
+        return Mock(content=f"Body {number}")
+    
+    mock_llm.invoke.side_effect = fake_invoke
+    
+    new_state = synthesis_node(state)
+    
+    deliverable = new_state["final_deliverable"]
+    positions = [deliverable.index(f"Body {n}\n") for n in range(1, 11)]
+    assert positions == sorted(positions)
+    assert "## 1. Executive Summary & Overview\n\nBody 1" in deliverable
+    # Each section only sees its own slice of the project data
+    assert "Users login" in prompts[5] and "Pages load fast" not in prompts[5]
+    assert "Pages load fast" in prompts[6] and "Users login" not in prompts[6]
+    assert new_state["synthesis_complete"] == True
+
+
+def test_synthesis_node_retries_failed_section_alone(mock_llm):
+    """Test a failed section is retried on its own without redoing the rest."""
+    state = create_project_state("Test", "Context")
+    calls = []
+    
+    def fake_invoke(messages):
+        number = _section_number(messages)
+        calls.append(number)
+        if number == 4 and calls.count(4) == 1:
+            raise RuntimeError("rate limited")
+        return Mock(content=f"Body {number}")
+    
+    mock_llm.invoke.side_effect = fake_invoke
+    
+    new_state = synthesis_node(state)
+    
+    assert sorted(calls) == sorted(list(range(1, 11)) + [4])
+    assert "## 4. User Stories & Acceptance Criteria\n\nBody 4" in new_state["final_deliverable"]
+    assert "could not be generated" not in new_state["conversation_history"][-1]["content"]
+
 # ============================================================================
 # INTEGRATION TESTS ACROSS NODES
 # ============================================================================
@@ -0,0 +1,119 @@
+"""Unit tests for incremental quality validation."""
+
+import json
+import random
+
+from forge_requirements_builder.quality import QualityEngine, refresh_quality_issues
+from forge_requirements_builder.state import (
+    RequirementRaw,
+    UserStory,
+    create_project_state,
+    deserialize_state,
+    serialize_state
+)
+from forge_requirements_builder.tools import validate_requirements_quality
+
+DESCRIPTIONS = [
+    "The system shall export monthly reports to csv for all regional managers",
+    "The system shall not export monthly reports to csv for all regional managers",
+    "Users must reset passwords via email within 5 minutes",
+    "The dashboard should be fast and user-friendly",
+    "Secure storage",
+    "Administrators can archive projects older than one year from the settings page",
+]
+
+
+def _requirements(count=12, seed=5):
+    rng = random.Random(seed)
+    return [
+        RequirementRaw(
+            id=f"REQ-{n:03d}", title=f"Requirement {n % 7}", description=rng.choice(DESCRIPTIONS),
+            type=rng.choice(["Functional", "Non-Functional"]), source="User"
+        )
+        for n in range(1, count + 1)
+    ]
+
+
+def _story(requirement_id):
+    return UserStory(
+        id=f"STORY-{requirement_id}", requirement_id=requirement_id, title="Story",
+        story_statement="As a user, I want it so that it works", effort_estimate="S"
+    )
+
+
+def _keys(result):
+    return [(i.category, i.location, i.description) for i in result.issues_found]
+
+
+def test_cold_run_matches_batch_validation():
+    """Test an empty cache gives exactly validate_requirements_quality's issues and IDs."""
+    requirements = _requirements()
+    stories = [_story("REQ-001"), _story("REQ-004")]
+
+    incremental = QualityEngine().validate(requirements, stories)
+
+    assert incremental == validate_requirements_quality(requirements, stories)
+
+
+def test_only_changed_requirements_are_rechecked_and_ids_stay_stable():
+    """Test an edit re-checks one requirement and keeps unchanged issues' IDs and status."""
+    requirements = _requirements()
+    engine = QualityEngine()
+    first = engine.validate(requirements)
+    first.issues_found[0].status = "Acknowledged"
+
+    requirements[3] = requirements[3].model_copy(update={"description": "The dashboard should be simple"})
+    second = engine.validate(requirements, previous_issues=first.issues_found)
+
+    assert engine.evaluated == 1
+    assert _keys(second) == _keys(validate_requirements_quality(requirements))
+    before = {(i.category, i.location, i.description): i for i in first.issues_found}
+    highest = max(int(i.id[3:]) for i in first.issues_found)
+    for issue in second.issues_found:
+        old = before.get((issue.category, issue.location, issue.description))
+        if old is not None:
+            assert (issue.id, issue.status) == (old.id, old.status)
+        else:
+            assert int(issue.id[3:]) > highest
+
+
+def test_random_edits_match_batch_validation():
+    """Test any sequence of edits, additions and removals finds the batch issues."""
+    rng = random.Random(9)
+    requirements = _requirements(30)
+    stories = [_story("REQ-002")]
+    engine = QualityEngine()
+    previous = []
+
+    for _ in range(25):
+        action = rng.random()
+        if action < 0.5:
+            position = rng.randrange(len(requirements))
+            requirements[position] = requirements[position].model_copy(update={"description": rng.choice(DESCRIPTIONS)})
+        elif action < 0.7:
+            requirements.pop(rng.randrange(len(requirements)))
+        elif action < 0.9:
+            requirements.append(_requirements(1, seed=rng.random())[0].model_copy(update={"id": f"REQ-{rng.randrange(100, 999)}"}))
+        else:
+            stories.append(_story(rng.choice(requirements).id))
+        if len({r.id for r in requirements}) != len(requirements):
+            requirements.pop()
+
+        result = engine.validate(requirements, stories, previous)
+        previous = result.issues_found
+
+        assert _keys(result) == _keys(validate_requirements_quality(requirements, stories))
+        assert len({i.id for i in result.issues_found}) == result.total_issues
+
+
+def test_refresh_keeps_cache_in_saved_state():
+    """Test the cache survives serialization and reports whether issues changed."""
+    state = create_project_state("Quality", "Context")
+    state["requirements_raw"] = _requirements(6)
+    refresh_quality_issues(state)
+
+    restored = deserialize_state(json.loads(json.dumps(serialize_state(state))))
+    result, changed = refresh_quality_issues(restored)
+
+    assert not changed
+    assert result.issues_found == state["quality_issues"]
@@ -0,0 +1,125 @@
+"""Unit tests for the quality rule engine."""
+
+import pytest
+
+from forge_requirements_builder import rules as rules_module
+from forge_requirements_builder.quality import QualityEngine
+from forge_requirements_builder.rules import QualityRule, QualityRuleRegistry, RuleContext
+from forge_requirements_builder.state import QualityIssue, RequirementRaw, UserStory
+from forge_requirements_builder.tools import QUALITY_RULES
+
+
+def _issue(location, description):
+    return QualityIssue(
+        id="", location=location, category="Ambiguity", severity="Low",
+        description=description, recommended_fix="Fix it", status="Identified"
+    )
+
+
+def _tbd(req, context):
+    return [_issue(req.id, "TBD in requirement")] if "TBD" in req.description else []
+
+
+def _same_type_pairs(requirements, only=None):
+    return [(i, j) for i in range(len(requirements)) for j in range(i + 1, len(requirements))
+            if requirements[i].type == requirements[j].type]
+
+
+def _same_type(req1, req2, context):
+    return [_issue(f"{req1.id}, {req2.id}", "Same type")]
+
+
+def _orphan_story(story, context):
+    return [] if story.requirement_id in context.requirement_ids else [_issue(story.id, "Story has no requirement")]
+
+
+def _requirements(count):
+    return [
+        RequirementRaw(
+            id=f"REQ-{n:03d}", title=f"Requirement {n}", type="Functional" if n % 2 else "Non-Functional",
+            description="TBD: the system shall be fast" if n % 3 == 0 else "Users must export reports in csv format",
+            source="User"
+        )
+        for n in range(1, count + 1)
+    ]
+
+
+def test_rules_run_in_registration_order_and_are_numbered():
+    """Test each scope's issues appear in rule order, numbered from QA-001."""
+    registry = QualityRuleRegistry()
+    registry.rule("orphan-story", scope="story")(_orphan_story)
+    registry.rule("same-type", scope="pair", candidates=_same_type_pairs)(_same_type)
+    registry.rule("tbd", scope="requirement")(_tbd)
+    stories = [UserStory(id="STORY-001", requirement_id="REQ-999", title="S", story_statement="As a user", effort_estimate="S")]
+
+    issues = registry.run(_requirements(3), stories)
+
+    assert [(i.id, i.location) for i in issues] == [
+        ("QA-001", "STORY-001"),
+        ("QA-002", "REQ-001, REQ-003"),
+        ("QA-003", "REQ-003"),
+    ]
+
+
+def test_invalid_rules_are_rejected():
+    """Test unknown scopes, pair rules without candidates and repeated names fail."""
+    registry = QualityRuleRegistry([QualityRule("tbd", "requirement", _tbd)])
+
+    with pytest.raises(ValueError):
+        QualityRule("x", "document", _tbd)
+    with pytest.raises(ValueError):
+        QualityRule("x", "pair", _same_type)
+    with pytest.raises(ValueError):
+        registry.register(QualityRule("tbd", "requirement", _tbd))
+
+
+def test_sharded_requirement_rules_match_in_process(monkeypatch):
+    """Test results merged from a process pool equal an in-process run."""
+    monkeypatch.setattr(rules_module, "QUALITY_PARALLEL_MIN_REQUIREMENTS", 0)
+    monkeypatch.setattr(rules_module, "QUALITY_REQUIREMENTS_PER_TASK", 7)
+    requirements = _requirements(40)
+    context = RuleContext.build(requirements)
+
+    sharded = QUALITY_RULES.check_requirements(requirements, context, workers=3)
+
+    assert sharded == QUALITY_RULES.check_requirements(requirements, context, workers=1)
+
+
+def test_pool_run_numbers_issues_like_in_process_run(monkeypatch):
+    """Test a run through the worker pool gives the same QA-numbered issues as workers=1."""
+    monkeypatch.setattr(rules_module, "QUALITY_PARALLEL_MIN_REQUIREMENTS", 0)
+    monkeypatch.setattr(rules_module, "QUALITY_REQUIREMENTS_PER_TASK", 7)
+    requirements = _requirements(40)
+
+    pooled = QUALITY_RULES.run(requirements, workers=3)
+
+    assert pooled and pooled == QUALITY_RULES.run(requirements, workers=1)
+    assert rules_module._worker_context().get_start_method() != "fork"
+
+
+def test_default_workers_stay_in_process_on_small_machines(monkeypatch):
+    """Test QUALITY_WORKERS=0 never starts a pool with 2 CPUs or fewer."""
+    monkeypatch.setattr(rules_module, "QUALITY_PARALLEL_MIN_REQUIREMENTS", 0)
+    monkeypatch.setattr(rules_module, "QUALITY_REQUIREMENTS_PER_TASK", 7)
+    monkeypatch.setattr(rules_module.os, "cpu_count", lambda: 2)
+    monkeypatch.setattr(rules_module, "ProcessPoolExecutor", None)
+    requirements = _requirements(40)
+
+    assert QUALITY_RULES.run(requirements, workers=0) == QUALITY_RULES.run(requirements, workers=1)
+
+
+def test_engine_caches_custom_rules():
+    """Test QualityEngine runs a custom registry and re-checks only edited requirements."""
+    registry = QualityRuleRegistry([
+        QualityRule("tbd", "requirement", _tbd),
+        QualityRule("same-type", "pair", _same_type, candidates=_same_type_pairs),
+    ])
+    requirements = _requirements(6)
+    engine = QualityEngine(rules=registry)
+    first = engine.validate(requirements)
+
+    requirements[0] = requirements[0].model_copy(update={"description": "TBD"})
+    second = engine.validate(requirements, previous_issues=first.issues_found)
+
+    assert engine.evaluated == 1
+    assert [i.location for i in second.issues_found] == [i.location for i in registry.run(requirements)]
@@ -113,3 +113,28 @@ def test_conversation_history_manager():
     context = ConversationHistoryManager.get_context(history, last_n=1)
     assert len(context) == 1
     assert context[0]["content"] == "Hi there"
+
+
+def test_conversation_history_messages_to_fold():
+    """Test messages are folded only once a whole block has aged out."""
+    history = [{"role": "user", "content": str(i)} for i in range(25)]
+    
+    assert ConversationHistoryManager.messages_to_fold(history, 0, recent_messages=10, block_size=10) == (0, 15)
+    assert ConversationHistoryManager.messages_to_fold(history, 15, recent_messages=10, block_size=10) is None
+    assert ConversationHistoryManager.messages_to_fold(history[:19], 0, recent_messages=10, block_size=10) is None
+
+
+def test_conversation_history_compact_drops_only_summarized_messages():
+    """Test compaction never drops messages the summary does not cover."""
+    history = [{"role": "user", "content": str(i)} for i in range(30)]
+    
+    compacted, summarized = ConversationHistoryManager.compact(history, 20, retain=15)
+    assert len(compacted) == 15
+    assert compacted[0]["content"] == "15"
+    assert summarized == 5
+    
+    compacted, summarized = ConversationHistoryManager.compact(history, 5, retain=15)
+    assert compacted[0]["content"] == "5"
+    assert summarized == 0
+    
+    assert ConversationHistoryManager.compact(history, 20, retain=0) == (history, 20)
@@ -0,0 +1,102 @@
+"""Unit tests for size-guarded text reading."""
+
+import pytest
+from forge_requirements_builder import text_reader, tools
+from forge_requirements_builder.text_reader import BinaryFileError, LineStream, decode_text, detect_encoding, read_text
+
+
+# ============================================================================
+# Encoding Detection
+# ============================================================================
+
+def test_detect_encoding():
+    """Test BOMs, UTF-8 (including a character split at the sample end) and fallback."""
+    assert detect_encoding("﻿hi".encode("utf-8")) == "utf-8-sig"
+    assert detect_encoding("hi".encode("utf-16")) == "utf-16"
+    assert detect_encoding("café".encode("utf-8")[:-1]) == "utf-8"
+    assert detect_encoding("“quoted”".encode("cp1252")) == "cp1252"
+    with pytest.raises(BinaryFileError):
+        detect_encoding(b"PK\x03\x04\x00\x00")
+
+# ============================================================================
+# Byte Budget
+# ============================================================================
+
+@pytest.fixture(params=[False, True], ids=["read", "mmap"])
+def log_file(request, tmp_path, monkeypatch):
+    """A 100-line log, read directly or through a memory map."""
+    if request.param:
+        monkeypatch.setattr(text_reader, "MMAP_THRESHOLD_BYTES", 1)
+    path = tmp_path / "service.log"
+    path.write_text("".join(f"line {i:03d}\n" for i in range(100)), encoding="utf-8")
+    return path
+
+
+def test_read_text_truncates_at_last_whole_line(log_file):
+    """Test over-budget files are cut at a line break and reported."""
+    result = read_text(log_file, max_bytes=25)
+
+    assert result.text == "line 000\nline 001\n"
+    assert result.truncated and result.file_size == 900
+    assert "truncated" in result.truncation_notice()
+    assert read_text(log_file).truncated is False
+
+
+def test_decode_text_matches_read_text(log_file):
+    """Test in-memory uploads get the same budget and encoding handling."""
+    data = log_file.read_bytes()
+
+    assert decode_text(data, max_bytes=25) == read_text(log_file, max_bytes=25)
+    assert decode_text(data).text == data.decode("utf-8")
+
+
+def test_line_stream_stops_at_budget(log_file):
+    """Test lines stream until the next one would cross the budget."""
+    lines = LineStream(log_file, max_bytes=25)
+
+    assert list(lines) == ["line 000\n", "line 001\n"]
+    assert lines.truncated
+
+    whole = LineStream(log_file)
+    assert len(list(whole)) == 100 and not whole.truncated
+
+
+def test_line_stream_decodes_utf16(tmp_path):
+    """Test multi-byte encodings stream through the codec."""
+    path = tmp_path / "notes.txt"
+    path.write_text("first\nsecond\n", encoding="utf-16")
+
+    assert list(LineStream(path)) == ["first\n", "second\n"]
+
+# ============================================================================
+# Integration
+# ============================================================================
+
+def test_extraction_streams_large_text_without_cache(tmp_path, monkeypatch):
+    """Test streamed text parsing finds requirements across blocks."""
+    path = tmp_path / "minutes.txt"
+    path.write_text("Intro.\n\n" + "The system shall keep audit logs.\n\n" * 3 + "The system shall send alerts.\n")
+    monkeypatch.setattr(tools, "TEXT_BLOCK_CHARS", 10)
+
+    entry = tools._extract_document(path, "txt", keep_text=False)
+
+    assert [r["description"] for r in entry["requirements"]] == [
+        "The system shall keep audit logs.",
+        "The system shall send alerts.",
+    ]
+    assert entry["text"] == "" and entry["metadata"]["truncated"] is False
+
+
+def test_elicitation_read_file_reports_truncation(tmp_path, monkeypatch):
+    """Test the elicitation read_file tool appends a truncation note."""
+    from src.requirements_elicitation_agent.tools import read_file
+
+    path = tmp_path / "huge.txt"
+    path.write_text("x" * 50 + "\n" + "y" * 50 + "\n")
+    monkeypatch.setattr(text_reader, "MAX_TEXT_BYTES", 60)
+
+    content = read_file.invoke({"file_path": str(path)})
+
+    assert content.startswith("x" * 50 + "\n")
+    assert "y" not in content.split("[")[0]
+    assert content.rstrip().endswith("...]")
@@ -0,0 +1,111 @@
+"""Unit tests for token counting and prompt budgeting."""
+
+import pytest
+from forge_requirements_builder import tokens
+from forge_requirements_builder.tokens import (
+    TokenBudget,
+    count_tokens,
+    truncate_to_tokens,
+    TRUNCATION_MARKER,
+    _get_encoding
+)
+
+
+@pytest.fixture(autouse=True)
+def estimator_only(monkeypatch):
+    """Use the character estimator so counts do not depend on tiktoken files."""
+    monkeypatch.setattr(tokens, "_get_encoding", lambda model: None)
+
+
+SENTENCES = " ".join(f"Sentence number {i} describes a requirement." for i in range(50))
+
+# ============================================================================
+# Counting and Truncation
+# ============================================================================
+
+def test_count_tokens_falls_back_to_estimate():
+    """Test the estimator is used when no tokenizer is available."""
+    assert count_tokens("") == 0
+    assert count_tokens("a" * 40) == 10
+    assert count_tokens("a" * 40, chars_per_token=2.0) == 20
+
+
+def test_uncached_encoding_is_never_downloaded(tmp_path, monkeypatch):
+    """Test auto mode estimates instead of fetching an encoding that is not cached locally."""
+    tiktoken = pytest.importorskip("tiktoken")
+    monkeypatch.setattr(tokens, "TOKENIZER_MODE", "auto")
+    monkeypatch.setenv("TIKTOKEN_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(tiktoken.registry, "ENCODINGS", {})
+    monkeypatch.setattr(tiktoken, "get_encoding", lambda name: pytest.fail("encoding was downloaded"))
+    _get_encoding.cache_clear()
+
+    try:
+        assert _get_encoding("gpt-4o") is None
+    finally:
+        _get_encoding.cache_clear()
+
+
+def test_truncate_to_tokens_cuts_at_sentence_boundary():
+    """Test truncation stays in budget and does not cut mid-sentence."""
+    result = truncate_to_tokens(SENTENCES, 100)
+
+    assert count_tokens(result) <= 100
+    assert result.endswith(TRUNCATION_MARKER)
+    kept = result[:-len(TRUNCATION_MARKER)].strip()
+    assert kept.endswith("requirement.")
+
+
+def test_truncate_to_tokens_keep_end():
+    """Test keep='end' drops the beginning of the text."""
+    result = truncate_to_tokens(SENTENCES, 100, keep="end")
+
+    assert result.startswith(TRUNCATION_MARKER)
+    assert result.endswith("Sentence number 49 describes a requirement.")
+    assert "Sentence number 0 " not in result
+
+
+def test_truncate_to_tokens_returns_short_text_unchanged():
+    """Test text within budget is returned as is."""
+    assert truncate_to_tokens("short text", 100) == "short text"
+
+# ============================================================================
+# Token Budget
+# ============================================================================
+
+def test_token_budget_trims_lowest_priority_first():
+    """Test high priority parts survive while low priority parts absorb the cut."""
+    system = "s" * 400  # 100 tokens
+    budget = TokenBudget(max_tokens=300)
+    budget.add("system", system, priority=100)
+    budget.add("history", SENTENCES, priority=10, keep="end")
+    budget.add("document", SENTENCES, priority=50)
+
+    parts = budget.fit()
+
+    assert parts["system"] == system
+    assert parts["document"] == truncate_to_tokens(SENTENCES, 200)
+    assert parts["history"] == ""
+    assert budget.overflow == 0
+
+
+def test_token_budget_respects_min_and_max_tokens():
+    """Test per-part caps and floors."""
+    budget = TokenBudget(max_tokens=150)
+    budget.add("history", SENTENCES, priority=10, min_tokens=60, max_tokens=80, keep="end")
+    budget.add("document", SENTENCES, priority=50)
+
+    parts = budget.fit()
+
+    assert 60 <= count_tokens(parts["history"]) <= 80
+    assert count_tokens(parts["history"]) + count_tokens(parts["document"]) <= 150
+
+
+def test_token_budget_reports_overflow():
+    """Test parts that cannot fit at their floors are reported, not dropped."""
+    budget = TokenBudget(max_tokens=100, reserve_output=50)
+    budget.add("system", "s" * 400, priority=100, min_tokens=100)
+
+    parts = budget.fit()
+
+    assert parts["system"] == "s" * 400
+    assert budget.overflow == 50
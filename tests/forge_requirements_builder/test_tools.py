@@ -1,14 +1,27 @@
 """Unit tests for Agent Tools."""
 
+import random
+
 import pytest
+from forge_requirements_builder import tools
 from forge_requirements_builder.tools import (
     extract_from_document,
+    iter_pdf_pages,
+    extract_from_documents,
+    extract_from_text,
+    find_documents,
+    merge_extracted_requirements,
+    load_document_text,
+    _parse_requirements_from_text,
     validate_user_story,
     validate_requirements_quality,
     apply_prioritization_framework,
-    validate_acceptance_criteria
+    validate_acceptance_criteria,
+    _are_potentially_conflicting,
+    _find_conflicting_pairs
 )
-from forge_requirements_builder.state import RequirementRaw, UserStory
+from forge_requirements_builder.cache import configure_extraction_cache, create_extraction_cache, file_digest, make_cache_key
+from forge_requirements_builder.state import RequirementRaw, UserStory, create_project_state
 
 # ============================================================================
 # 5.2.1: Extract from Document
@@ -44,6 +57,196 @@ def test_extract_from_document_text():
     finally:
         os.remove(tmp_path)
 
+
+def test_extract_from_text_parses_in_memory():
+    """Test text already held in memory is parsed with the given source."""
+    result = extract_from_text("REQ-9: Export invoices as PDF", source="Chat")
+
+    assert [(r.title, r.source) for r in result.requirements] == [("REQ-9: Export invoices as PDF", "Chat")]
+    assert result.metadata["requirements_count"] == 1
+
+
+@pytest.fixture
+def extraction_cache():
+    """Install an in-memory extraction cache for the test."""
+    previous = configure_extraction_cache()
+    cache = configure_extraction_cache(create_extraction_cache("memory"), force=True)
+    yield cache
+    configure_extraction_cache(previous, force=True)
+
+
+def test_extraction_cache_serves_unchanged_reupload(tmp_path, monkeypatch, extraction_cache):
+    """Test a re-upload of identical content is answered without re-parsing."""
+    first = tmp_path / "spec.txt"
+    first.write_text("The system shall archive invoices nightly.")
+    second = tmp_path / "spec-copy.txt"
+    second.write_text(first.read_text())
+
+    result = extract_from_document(str(first))
+    parse_calls = []
+    monkeypatch.setattr(tools, "_extract_document", lambda *args, **kwargs: parse_calls.append(args))
+    again = extract_from_document(str(second))
+
+    assert parse_calls == []
+    assert again.metadata["cached"] is True and result.metadata["cached"] is False
+    assert [r.description for r in again.requirements] == [r.description for r in result.requirements]
+    assert again.requirements[0].source == "spec-copy.txt"
+    monkeypatch.undo()
+    assert load_document_text(str(second)) == "The system shall archive invoices nightly."
+
+
+def test_extraction_cache_keeps_requirements_not_text(tmp_path, monkeypatch, extraction_cache):
+    """Test cached entries hold no text, so extraction still streams with the cache on."""
+    doc = tmp_path / "spec.txt"
+    doc.write_text("The system shall archive invoices nightly.\n\nThe system shall email receipts.")
+    monkeypatch.setattr(tools, "read_text", lambda *args, **kwargs: pytest.fail("text file was read whole"))
+
+    result = extract_from_document(str(doc))
+    entry = extraction_cache.get(make_cache_key(tools.EXTRACTOR_VERSION, "txt", file_digest(str(doc))))
+
+    assert len(result.requirements) == 2
+    assert "text" not in entry and len(entry["requirements"]) == 2
+
+
+def test_extraction_cache_misses_on_new_content_or_version(tmp_path, monkeypatch, extraction_cache):
+    """Test the key covers file content and the extractor version."""
+    doc = tmp_path / "spec.txt"
+    doc.write_text("The system shall archive invoices nightly.")
+    extract_from_document(str(doc))
+
+    doc.write_text("The system shall archive receipts nightly.")
+    assert extract_from_document(str(doc)).metadata["cached"] is False
+
+    monkeypatch.setattr(tools, "EXTRACTOR_VERSION", "test")
+    assert extract_from_document(str(doc)).metadata["cached"] is False
+
+
+@pytest.fixture
+def artifact_folder(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a-notes.txt").write_text("The system shall email receipts.\nREQ-4: Audit every login")
+    (tmp_path / "b-spec.md").write_text("The system shall email receipts.\nThe platform must support SSO.")
+    (tmp_path / "c-broken.pdf").write_bytes(b"not a pdf")
+    (tmp_path / "diagram.png").write_bytes(b"")
+    (tmp_path / "sub" / "d-more.txt").write_text("The system shall export CSV files.")
+    return tmp_path
+
+
+def test_find_documents_resolves_directories_and_globs(artifact_folder):
+    """Test directory, recursive and glob sources list supported files only."""
+    names = lambda paths: [p.name for p in paths]
+
+    assert names(find_documents(str(artifact_folder))) == ["a-notes.txt", "b-spec.md", "c-broken.pdf"]
+    assert "d-more.txt" in names(find_documents(str(artifact_folder), recursive=True))
+    assert names(find_documents(str(artifact_folder / "*.md"))) == ["b-spec.md"]
+    with pytest.raises(FileNotFoundError):
+        find_documents(str(artifact_folder / "*.xlsx"))
+
+
+def test_extract_from_documents_parallel_with_errors(artifact_folder, extraction_cache):
+    """Test a worker pool extracts every file, reporting failures per file."""
+    finished = []
+    result = extract_from_documents(
+        str(artifact_folder),
+        recursive=True,
+        workers=2,
+        on_result=lambda path, res, err: finished.append(path)
+    )
+
+    assert len(finished) == 4
+    assert [doc.metadata["file_path"].split("/")[-1] for doc in result.documents] == [
+        "a-notes.txt", "b-spec.md", "d-more.txt"
+    ]
+    assert list(result.errors) == [str(artifact_folder / "c-broken.pdf")]
+
+
+def test_merge_extracted_requirements_single_dedupe_pass(artifact_folder, extraction_cache):
+    """Test bulk results merge with duplicates skipped across documents."""
+    state = create_project_state("Bulk", "Ingestion")
+    documents = extract_from_documents(str(artifact_folder), workers=1).documents
+
+    added, skipped = merge_extracted_requirements(state, documents)
+
+    assert (added, skipped) == (3, 1)
+    assert [r.id for r in state["requirements_raw"]] == ["REQ-001", "REQ-002", "REQ-003"]
+    assert state["requirements_raw"][2].source.endswith("b-spec.md")
+
+
+def test_parse_requirements_orders_patterns_and_drops_duplicates():
+    """Test system-shall matches come first, then REQ-XXX, then numbered items."""
+    text = (
+        "1. Users should be able to export every report\n"
+        "REQ-7: Users should be able to export every report\n"
+        "REQ-8: The system shall log every export.\n"
+        "2. Table of contents\n"
+    )
+
+    requirements = _parse_requirements_from_text(text, source="spec.txt")
+
+    assert [(r.title.split(":")[0], r.description) for r in requirements] == [
+        ("Log every export.", "The system shall log every export."),
+        ("REQ-7", "Users should be able to export every report"),
+    ]
+
+
+def _write_pdf(path, pages):
+    """Write a minimal PDF with one line of Helvetica text per page."""
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % i for i in page_ids) + b"] /Count %d >>" % len(pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, text in zip(page_ids, pages):
+        stream = b"BT /F1 10 Tf 20 700 Td (" + text.encode("latin-1") + b") Tj ET"
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(data)
+
+
+def test_extract_from_pdf_records_page_numbers(tmp_path):
+    """Test PDF requirements are parsed per page with their page number kept."""
+    pdf = tmp_path / "rfp.pdf"
+    _write_pdf(pdf, [
+        "The system shall export reports to PDF.",
+        "Introduction and scope.",
+        "The system must lock accounts after five failed logins.",
+        "The system shall export reports to PDF.",
+    ])
+
+    result = extract_from_document(str(pdf))
+
+    assert [(r.page, r.description) for r in result.requirements] == [
+        (1, "The system shall export reports to PDF."),
+        (3, "The system must lock accounts after five failed logins."),
+    ]
+    assert result.metadata["page_count"] == 4
+
+
+def test_iter_pdf_pages_process_pool_keeps_page_order(tmp_path, monkeypatch):
+    """Test page ranges extracted by worker processes are yielded in order."""
+    pdf = tmp_path / "large.pdf"
+    _write_pdf(pdf, [f"Page {n} text" for n in range(1, 8)])
+    monkeypatch.setattr(tools, "PDF_PARALLEL_MIN_PAGES", 1)
+
+    pages = list(iter_pdf_pages(pdf, workers=2, pages_per_task=2))
+
+    assert [number for number, _ in pages] == list(range(1, 8))
+    assert pages[4][1].strip() == "Page 5 text"
+
 # ============================================================================
 # 5.2.2: Validate User Story
 # ============================================================================
@@ -105,6 +308,26 @@ def test_validate_requirements_quality_ambiguity():
     assert len(ambiguity_issues) > 0
     # Check if any issue mentions "fast"
     assert any("fast" in i.description.lower() for i in ambiguity_issues)
+
+
+def test_conflicting_pairs_match_all_pairs_scan():
+    """Test the indexed conflict search finds exactly what comparing every pair does."""
+    rng = random.Random(3)
+    vocabulary = ["users", "admins", "export", "view", "reports", "logs", "daily", "in", "csv",
+                  "from", "the", "dashboard", "must", "not", "never", "within", "2", "seconds"]
+    reqs = [
+        RequirementRaw(id=f"REQ-{n:03d}", title=f"R{n}", description=" ".join(rng.choices(vocabulary, k=rng.randint(3, 12))),
+                       type="Functional", source="User")
+        for n in range(150)
+    ]
+    
+    expected = [
+        (i, j) for i in range(len(reqs)) for j in range(i + 1, len(reqs))
+        if _are_potentially_conflicting(reqs[i], reqs[j])
+    ]
+    
+    assert expected
+    assert _find_conflicting_pairs(reqs) == expected
 # ============================================================================
 
 def test_apply_prioritization_framework_moscow():
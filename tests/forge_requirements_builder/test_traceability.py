@@ -0,0 +1,92 @@
+"""Unit tests for the requirement traceability index."""
+
+import json
+
+from forge_requirements_builder.quality import refresh_quality_issues
+from forge_requirements_builder.state import (
+    QualityIssue,
+    RequirementRaw,
+    UserStory,
+    create_project_state,
+    deserialize_state,
+    serialize_state
+)
+from forge_requirements_builder.traceability import TraceabilityIndex
+
+
+def _story(story_id, requirement_id):
+    return UserStory(
+        id=story_id, requirement_id=requirement_id, title="Story",
+        story_statement="As a user, I want it so that it works", effort_estimate="S"
+    )
+
+
+def _issue(issue_id, location):
+    return QualityIssue(
+        id=issue_id, location=location, category="Inconsistency", severity="High",
+        description="Issue", recommended_fix="Fix it", status="Identified"
+    )
+
+
+def test_lookups_follow_stories_and_issue_locations():
+    """Test stories, pair issues and story-located issues trace to their requirements."""
+    trace = TraceabilityIndex()
+    trace.sync(
+        [_story("STORY-001", "REQ-001"), _story("STORY-002", "REQ-002"), _story("STORY-003", "REQ-001")],
+        [_issue("QA-001", "REQ-001, REQ-002"), _issue("QA-002", "STORY-002"), _issue("QA-003", "REQ-003")]
+    )
+
+    assert trace.stories_for("REQ-001") == ["STORY-001", "STORY-003"]
+    assert trace.requirement_for("STORY-002") == "REQ-002"
+    assert trace.issues_for("REQ-002") == ["QA-001", "QA-002"]
+    assert trace.issues_for("REQ-003") == ["QA-003"]
+    assert not trace.has_story("REQ-003")
+
+
+def test_sync_reports_and_applies_changes_only():
+    """Test an unchanged sync is a no-op and a moved story is re-linked."""
+    trace = TraceabilityIndex()
+    stories = [_story("STORY-001", "REQ-001"), _story("STORY-002", "REQ-002")]
+    trace.sync(stories, [])
+
+    assert not trace.sync(stories, [])
+
+    stories[1] = _story("STORY-002", "REQ-001")
+    assert trace.sync(stories, [])
+    assert trace.stories_for("REQ-001") == ["STORY-001", "STORY-002"]
+    assert trace.stories_for("REQ-002") == []
+
+
+def test_sync_relinks_only_changed_issues_and_issues_on_moved_stories():
+    """Test issue deltas are applied by ID and story-located issues follow their story."""
+    trace = TraceabilityIndex()
+    stories = [_story("STORY-001", "REQ-001"), _story("STORY-002", "REQ-002")]
+    issues = [_issue("QA-001", "REQ-001"), _issue("QA-002", "STORY-002"), _issue("QA-003", "REQ-002")]
+    trace.sync(stories, issues)
+
+    issues = [issues[0], issues[1], _issue("QA-004", "REQ-003")]
+    stories[1] = _story("STORY-002", "REQ-003")
+    assert trace.sync(stories, issues)
+
+    assert trace.issues_for("REQ-002") == []
+    assert sorted(trace.issues_for("REQ-003")) == ["QA-002", "QA-004"]
+    assert trace.issues_for("REQ-001") == ["QA-001"]
+    assert "REQ-002" not in trace.data["issues"] and "REQ-002" not in trace.data["stories"]
+
+
+def test_quality_refresh_keeps_index_in_saved_state():
+    """Test quality validation records issue links that survive serialization."""
+    state = create_project_state("Trace", "Context")
+    state["requirements_raw"] = [
+        RequirementRaw(id="REQ-001", title="Fast", description="It should be fast", type="Functional", source="User"),
+        RequirementRaw(id="REQ-002", title="Export", description="Users must export monthly reports to csv", type="Functional", source="User"),
+    ]
+    state["user_stories"] = [_story("STORY-001", "REQ-002")]
+    result, _ = refresh_quality_issues(state)
+
+    restored = deserialize_state(json.loads(json.dumps(serialize_state(state))))
+    trace = TraceabilityIndex.for_state(restored)
+
+    assert trace.issues_for("REQ-001") == [i.id for i in result.issues_found if i.location == "REQ-001"]
+    assert "No user story" not in " ".join(i.description for i in result.issues_found if i.location == "REQ-002")
+    assert trace.stories_for("REQ-002") == ["STORY-001"]
@@ -0,0 +1,107 @@
+"""
+Tests for chunked (map-reduce) document extraction.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from src.requirements_elicitation_agent import nodes
+from src.requirements_elicitation_agent.chunking import merge_chunk_results, split_document
+from src.requirements_elicitation_agent.tools import RecordRequirement, RequirementExtraction
+from forge_requirements_builder.tokens import count_tokens
+
+
+def _requirement(description):
+    return RecordRequirement(description=description, category="Functional", is_vague=False, is_risk=False)
+
+
+def _document(sections=6, paragraphs=4):
+    parts = []
+    for s in range(sections):
+        parts.append(f"# Section {s}")
+        for p in range(paragraphs):
+            parts.append(f"Paragraph {s}.{p}. " + "The team discussed login and reporting needs. " * 6)
+    return "\n\n".join(parts)
+
+
+class TestSplitDocument:
+    """Chunk sizing, boundaries, offsets and overlap."""
+
+    def test_chunks_fit_budget_and_map_back_to_source(self):
+        text = _document()
+        chunks = split_document(text, max_tokens=200)
+
+        assert len(chunks) > 1
+        for chunk in chunks:
+            assert count_tokens(chunk.text) <= 200
+            assert text[chunk.start:chunk.end] == chunk.text
+        assert chunks[0].start == 0
+        assert chunks[-1].end == len(text)
+
+    def test_chunks_start_at_paragraphs_and_prefer_headings(self):
+        text = _document()
+        chunks = split_document(text, max_tokens=300)
+
+        for chunk in chunks:
+            assert chunk.start == 0 or text[chunk.start - 2:chunk.start] == "\n\n"
+        assert sum(chunk.text.startswith("# Section") for chunk in chunks) >= len(chunks) // 2
+
+    def test_overlap_repeats_trailing_paragraphs(self):
+        text = _document()
+        chunks = split_document(text, max_tokens=300, overlap_tokens=100)
+
+        for previous, chunk in zip(chunks, chunks[1:]):
+            assert chunk.start < previous.end
+
+    def test_oversized_paragraph_is_split(self):
+        text = "word " * 2000
+        chunks = split_document(text, max_tokens=100)
+
+        assert len(chunks) > 1
+        assert all(count_tokens(chunk.text) <= 100 for chunk in chunks)
+        assert "".join(chunk.text for chunk in chunks) == text
+
+    def test_blank_document_has_no_chunks(self):
+        assert split_document("  \n\n ", max_tokens=100) == []
+
+
+def test_merge_drops_repeats_from_overlap():
+    chunks = split_document(_document(), max_tokens=200)
+    results = [
+        (chunks[1], [_requirement("Users can log in."), _requirement("Reports export to CSV")]),
+        (chunks[0], [_requirement("Users can log in")]),
+    ]
+
+    merged = merge_chunk_results(results)
+
+    assert [(req.description, chunk.index) for req, chunk in merged] == [
+        ("Users can log in", 0),
+        ("Reports export to CSV", 1),
+    ]
+
+
+class TestDocExtractorChunked:
+    """doc_extractor maps chunks concurrently and reduces the results."""
+
+    def test_extracts_every_chunk_with_offsets(self, tmp_path, monkeypatch):
+        path = tmp_path / "transcript.md"
+        path.write_text(_document(), encoding="utf-8")
+        monkeypatch.setattr(nodes, "EXTRACTION_CHUNK_TOKENS", 200)
+
+        def extract(messages):
+            body = messages[-1].content
+            part = body.split("part ")[1].split(" ")[0]
+            if part == "2":
+                raise TimeoutError("chunk timed out")
+            return RequirementExtraction(requirements=[_requirement(f"Requirement from part {part}"), _requirement("Shared")])
+
+        llm = MagicMock(model_name="gpt-4o")
+        llm.with_structured_output.return_value.invoke.side_effect = extract
+
+        with patch.object(nodes, "get_llm", return_value=llm):
+            result = nodes.doc_extractor({"pending_file_path": str(path), "requirements": []})
+
+        descriptions = [req["description"] for req in result["requirements"]]
+        assert descriptions[:3] == ["Requirement from part 1", "Shared", "Requirement from part 3"]
+        assert "Requirement from part 2" not in descriptions
+        assert result["requirements"][0]["source"].startswith("File: transcript.md (chars 0-")
+        assert "could not be analyzed" in result["messages"][0].content
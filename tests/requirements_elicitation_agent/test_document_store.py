@@ -0,0 +1,167 @@
+"""
+Tests for the in-memory document store and content uploads.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from langchain_core.messages import HumanMessage
+
+from src.requirements_elicitation_agent import nodes
+from src.requirements_elicitation_agent.document_store import DocumentStore, document_handle
+from src.requirements_elicitation_agent.graph import router
+from src.requirements_elicitation_agent.tools import DocumentSummary, RecordRequirement, RequirementExtraction
+
+
+class TestDocumentStore:
+    """Content addressing, reference counting and eviction."""
+
+    def test_handle_is_content_addressed(self):
+        store = DocumentStore()
+
+        first = store.put("Meeting notes")
+        second = store.put("Meeting notes")
+
+        assert first == second == document_handle("Meeting notes")
+        assert first != store.put("Other notes")
+        assert store.get(first) == "Meeting notes"
+
+    def test_release_drops_text_after_last_reference(self):
+        store = DocumentStore()
+        handle = store.put("Shared by two sessions")
+        store.put("Shared by two sessions")
+
+        store.release(handle)
+        assert store.get(handle) == "Shared by two sessions"
+        store.release(handle)
+        assert store.get(handle) is None
+        assert store.stats() == {"entries": 0, "bytes": 0}
+
+    def test_evicts_least_recently_used_over_budget(self):
+        store = DocumentStore(max_bytes=10)
+        old = store.put("aaaaaa")
+        recent = store.put("bbbbbb")
+
+        assert store.get(old) is None
+        assert store.get(recent) == "bbbbbb"
+
+    def test_unknown_handles_are_ignored(self):
+        store = DocumentStore()
+
+        assert store.get(None) is None
+        assert store.get("sha256:missing") is None
+        store.release("sha256:missing")
+
+
+def _llm():
+    responses = {
+        DocumentSummary: DocumentSummary(topic="login", appears_relevant=True, document_type="meeting notes"),
+        RequirementExtraction: RequirementExtraction(requirements=[
+            RecordRequirement(description="Users can log in", category="Functional", is_vague=False, is_risk=False)
+        ])
+    }
+    llm = MagicMock(model_name="gpt-4o")
+    llm.with_structured_output.side_effect = lambda schema: MagicMock(**{"invoke.return_value": responses[schema]})
+    return llm
+
+
+class TestContentUpload:
+    """Uploaded content travels through state without touching disk."""
+
+    def test_router_sends_uploaded_document_to_reader(self):
+        state = {
+            "messages": [HumanMessage(content="I uploaded a file: kickoff notes")],
+            "current_phase": "elicitation",
+            "uploaded_document": {"handle": "sha256:abc", "name": "kickoff notes"}
+        }
+
+        assert router(state) == "doc_reader"
+
+    def test_document_is_read_once_and_shared(self, monkeypatch):
+        store = DocumentStore()
+        monkeypatch.setattr(nodes, "get_document_store", lambda: store)
+        handle = store.put("Kickoff notes: users can log in.")
+        state = {
+            "messages": [HumanMessage(content="I uploaded a file: kickoff.md")],
+            "requirements": [],
+            "uploaded_document": {"handle": handle, "name": "kickoff.md"}
+        }
+
+        with patch.object(nodes, "get_llm", return_value=_llm()), \
+                patch.object(nodes, "read_file") as read_file:
+            read = nodes.doc_reader(state)
+            state.update(read)
+            extracted = nodes.doc_extractor(state)
+
+        read_file.invoke.assert_not_called()
+        assert read["pending_document"] == handle
+        assert read["pending_file_path"] == "kickoff.md"
+        assert read["uploaded_document"] is None
+        assert extracted["requirements"][0]["source"] == "File: kickoff.md"
+        assert extracted["pending_document"] is None
+        assert store.get(handle) is None
+
+    def test_missing_content_asks_for_upload_again(self, monkeypatch):
+        monkeypatch.setattr(nodes, "get_document_store", lambda: DocumentStore())
+        state = {
+            "messages": [HumanMessage(content="I uploaded a file: kickoff.md")],
+            "uploaded_document": {"handle": "sha256:gone", "name": "kickoff.md"}
+        }
+
+        result = nodes.doc_reader(state)
+
+        assert "upload it again" in result["messages"][0].content
+        assert result["uploaded_document"] is None
+
+    def test_expired_upload_is_never_read_from_disk(self, monkeypatch):
+        monkeypatch.setattr(nodes, "get_document_store", lambda: DocumentStore())
+        state = {
+            "messages": [HumanMessage(content="yes")],
+            "requirements": [],
+            "pending_document": "sha256:evicted",
+            "pending_file_path": "/etc/passwd"
+        }
+
+        with patch.object(nodes, "get_llm", return_value=_llm()), \
+                patch.object(nodes, "read_file") as read_file:
+            result = nodes.doc_extractor(state)
+
+        read_file.invoke.assert_not_called()
+        assert "expired" in result["messages"][0].content
+        assert "upload it again" in result["messages"][0].content
+        assert result["pending_document"] is None and result["pending_file_path"] is None
+
+    def test_greeting_releases_documents_it_clears(self, monkeypatch):
+        store = DocumentStore()
+        monkeypatch.setattr(nodes, "get_document_store", lambda: store)
+        uploaded = store.put("Kickoff notes: users can log in.")
+        pending = store.put("Workshop notes: admins can reset passwords.")
+        state = {
+            "messages": [HumanMessage(content="hello")],
+            "uploaded_document": {"handle": uploaded, "name": "kickoff.md"},
+            "pending_document": pending
+        }
+
+        result = nodes.initializer(state)
+
+        assert result["uploaded_document"] is None and result["pending_document"] is None
+        assert store.stats() == {"entries": 0, "bytes": 0}
+
+    def test_declining_extraction_releases_document(self, monkeypatch):
+        store = DocumentStore()
+        monkeypatch.setattr(nodes, "get_document_store", lambda: store)
+        handle = store.put("Kickoff notes: users can log in.")
+        state = {
+            "messages": [HumanMessage(content="no thanks")],
+            "current_phase": "analysis_confirm",
+            "requirements": [],
+            "todo_list": [{"topic": "Core User Goals", "status": "covered"}],
+            "pending_document": handle,
+            "pending_file_path": "kickoff.md"
+        }
+
+        assert router(state) == "interviewer"
+        result = nodes.interviewer(state)
+
+        assert store.get(handle) is None
+        assert result["pending_document"] is None and result["pending_file_path"] is None
+        assert result["current_phase"] == "elicitation"
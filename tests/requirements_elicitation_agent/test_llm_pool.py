@@ -0,0 +1,96 @@
+"""
+Tests for the pooled LLM client registry.
+"""
+
+import gc
+
+import httpx
+import pytest
+from langchain_core.messages import HumanMessage
+from src.requirements_elicitation_agent.llm_pool import LLMClientRegistry, LLMPoolConfig
+
+
+@pytest.fixture
+def pool_env(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("OPENAI_MODEL", "gpt-4o-mini")
+    monkeypatch.setenv("OPENAI_TEMPERATURE", "0.2")
+    monkeypatch.setenv("FORGE_LLM_POOL_MAX_CONNECTIONS", "7")
+    return monkeypatch
+
+
+class TestLLMClientRegistry:
+    """Client reuse, shared pooling and explicit reload."""
+
+    def test_reuses_client_per_model_and_temperature(self, pool_env):
+        registry = LLMClientRegistry()
+
+        first = registry.get()
+        assert registry.get() is first
+        assert registry.get("gpt-4o-mini", 0.2) is first
+        other = registry.get("gpt-4o", 0.0)
+        assert other is not first
+
+        stats = registry.stats()
+        assert stats["hits"] == 2
+        assert stats["misses"] == 2
+        assert {"model": "gpt-4o", "temperature": 0.0} in stats["clients"]
+        assert stats["limits"]["max_connections"] == 7
+
+    def test_clients_share_one_http_pool(self, pool_env):
+        registry = LLMClientRegistry()
+
+        first = registry.get("gpt-4o", 0.0)
+        second = registry.get("gpt-4o", 1.0)
+
+        assert first.root_client._client is second.root_client._client
+
+    def test_env_changes_apply_only_after_reload(self, pool_env):
+        registry = LLMClientRegistry()
+        before = registry.get()
+
+        pool_env.setenv("OPENAI_MODEL", "gpt-4o")
+        assert registry.get() is before
+
+        registry.reload()
+        after = registry.get()
+        assert after is not before
+        assert after.model_name == "gpt-4o"
+
+    def test_client_from_before_reload_keeps_working(self, pool_env):
+        registry = LLMClientRegistry()
+        before = registry.get()
+        http_client = before.root_client._client
+        async_http_client = before.root_async_client._client
+        http_client._transport = httpx.MockTransport(lambda request: httpx.Response(200, json={
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": "gpt-4o-mini",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "still here"}, "finish_reason": "stop"}],
+        }))
+
+        registry.reload()
+
+        assert not http_client.is_closed
+        assert before.invoke([HumanMessage(content="ping")]).content == "still here"
+
+        del before
+        gc.collect()
+        assert http_client.is_closed
+        assert async_http_client.is_closed
+
+    def test_reload_closes_unused_pools_at_once(self, pool_env):
+        registry = LLMClientRegistry()
+        http_client = registry.get().root_client._client
+
+        registry.reload()
+        gc.collect()
+
+        assert http_client.is_closed
+
+    def test_missing_api_key_raises(self, monkeypatch):
+        monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+        with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+            LLMPoolConfig.from_env()